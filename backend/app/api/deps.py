@@ -1,5 +1,5 @@
 from typing import AsyncGenerator, Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, WebSocketException, status
 from fastapi.security import OAuth2PasswordBearer
 import jwt
 from jwt.exceptions import PyJWTError
@@ -7,7 +7,7 @@ from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core import security
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal, get_db
 from app.models.user import User
 
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -46,6 +46,18 @@ async def get_current_user(
         raise HTTPException(status_code=400, detail="Inactive user")
     return user
 
+async def get_current_user_ws(token: Optional[str] = Query(None)) -> User:
+    """
+    get_current_user for WebSocket routes. Browsers cannot set headers on a
+    WebSocket handshake, so the access token is passed as ?token=...
+    """
+    # A short-lived session: a yielded one would pin a connection for the whole stream
+    async with AsyncSessionLocal() as db:
+        try:
+            return await get_current_user(db=db, token=token or "")
+        except HTTPException as e:
+            raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+
 async def get_current_active_superuser(
     current_user: User = Depends(get_current_user),
 ) -> User:
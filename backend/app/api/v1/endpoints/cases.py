@@ -5,6 +5,7 @@ from app.api import deps
 from app.models.user import User
 from app.schemas.case import TestCase as TestCaseSchema, TestCaseCreate, TestCaseUpdate
 from app.services.case_service import case_service
+from app.services.selector_ranking import selector_ranker
 
 router = APIRouter()
 
@@ -94,3 +95,18 @@ async def delete_test_case(
         
     await case_service.remove(db, id=case_id)
     return test_case
+
+@router.get("/{case_id}/selector-ranking")
+async def read_selector_ranking(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    case_id: int,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Get the learned selector ranking for each step target (page element or selector) of a test case.
+    """
+    test_case = await case_service.get(db, id=case_id)
+    if not test_case:
+        raise HTTPException(status_code=404, detail="Test case not found")
+    return {"case_id": case_id, "steps": await selector_ranker.ranking(db, case_id)}
@@ -41,7 +41,7 @@ async def get_recent_activities(db: AsyncSession = Depends(deps.get_db), limit:
     # Get most recent reports as activities
     # Need to eager load test_case to access it properly if it's async, or select directly
     # For simplicity, we can just select the necessary fields using join
-    query = select(TestReport.id, TestReport.status, TestReport.created_at, TestReport.report_path, TestCase.name.label("case_name"))\
+    query = select(TestReport.id, TestReport.status, TestReport.created_at, TestReport.report_path, TestReport.report_status, TestCase.name.label("case_name"))\
         .outerjoin(TestCase, TestReport.test_case_id == TestCase.id)\
         .order_by(TestReport.created_at.desc())\
         .limit(limit)
@@ -53,7 +53,7 @@ async def get_recent_activities(db: AsyncSession = Depends(deps.get_db), limit:
     activities = []
     for row in rows:
         report_url = None
-        if row.report_path and "allure-reports" in row.report_path:
+        if row.report_status == "ready" and row.report_path and "allure-reports" in row.report_path:
             folder_name = os.path.basename(row.report_path)
             report_url = f"/reports/{folder_name}/index.html"
             
@@ -1,19 +1,46 @@
-from typing import Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Body
-from pydantic import BaseModel
+import asyncio
+import json
+from typing import Any, Dict, List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Body, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
 from app.models.user import User
-from app.worker import run_test_case_task, run_test_suite_task
+from app.worker import run_test_case_task, run_test_suite_task, dispatch_distributed_suite
+from app.services.suite_service import suite_service
+from app.services.sharding import estimate_case_durations
+from app.services.progress import get_progress_redis, progress_channel, read_progress_buffer
+from app.services.artifact_store import artifact_store
+from fastapi.responses import FileResponse
 from celery.result import AsyncResult
 from app.core.celery_app import celery_app
 from app.core.config import settings
 
 router = APIRouter()
 
+class ScreenshotOptions(BaseModel):
+    mode: Optional[Literal["never", "on_failure", "every_n", "actions", "always"]] = None
+    every_n: Optional[int] = Field(None, ge=1)  # every_n mode: capture every N steps
+    actions: Optional[List[str]] = None  # actions mode: capture after these actions
+    format: Optional[Literal["png", "jpeg"]] = None
+    quality: Optional[int] = Field(None, ge=0, le=100)  # jpeg only
+    full_page: Optional[bool] = None
+    scale: Optional[Literal["css", "device"]] = None
+    clip: Optional[Dict[str, float]] = None  # {"x", "y", "width", "height"}
+
 class ExecutionOptions(BaseModel):
     headless: Optional[bool] = None  # None means use config default
     browser_type: Optional[str] = None  # None means use config default
+    max_concurrency: Optional[int] = Field(None, ge=1)  # Suite only: max in-flight cases
+    adaptive_concurrency: Optional[bool] = None  # Suite only: adapt to host memory/load
+    distributed: bool = False  # Suite only: fan cases out across Celery workers
+    shard_count: Optional[int] = Field(None, ge=1)  # Suite only: number of shards in distributed mode
+    har_mode: Optional[Literal["off", "record", "replay"]] = None  # None means use the project's execution_config
+    screenshots: Optional[ScreenshotOptions] = None  # Overrides the project's screenshot policy
+    video_mode: Optional[Literal["off", "on_failure", "always"]] = None  # "always" flags the run to keep its video
+
+    def screenshot_options(self) -> Optional[Dict[str, Any]]:
+        return self.screenshots.model_dump(exclude_none=True) if self.screenshots else None
 
 @router.post("/cases/{case_id}/run")
 async def run_test_case(
@@ -33,7 +60,15 @@ async def run_test_case(
     headless = options.headless if options.headless is not None else settings.BROWSER_HEADLESS
     browser_type = options.browser_type if options.browser_type else settings.BROWSER_TYPE
     
-    task = run_test_case_task.delay(case_id, headless, browser_type, current_user.id)
+    task = run_test_case_task.delay(
+        case_id,
+        headless,
+        browser_type,
+        current_user.id,
+        har_mode=options.har_mode,
+        screenshot_options=options.screenshot_options(),
+        video_mode=options.video_mode,
+    )
     return {
         "task_id": task.id, 
         "status": "started",
@@ -58,7 +93,47 @@ async def run_test_suite(
     headless = options.headless if options.headless is not None else settings.BROWSER_HEADLESS
     browser_type = options.browser_type if options.browser_type else settings.BROWSER_TYPE
     
-    task = run_test_suite_task.delay(suite_id, headless, browser_type, current_user.id)
+    if options.distributed:
+        suite = await suite_service.get(db, id=suite_id)
+        if not suite:
+            raise HTTPException(status_code=404, detail="Test suite not found")
+        if not suite.test_cases:
+            raise HTTPException(status_code=400, detail="Test suite has no test cases")
+
+        cases = [(tc.id, tc.name) for tc in suite.test_cases]
+        estimates = await estimate_case_durations(db, [case_id for case_id, _ in cases])
+        task = dispatch_distributed_suite(
+            suite_id,
+            suite.name,
+            cases,
+            headless=headless,
+            browser_type=browser_type,
+            executor_id=current_user.id,
+            shard_count=options.shard_count,
+            max_concurrency=options.max_concurrency,
+            adaptive_concurrency=options.adaptive_concurrency,
+            estimates=estimates,
+            har_mode=options.har_mode,
+            screenshot_options=options.screenshot_options(),
+            video_mode=options.video_mode,
+        )
+        return {
+            "task_id": task.id,
+            "status": "started",
+            "message": "测试套件已分布式启动,请到测试报告页面查看执行结果"
+        }
+
+    task = run_test_suite_task.delay(
+        suite_id,
+        headless,
+        browser_type,
+        current_user.id,
+        max_concurrency=options.max_concurrency,
+        adaptive_concurrency=options.adaptive_concurrency,
+        har_mode=options.har_mode,
+        screenshot_options=options.screenshot_options(),
+        video_mode=options.video_mode,
+    )
     return {
         "task_id": task.id, 
         "status": "started",
@@ -75,4 +150,65 @@ async def get_task_status(task_id: str) -> Any:
         "task_id": task_id,
         "status": task_result.status,
         "result": task_result.result if task_result.ready() else None
-    }
\ No newline at end of file
+    }
+
+@router.get("/artifacts/{name}")
+async def get_artifact(
+    name: str,
+    current_user: User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Serve a stored execution artifact (e.g. a failure screenshot) by content hash.
+    """
+    path = artifact_store.resolve(name)
+    if not path:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+    return FileResponse(path)
+
+
+@router.websocket("/ws/{task_id}")
+async def stream_task_progress(
+    websocket: WebSocket,
+    task_id: str,
+    current_user: User = Depends(deps.get_current_user_ws),
+):
+    """
+    Stream per-step progress events of a running task.
+
+    Connect with ?token=<access token>. Buffered events are replayed first so
+    late subscribers catch up, then live events follow until the run_end
+    event arrives.
+    """
+    await websocket.accept()
+    client = get_progress_redis()
+    pubsub = client.pubsub()
+    # Subscribe before reading the buffer so no event falls between the two.
+    await pubsub.subscribe(progress_channel(task_id))
+    disconnected = asyncio.ensure_future(websocket.receive_text())
+
+    try:
+        seen = set()
+        finished = False
+        for event in await read_progress_buffer(task_id, client):
+            seen.add(event.get("seq"))
+            await websocket.send_json(event)
+            finished = finished or event.get("type") == "run_end"
+
+        while not finished and not disconnected.done():
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            if message is None:
+                continue
+            event = json.loads(message["data"])
+            if event.get("seq") in seen:
+                continue
+            await websocket.send_json(event)
+            finished = event.get("type") == "run_end"
+
+        if finished:
+            await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        await pubsub.unsubscribe(progress_channel(task_id))
+        await pubsub.aclose()
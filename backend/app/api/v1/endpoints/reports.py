@@ -46,7 +46,7 @@ async def list_reports(
         
         # Compute relative report URL
         report_url = None
-        if r.report_path and "allure-reports" in r.report_path:
+        if r.report_status == "ready" and r.report_path and "allure-reports" in r.report_path:
             # Extract the folder name from the absolute path
             # e.g. /path/to/allure-reports/report_2025... -> /reports/report_2025.../index.html
             folder_name = os.path.basename(r.report_path)
@@ -0,0 +1,133 @@
+"""
+并发控制模块
+
+为测试套件执行提供有界并发：
+1. 固定上限：同一时刻最多运行 N 个用例
+2. 自适应模式：根据主机可用内存和平均负载动态升降上限
+"""
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+from app.core.logger import logger
+
+
+def read_free_memory_mb() -> Optional[float]:
+    """Available host memory in MB, or None when it cannot be determined."""
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def read_load_per_cpu() -> Optional[float]:
+    """1-minute load average normalised by CPU count, or None if unsupported."""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (OSError, AttributeError):
+        return None
+
+
+class ConcurrencyLimiter:
+    """
+    Async limiter for in-flight test cases.
+
+    In adaptive mode the limit is re-evaluated at most every
+    ``sample_interval`` seconds on acquire: it shrinks when free memory or
+    load crosses the configured thresholds and grows back when the host has
+    comfortable headroom.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        *,
+        adaptive: bool = False,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        min_free_memory_mb: float = 1024,
+        max_load_per_cpu: float = 1.5,
+        sample_interval: float = 2.0,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit or limit)
+        self.limit = min(max(self.min_limit, limit), self.max_limit)
+        self.adaptive = adaptive
+        self.min_free_memory_mb = min_free_memory_mb
+        self.max_load_per_cpu = max_load_per_cpu
+        self.sample_interval = sample_interval
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._last_sample = 0.0
+        self._condition = asyncio.Condition()
+
+    def _adjust(self) -> None:
+        now = time.monotonic()
+        if now - self._last_sample < self.sample_interval:
+            return
+        self._last_sample = now
+
+        free_mb = read_free_memory_mb()
+        load = read_load_per_cpu()
+        pressure = (
+            (free_mb is not None and free_mb < self.min_free_memory_mb)
+            or (load is not None and load > self.max_load_per_cpu)
+        )
+        headroom = (
+            (free_mb is None or free_mb > self.min_free_memory_mb * 2)
+            and (load is None or load < self.max_load_per_cpu * 0.7)
+        )
+
+        previous = self.limit
+        if pressure:
+            self.limit = max(self.min_limit, self.limit - 1)
+        elif headroom and self.in_flight >= self.limit:
+            self.limit = min(self.max_limit, self.limit + 1)
+
+        if self.limit != previous:
+            logger.info(
+                f"Adaptive concurrency {previous} -> {self.limit} (free_mb={free_mb}, load_per_cpu={load})"
+            )
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            while True:
+                if self.adaptive:
+                    self._adjust()
+                if self.in_flight < self.limit:
+                    break
+                try:
+                    # Wake up periodically so adaptive mode can raise the limit.
+                    await asyncio.wait_for(self._condition.wait(), timeout=self.sample_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    async def release(self) -> None:
+        async with self._condition:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._condition.notify_all()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "adaptive": self.adaptive,
+            "limit": self.limit,
+            "max_limit": self.max_limit,
+            "peak_in_flight": self.peak_in_flight,
+        }
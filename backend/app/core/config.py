@@ -46,6 +46,96 @@ class Settings(BaseSettings):
     BROWSER_HEADLESS: bool = True  # True=无头模式, False=有头模式
     BROWSER_TYPE: str = "chromium"  # chromium, firefox, webkit
 
+    # 浏览器池配置 (Celery worker 内复用已启动的浏览器)
+    BROWSER_POOL_ENABLED: bool = True
+    BROWSER_POOL_MAX_CONTEXTS: int = 4  # 单个浏览器同时打开的上下文上限
+    BROWSER_POOL_MAX_USES: int = 50  # 浏览器累计使用次数达到上限后回收
+    BROWSER_POOL_MAX_BROWSERS: int = 2  # 每种 (browser_type, headless) 组合的浏览器上限
+    PLAYWRIGHT_DRIVER_IDLE_TIMEOUT: float = 60.0  # 共享 Playwright driver 无引用后保留的时间（秒）
+    PLAYWRIGHT_DRIVER_PROBE_INTERVAL: float = 5.0  # acquire 时探测 driver 是否存活的最小间隔（秒）
+
+    # 套件并发配置
+    SUITE_MAX_CONCURRENCY: int = 4  # 单个套件同时执行的用例上限
+    SUITE_ADAPTIVE_CONCURRENCY: bool = False  # 是否根据主机内存/负载自适应调整并发
+    SUITE_ADAPTIVE_MAX_CONCURRENCY: int = 16  # 自适应模式下的并发上限
+    SUITE_MIN_FREE_MEMORY_MB: int = 1024  # 可用内存低于该值时降低并发
+    SUITE_MAX_LOAD_PER_CPU: float = 1.5  # 单核平均负载高于该值时降低并发
+
+    # 分布式套件执行配置
+    SUITE_SHARD_COUNT: int = 4  # 分布式模式下默认分片数
+    SHARD_RESULT_TRANSPORT: str = "redis"  # redis 或 inline (随任务结果写入结果后端，仅适合小套件)
+    SHARD_RESULT_TTL: int = 3600  # redis 传输方式下分片结果的过期时间（秒）
+    SHARD_TIMING_HISTORY: int = 5  # 估算用例耗时时参考的最近成功执行次数
+    SHARD_DEFAULT_CASE_DURATION_MS: int = 30000  # 无历史耗时的新用例默认估算值
+
+    # 执行进度推送配置
+    PROGRESS_BUFFER_SIZE: int = 500  # 每次执行保留的回放事件条数
+    PROGRESS_TTL: int = 3600  # 回放缓冲的过期时间（秒）
+
+    # 任务结果配置
+    RESULT_MAX_BYTES: int = 256 * 1024  # 写入 Celery 结果后端的单个结果大小上限
+
+    # 登录态复用配置 (项目 execution_config["session"] 未指定时的默认值)
+    SESSION_CACHE_TTL: int = 1800  # 缓存的登录态有效期（秒）
+    SESSION_FAILURE_TTL: int = 60  # 登录用例失败后在该时间内不再重试，同项目用例直接跳过登录（秒）
+    SESSION_AUTH_REDIRECT_PATTERN: str = r"/login|/signin|/sso|/auth"  # 判定被重定向到登录页的 URL 正则
+
+    # HAR 录制回放配置
+    HAR_MAX_AGE_HOURS: int = 168  # 录制的 HAR 超过该时长视为过期，回放模式下重新录制
+    HAR_REPLAY_NOT_FOUND: str = "fallback"  # 回放时未匹配的请求: fallback 访问网络 / abort 直接失败
+
+    # 选择器解析配置
+    SELECTOR_RESOLUTION_MODE: str = "race"  # race: 并发探测所有候选选择器 / sequential: 逐个尝试（每个候选独立超时）
+    STEP_DEADLINE_MS: int = 15000  # race 模式下单个步骤解析选择器的总时限
+    SELECTOR_ACTION_MIN_TIMEOUT_MS: int = 2000  # 选中候选后执行动作的最短超时
+    SELECTOR_RANKING_ENABLED: bool = True  # 按历史成功率/耗时调整候选选择器顺序
+    SELECTOR_STATS_HALF_LIFE_HOURS: float = 72.0  # 选择器统计的衰减半衰期（小时）
+    SELECTOR_STATS_CACHE_TTL: int = 60  # 进程内选择器统计缓存时间（秒）
+
+    # 执行计划编译缓存配置
+    PLAN_CACHE_REDIS_ENABLED: bool = True  # 编译后的执行计划同时缓存到 Redis，供其他 worker 复用
+    PLAN_CACHE_TTL: int = 7 * 24 * 3600  # Redis 中编译计划的过期时间（秒）
+    PLAN_COMPILER_VERSION: int = 1  # 编译规则变化时递增，使旧的缓存计划失效
+
+    # 截图策略配置 (项目 execution_config["screenshots"] 或单次执行参数可覆盖)
+    SCREENSHOT_MODE: str = "always"  # never / on_failure / every_n / actions / always
+    SCREENSHOT_FORMAT: str = "png"  # png / jpeg
+    SCREENSHOT_QUALITY: Optional[int] = None  # jpeg 质量 0-100，None 使用 Playwright 默认值
+    ATTACHMENT_WRITER_QUEUE_SIZE: int = 16  # 待写盘附件队列上限，写满时截图等待
+    ATTACHMENT_WRITER_WORKERS: int = 2  # 后台写盘任务数
+    SCREENSHOT_NEAR_DUPLICATE_DISTANCE: int = 0  # dHash 汉明距离阈值，>0 时复用近似重复的截图（需要 Pillow）
+
+    # 页面稳定等待配置 (项目 execution_config["settle"] 可覆盖)
+    SETTLE_MODE: str = "load"  # none / load / networkidle / dom，导航后等待页面稳定的方式
+    SETTLE_TIMEOUT_MS: int = 10000  # 稳定等待上限，超时后继续执行
+    SETTLE_LOAD_STATE: str = "load"  # load 模式等待的状态: load / domcontentloaded / networkidle
+    SETTLE_MAX_INFLIGHT: int = 0  # networkidle 模式允许的进行中请求数
+    SETTLE_QUIET_MS: int = 500  # networkidle / dom 模式要求的持续静默时长
+    SETTLE_REWRITE_WAITS: bool = False  # 把固定时长的 wait 步骤改为以原时长为上限的稳定等待
+
+    # Playwright 追踪配置 (项目 execution_config["tracing"] 可覆盖)
+    TRACE_MODE: str = "off"  # off / on_failure，失败用例保留 trace 并附加到 Allure 结果
+    TRACE_CHUNK_STEPS: int = 0  # 每 N 步丢弃之前的追踪分片，0 表示整个用例一个分片
+
+    # 录屏配置 (项目 execution_config["video"] 或单次执行 video_mode 可覆盖)
+    VIDEO_MODE: str = "off"  # off / on_failure / always
+    VIDEO_WIDTH: int = 1280  # 录制分辨率
+    VIDEO_HEIGHT: int = 720
+    VIDEO_TRIM_SECONDS: int = 30  # 失败录像只保留失败前的 N 秒，0 表示不裁剪
+    VIDEO_SCALE_WIDTH: int = 0  # 保留的录像缩放到该宽度，0 表示不缩放
+    VIDEO_BUDGET_MB: int = 500  # 每个项目录像总量上限，超出时删除最旧的录像
+    VIDEO_TRANSCODE_CONCURRENCY: int = 2  # 同时运行的 ffmpeg 进程数
+    VIDEO_TRANSCODE_TIMEOUT: int = 120  # 单个录像转码超时（秒）
+
+    # Allure 报告生成配置
+    REPORT_GENERATION_BACKGROUND: bool = True  # 任务先写入 pending 报告记录并立即结束，HTML 在后台生成
+    REPORT_GENERATION_CONCURRENCY: int = 2  # 每个进程同时运行的 allure 进程数
+    REPORT_GENERATION_TIMEOUT: int = 120  # 单次 allure generate 超时（秒）
+
+    # 站点配置 (按域名匹配的定位评分加成与后置动作)
+    SITE_PROFILES_PATH: Optional[str] = None  # 站点配置 JSON 文件路径，修改后自动热加载
+    SITE_PROFILES_RELOAD_INTERVAL: float = 5.0  # 检查站点配置文件是否变化的间隔（秒）
+
     def __init__(self, **kwargs):
         """
         初始化配置，自动构建数据库连接字符串
@@ -0,0 +1,107 @@
+"""
+Celery Worker 运行时模块
+
+每个 worker 进程持有一个长期运行的事件循环（独立线程），所有任务的协程都提交到
+这个循环上执行，而不是每个任务 asyncio.run() 创建并销毁一次事件循环。
+
+这样以下资源可以跨任务复用：
+- AsyncSessionLocal 背后的 asyncpg 连接池
+- AIService 缓存的 AsyncOpenAI 客户端
+- 浏览器池中已启动的浏览器
+
+进程启动/退出由 Celery 的 worker_process_init / worker_process_shutdown 信号驱动，
+见 app/worker.py。
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, List, Optional
+
+from app.core.logger import logger
+
+ShutdownHook = Callable[[], Awaitable[None]]
+
+
+class WorkerRuntime:
+    """A long-lived event loop running in a background thread."""
+
+    def __init__(self, shutdown_timeout: float = 30.0):
+        self.shutdown_timeout = shutdown_timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._shutdown_hooks: List[ShutdownHook] = []
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self._loop
+
+    @property
+    def is_running(self) -> bool:
+        return self._loop is not None and self._loop.is_running()
+
+    def add_shutdown_hook(self, hook: ShutdownHook) -> None:
+        """Register a coroutine function awaited on the loop during stop()."""
+        self._shutdown_hooks.append(hook)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _serve():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._thread = threading.Thread(target=_serve, name="worker-event-loop", daemon=True)
+            self._thread.start()
+            ready.wait()
+            self._loop = loop
+            logger.info("Worker event loop started")
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the worker loop and block until it finishes."""
+        if self._loop is None:
+            # solo/threads pools never send worker_process_init
+            self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        return future.result(timeout)
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> "asyncio.Future":
+        """Schedule a coroutine on the worker loop without waiting for it."""
+        if self._loop is None:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def stop(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None:
+                return
+
+            async def _shutdown():
+                for hook in reversed(self._shutdown_hooks):
+                    try:
+                        await hook()
+                    except Exception as e:
+                        logger.warning(f"Worker shutdown hook {getattr(hook, '__name__', hook)} failed: {e}")
+
+            try:
+                asyncio.run_coroutine_threadsafe(_shutdown(), loop).result(self.shutdown_timeout)
+            except Exception as e:
+                logger.warning(f"Worker shutdown did not complete cleanly: {e}")
+
+            loop.call_soon_threadsafe(loop.stop)
+            if thread is not None:
+                thread.join(timeout=self.shutdown_timeout)
+            if not loop.is_running():
+                loop.close()
+            self._loop = None
+            self._thread = None
+            logger.info("Worker event loop stopped")
+
+
+# 每个 worker 进程一个事件循环
+worker_runtime = WorkerRuntime()
@@ -5,6 +5,8 @@ from app.core.config import settings
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=True,
+    # Worker processes keep the pool for their whole lifetime; drop dead connections.
+    pool_pre_ping=True,
 )
 
 AsyncSessionLocal = sessionmaker(
@@ -7,7 +7,10 @@ UI 自动化测试平台 - 主应用入口
 3. 注册 API 路由
 4. 挂载静态文件服务（Allure 报告）
 5. 初始化全局日志系统
+6. 关闭时等待后台生成中的 Allure 报告
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -17,8 +20,18 @@ import os
 from app.core.logger import setup_logger, logger
 setup_logger()
 
+from app.services.report_service import report_generator
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 等待后台报告生成写回 ready/failed，避免记录停留在 pending
+    await report_generator.drain()
+
+
 # 创建 FastAPI 应用实例
-app = FastAPI(title="UI Automation Platform API")
+app = FastAPI(title="UI Automation Platform API", lifespan=lifespan)
 
 # CORS 配置 - 允许前端跨域访问
 origins = [
@@ -14,6 +14,8 @@ from app.models.associations import test_suite_cases
 from app.models.heal_log import HealLog
 from app.models.feedback import StepFeedback
 from app.models.ai_model import AIModel
+from app.models.case_timing import CaseTiming
+from app.models.selector_stat import SelectorStat
 
 __all__ = [
     "User",
@@ -28,4 +30,6 @@ __all__ = [
     "HealLog",
     "StepFeedback",
     "AIModel",
+    "CaseTiming",
+    "SelectorStat",
 ]
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class CaseTiming(Base):
+    """
+    记录每次用例执行的耗时。
+    数据来源于 Runner 生成的 Allure 结果 start/stop，用于分布式套件的按耗时分片。
+    """
+    __tablename__ = "case_timings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    case_id = Column(Integer, ForeignKey("test_cases.id"), nullable=False, index=True)
+    duration_ms = Column(Integer, nullable=False)
+    status = Column(String, nullable=False)                   # success / failure
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+    test_case = relationship("TestCase", foreign_keys=[case_id])
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, DateTime, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -10,6 +10,7 @@ class Project(Base):
     name = Column(String, index=True, nullable=False)
     description = Column(Text)
     base_url = Column(String, nullable=True)
+    execution_config = Column(JSON, nullable=True)  # Per-project execution settings (session fixture, etc.)
     owner_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
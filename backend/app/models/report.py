@@ -3,6 +3,11 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
 
+# report_status：HTML 报告的生成状态
+REPORT_PENDING = "pending"
+REPORT_READY = "ready"
+REPORT_FAILED = "failed"
+
 class TestReport(Base):
     __tablename__ = "test_reports"
 
@@ -12,6 +17,7 @@ class TestReport(Base):
     executor_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     report_path = Column(String, nullable=False)
     status = Column(String, nullable=False)  # success, failure
+    report_status = Column(String, nullable=False, server_default=REPORT_READY)  # pending, ready, failed
     browser_type = Column(String, default="chromium")
     headless = Column(Boolean, default=True)
     error_message = Column(Text, nullable=True)
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, Text, DateTime, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class SelectorStat(Base):
+    """
+    记录每个 (用例, 步骤目标, 选择器) 的历史定位结果。
+    step_key 为 "element:{元素ID}" 或 "selector:{原始选择器}"，不随步骤顺序变化。
+    成功/失败次数按半衰期衰减，Runner 据此决定候选选择器的尝试顺序。
+    """
+    __tablename__ = "selector_stats"
+    __table_args__ = (
+        UniqueConstraint("case_id", "step_key", "selector", name="uq_selector_stats_case_step_selector"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    case_id = Column(Integer, ForeignKey("test_cases.id"), nullable=False, index=True)
+    step_key = Column(Text, nullable=False)
+    element_id = Column(Integer, ForeignKey("page_elements.id", ondelete="SET NULL"), nullable=True)
+    selector = Column(Text, nullable=False)
+
+    # 衰减后的计数（浮点），衰减基准时间为 decayed_at
+    successes = Column(Float, nullable=False, default=0.0)
+    failures = Column(Float, nullable=False, default=0.0)
+    avg_latency_ms = Column(Float, nullable=True)             # 成功时耗时的指数移动平均
+    decayed_at = Column(DateTime(timezone=True), nullable=False)
+
+    last_success_at = Column(DateTime(timezone=True), nullable=True)
+    last_failure_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    test_case = relationship("TestCase", foreign_keys=[case_id])
+    element = relationship("PageElement", foreign_keys=[element_id])
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Dict, Any
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -6,6 +6,7 @@ class ProjectBase(BaseModel):
     name: str
     description: Optional[str] = None
     base_url: Optional[str] = None
+    execution_config: Optional[Dict[str, Any]] = None
 
 class ProjectCreate(ProjectBase):
     pass
@@ -8,6 +8,7 @@ class TestReportBase(BaseModel):
     executor_id: Optional[int] = None
     report_path: str
     status: str
+    report_status: str = "ready"
     browser_type: str = "chromium"
     headless: bool = True
     error_message: Optional[str] = None
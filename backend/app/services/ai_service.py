@@ -182,6 +182,15 @@ class AIService:
                 
         return self._clients[db_model.id], db_model.model_identifier
 
+    async def aclose(self) -> None:
+        """Close cached clients (called when a worker process shuts down)."""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"Failed to close AI client: {e}")
+
     async def chat_completion(
         self,
         db: AsyncSession,
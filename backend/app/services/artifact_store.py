@@ -0,0 +1,137 @@
+"""
+执行产物存储模块
+
+截图等二进制产物按内容寻址（SHA-256）写入本地产物目录，
+Celery 任务结果中只保留引用，避免把大体积 base64 数据写入 Redis 结果后端。
+
+存储路径：backend/artifacts/{digest[:2]}/{digest}.{ext}
+访问接口：GET /api/v1/execution/artifacts/{digest}.{ext}
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+from typing import Any, Dict, Optional
+
+from app.core.logger import logger
+
+ARTIFACT_NAME_PATTERN = re.compile(r"^([0-9a-f]{64})\.([a-z0-9]{1,8})$")
+
+
+class ArtifactStore:
+    """Content-addressed store for binary execution artifacts."""
+
+    def __init__(self, root_dir: Optional[str] = None):
+        if not root_dir:
+            # artifact_store.py 位于 backend/app/services/，需要向上3级
+            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            root_dir = os.path.join(base_dir, "artifacts")
+        self.root_dir = root_dir
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    def _path(self, digest: str, ext: str) -> str:
+        return os.path.join(self.root_dir, digest[:2], f"{digest}.{ext}")
+
+    def put(self, data: bytes, ext: str = "png") -> Dict[str, Any]:
+        """Store bytes (once per distinct content) and return a reference."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest, ext)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file first so readers never see a partial artifact.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        return {
+            "artifact": f"{digest}.{ext}",
+            "size": len(data),
+            "url": f"/api/v1/execution/artifacts/{digest}.{ext}",
+        }
+
+    async def aput(self, data: bytes, ext: str = "png") -> Dict[str, Any]:
+        """put() off the event loop."""
+        return await asyncio.to_thread(self.put, data, ext)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Map an artifact name ('<digest>.<ext>') to its file path, if it exists."""
+        match = ARTIFACT_NAME_PATTERN.match(name or "")
+        if not match:
+            return None
+        path = self._path(match.group(1), match.group(2))
+        return path if os.path.isfile(path) else None
+
+
+def _truncate_strings(value: Any, limit: int) -> Any:
+    if isinstance(value, str) and len(value) > limit:
+        return value[:limit] + f"...[truncated {len(value) - limit} chars]"
+    if isinstance(value, dict):
+        return {key: _truncate_strings(item, limit) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_truncate_strings(item, limit) for item in value]
+    return value
+
+
+def _payload_size(payload: Any) -> int:
+    return len(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def slim_case_result(result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Summary of a case result for nesting inside suite results."""
+    if not result:
+        return result
+    steps = result.get("steps") or []
+    failed_step = next((index for index, step in enumerate(steps) if not step.get("success")), None)
+    return {
+        "success": result.get("success"),
+        "error": result.get("error"),
+        "duration_ms": result.get("duration_ms"),
+        "screenshot": result.get("screenshot"),
+        "step_count": len(steps),
+        "failed_step": failed_step,
+        "network_blocking": result.get("network_blocking"),
+        "attachments": result.get("attachments"),
+        "trace": result.get("trace"),
+        "video": result.get("video"),
+    }
+
+
+def enforce_result_budget(payload: Dict[str, Any], max_bytes: int) -> Dict[str, Any]:
+    """
+    Shrink a task result until its JSON encoding fits in max_bytes.
+
+    Reductions are applied in order of least information lost: long strings
+    are truncated, then the execution context, per-step details and finally
+    nested case results are dropped. The result is marked ``truncated``.
+    """
+    size = _payload_size(payload)
+    if size <= max_bytes:
+        return payload
+
+    original_size = size
+    reductions = [
+        lambda p: _truncate_strings(p, 2000),
+        lambda p: {**p, "context": {"dropped": True}} if "context" in p else p,
+        lambda p: _truncate_strings(p, 200),
+        lambda p: {**p, "steps": {"dropped": True, "count": len(p["steps"])}} if isinstance(p.get("steps"), list) else p,
+        lambda p: {**p, "results": {"dropped": True, "count": len(p["results"])}} if isinstance(p.get("results"), list) else p,
+    ]
+    for reduce in reductions:
+        payload = reduce(payload)
+        size = _payload_size(payload)
+        if size <= max_bytes:
+            break
+
+    logger.warning(f"Task result exceeded budget: {original_size} -> {size} bytes (budget {max_bytes})")
+    return {**payload, "truncated": True, "original_size": original_size}
+
+
+# 全局产物存储实例
+artifact_store = ArtifactStore()
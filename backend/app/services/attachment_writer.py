@@ -0,0 +1,148 @@
+"""
+附件异步写入模块
+
+截图等附件由有界队列交给后台任务写盘，写文件本身在线程池中执行（asyncio.to_thread），
+步骤循环不再被同步磁盘 IO 阻塞。队列写满时 submit() 会等待，起到背压作用。
+用例结束时调用 close() 等待所有附件落盘后再生成报告。
+
+附件按内容寻址：文件名为 SHA-256 摘要，内容相同的截图在结果目录中只写一次、
+被多个步骤引用。安装了 Pillow（可选依赖 screenshots：uv sync --extra screenshots）
+且 SCREENSHOT_NEAR_DUPLICATE_DISTANCE > 0 时，还会用差值哈希（dHash）识别近似重复的
+截图并复用此前的附件。失败截图只做精确去重，保证报告中的失败证据是失败时的页面。
+"""
+import asyncio
+import hashlib
+import io
+import os
+import uuid
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.logger import logger
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; near-duplicate detection is skipped without it
+    Image = None
+
+
+def _write_file(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _dhash(data: bytes, size: int = 8) -> int:
+    """64-bit difference hash: compares adjacent pixels of a tiny grayscale thumbnail."""
+    with Image.open(io.BytesIO(data)) as image:
+        pixels = image.convert("L").resize((size + 1, size)).tobytes()
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+class AttachmentWriter:
+    """Bounded background writer for attachment files, deduplicated by content."""
+
+    def __init__(
+        self,
+        queue_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        near_duplicate_distance: Optional[int] = None,
+    ):
+        self._queue: "asyncio.Queue[Optional[Tuple[str, bytes]]]" = asyncio.Queue(
+            maxsize=queue_size or settings.ATTACHMENT_WRITER_QUEUE_SIZE
+        )
+        self._worker_count = workers or settings.ATTACHMENT_WRITER_WORKERS
+        self._workers: List[asyncio.Task] = []
+        if near_duplicate_distance is None:
+            near_duplicate_distance = settings.SCREENSHOT_NEAR_DUPLICATE_DISTANCE
+        self.near_duplicate_distance = near_duplicate_distance if Image is not None else 0
+        self._submitted: Set[str] = set()
+        self._perceptual: List[Tuple[int, str]] = []  # (dhash, source) of images written by this writer
+        self.written = 0
+        self.failed = 0
+        self.bytes_written = 0
+        self.exact_duplicates = 0
+        self.near_duplicates = 0
+        self.bytes_saved = 0
+
+    def _ensure_started(self) -> None:
+        if not self._workers:
+            self._workers = [asyncio.ensure_future(self._run()) for _ in range(self._worker_count)]
+
+    async def _run(self) -> None:
+        while True:
+            item = await self._queue.get()
+            try:
+                if item is None:
+                    return
+                path, data = item
+                await asyncio.to_thread(_write_file, path, data)
+                self.written += 1
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f"Failed to write attachment {item[0] if item else ''}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def submit(self, path: str, data: bytes) -> None:
+        """Queue a file write; waits only when the queue is full."""
+        self._ensure_started()
+        await self._queue.put((path, data))
+
+    async def submit_content(
+        self, directory: str, data: bytes, ext: str, exact_only: bool = False
+    ) -> Tuple[str, bool]:
+        """
+        Store ``data`` in ``directory`` under its content hash.
+
+        Returns (source file name, deduplicated). Identical content that is
+        already on disk or queued is not written again; near-duplicates (when
+        enabled and not ``exact_only``) reuse the source of the earlier image.
+        """
+        source = f"{hashlib.sha256(data).hexdigest()}.{ext}"
+        if source in self._submitted or os.path.exists(os.path.join(directory, source)):
+            self.exact_duplicates += 1
+            self.bytes_saved += len(data)
+            return source, True
+
+        if self.near_duplicate_distance > 0 and not exact_only:
+            try:
+                fingerprint = await asyncio.to_thread(_dhash, data)
+                for previous, previous_source in reversed(self._perceptual):
+                    if bin(previous ^ fingerprint).count("1") <= self.near_duplicate_distance:
+                        self.near_duplicates += 1
+                        self.bytes_saved += len(data)
+                        return previous_source, True
+                self._perceptual.append((fingerprint, source))
+            except Exception as e:
+                logger.debug(f"Perceptual hash failed, storing attachment as-is: {e}")
+
+        self._submitted.add(source)
+        self.bytes_written += len(data)
+        await self.submit(os.path.join(directory, source), data)
+        return source, False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "written": len(self._submitted),
+            "bytes_written": self.bytes_written,
+            "exact_duplicates": self.exact_duplicates,
+            "near_duplicates": self.near_duplicates,
+            "bytes_saved": self.bytes_saved,
+        }
+
+    async def close(self) -> None:
+        """Wait until every queued file is on disk, then stop the workers."""
+        if not self._workers:
+            return
+        for _ in self._workers:
+            await self._queue.put(None)
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
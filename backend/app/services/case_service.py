@@ -65,6 +65,8 @@ class CaseService(CRUDBase[TestCase, TestCaseCreate, TestCaseUpdate]):
     async def remove(self, db: AsyncSession, *, id: int) -> TestCase:
         from app.models.heal_log import HealLog
         from app.models.report import TestReport
+        from app.models.case_timing import CaseTiming
+        from app.models.selector_stat import SelectorStat
         from sqlalchemy import delete
         
         result = await db.execute(select(self.model).where(self.model.id == id))
@@ -73,9 +75,14 @@ class CaseService(CRUDBase[TestCase, TestCaseCreate, TestCaseUpdate]):
             # Delete dependent records first to prevent foreign key constraint violations
             await db.execute(delete(HealLog).where(HealLog.case_id == id))
             await db.execute(delete(TestReport).where(TestReport.test_case_id == id))
+            await db.execute(delete(CaseTiming).where(CaseTiming.case_id == id))
+            await db.execute(delete(SelectorStat).where(SelectorStat.case_id == id))
             
             await db.delete(obj)
             await db.commit()
+
+            from app.services.har_store import har_store
+            har_store.remove(id)
         return obj
 
 case_service = CaseService(TestCase)
@@ -0,0 +1,147 @@
+"""
+执行计划加载模块
+
+执行用例前一次性加载执行所需的全部数据，避免在步骤循环中访问数据库：
+1. 用例 + 所属模块 + 项目：一条 IN 查询（joinedload）
+2. 所有步骤引用的 PageElement：一条 IN 查询
+
+结果是不可变的内存结构（frozen dataclass + MappingProxyType），
+Runner 执行步骤时只读取计划，不再产生数据库往返。
+套件执行时在分发用例前批量加载整个套件（或分片）的计划。
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.models.case import TestCase
+from app.models.element import PageElement
+from app.models.module import Module
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts/lists from JSON columns into read-only containers."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Inverse of _freeze, for JSON serialisation."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class ElementSpec:
+    id: int
+    name: str
+    locator_type: str
+    locator_value: str
+    updated_at: Optional[datetime] = None
+
+
+@dataclass(frozen=True)
+class ProjectSpec:
+    id: int
+    name: str
+    base_url: Optional[str]
+    execution_config: Mapping[str, Any]
+
+
+@dataclass(frozen=True)
+class CasePlan:
+    """Everything needed to execute one test case, detached from the DB session."""
+
+    id: int
+    name: str
+    steps: Tuple[Mapping[str, Any], ...]
+    updated_at: Optional[datetime]
+    project: Optional[ProjectSpec]
+    elements: Mapping[int, ElementSpec]
+
+    @property
+    def base_url(self) -> Optional[str]:
+        return self.project.base_url if self.project else None
+
+    @property
+    def execution_config(self) -> Mapping[str, Any]:
+        return self.project.execution_config if self.project else MappingProxyType({})
+
+
+def _referenced_element_ids(steps: Iterable[Any]) -> List[int]:
+    ids = []
+    for step in steps or []:
+        element_id = step.get("element_id") if isinstance(step, Mapping) else None
+        if element_id:
+            try:
+                ids.append(int(element_id))
+            except (TypeError, ValueError):
+                continue
+    return ids
+
+
+async def load_case_plans(db: AsyncSession, case_ids: Iterable[int]) -> Dict[int, CasePlan]:
+    """Load plans for several cases with two queries. Missing cases are omitted."""
+    case_ids = list(dict.fromkeys(case_ids))
+    if not case_ids:
+        return {}
+
+    res = await db.execute(
+        select(TestCase)
+        .options(joinedload(TestCase.module).joinedload(Module.project))
+        .where(TestCase.id.in_(case_ids))
+    )
+    cases = res.scalars().unique().all()
+
+    element_ids = sorted({element_id for case in cases for element_id in _referenced_element_ids(case.steps)})
+    elements: Dict[int, ElementSpec] = {}
+    if element_ids:
+        res = await db.execute(select(PageElement).where(PageElement.id.in_(element_ids)))
+        for element in res.scalars().all():
+            elements[element.id] = ElementSpec(
+                id=element.id,
+                name=element.name,
+                locator_type=element.locator_type,
+                locator_value=element.locator_value,
+                updated_at=element.updated_at,
+            )
+
+    projects: Dict[int, ProjectSpec] = {}
+    plans: Dict[int, CasePlan] = {}
+    for case in cases:
+        project = case.module.project if case.module else None
+        project_spec = None
+        if project is not None:
+            project_spec = projects.get(project.id)
+            if project_spec is None:
+                project_spec = projects[project.id] = ProjectSpec(
+                    id=project.id,
+                    name=project.name,
+                    base_url=project.base_url,
+                    execution_config=_freeze(project.execution_config or {}),
+                )
+        plans[case.id] = CasePlan(
+            id=case.id,
+            name=case.name,
+            steps=_freeze(list(case.steps or [])),
+            updated_at=case.updated_at,
+            project=project_spec,
+            elements=MappingProxyType(
+                {element_id: elements[element_id] for element_id in _referenced_element_ids(case.steps) if element_id in elements}
+            ),
+        )
+    return plans
+
+
+async def load_case_plan(db: AsyncSession, case_id: int) -> Optional[CasePlan]:
+    return (await load_case_plans(db, [case_id])).get(case_id)
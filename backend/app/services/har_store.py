@@ -0,0 +1,160 @@
+"""
+HAR 录制回放存储模块
+
+每个用例可以把一次成功执行的网络流量录制为 HAR，之后的执行通过
+Playwright 的 HAR 路由在本地返回这些响应，不再访问后端：
+1. record: 每次执行都重新录制，只有用例通过才覆盖已有 HAR
+2. replay: 存在未过期的 HAR 时回放，否则按 record 执行并刷新 HAR
+3. off: 正常访问网络（默认）
+
+HAR 过期判定：
+- 用例步骤、基础 URL 或 updated_at 变化（指纹不一致）
+- 录制时间超过 HAR_MAX_AGE_HOURS
+
+存储路径：backend/hars/case_{id}.har.zip 及同名 .meta.json，
+每个 worker 保存自己录制的 HAR，没有共享文件系统时各 worker 独立录制。
+"""
+import hashlib
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.execution_plan import thaw
+
+HAR_MODES = ("off", "record", "replay")
+
+
+@dataclass(frozen=True)
+class HarPlan:
+    """How one case execution uses HAR: record into record_path or replay from replay_path."""
+
+    mode: str
+    case_id: int
+    fingerprint: str
+    replay_path: Optional[str] = None
+    record_path: Optional[str] = None
+    not_found: str = "fallback"
+    stale_reason: Optional[str] = None
+
+    def context_options(self) -> Dict[str, Any]:
+        if self.record_path:
+            return {"record_har_path": self.record_path, "record_har_content": "attach"}
+        return {}
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "mode": "replay" if self.replay_path else "record" if self.record_path else "off",
+            "requested_mode": self.mode,
+            "not_found": self.not_found if self.replay_path else None,
+            "stale_reason": self.stale_reason,
+        }
+
+
+def case_fingerprint(test_case: Any, base_url: Optional[str]) -> str:
+    """Hash of everything that should invalidate a recorded HAR."""
+    payload = json.dumps(
+        {
+            "steps": thaw(test_case.steps or []),
+            "base_url": base_url,
+            "updated_at": test_case.updated_at.isoformat() if test_case.updated_at else None,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class HarStore:
+    """Per-case HAR files plus metadata used for staleness detection."""
+
+    def __init__(self, root_dir: Optional[str] = None):
+        if not root_dir:
+            # har_store.py 位于 backend/app/services/，需要向上3级
+            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            root_dir = os.path.join(base_dir, "hars")
+        self.root_dir = root_dir
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    def har_path(self, case_id: int) -> str:
+        return os.path.join(self.root_dir, f"case_{case_id}.har.zip")
+
+    def meta_path(self, case_id: int) -> str:
+        return os.path.join(self.root_dir, f"case_{case_id}.meta.json")
+
+    def read_meta(self, case_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.meta_path(case_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def stale_reason(self, case_id: int, fingerprint: str) -> Optional[str]:
+        """None when a usable HAR exists, otherwise why it cannot be replayed."""
+        meta = self.read_meta(case_id)
+        if meta is None or not os.path.isfile(self.har_path(case_id)):
+            return "missing"
+        if meta.get("fingerprint") != fingerprint:
+            return "case_changed"
+        age_hours = (time.time() - meta.get("recorded_at", 0)) / 3600
+        if age_hours > settings.HAR_MAX_AGE_HOURS:
+            return f"expired ({age_hours:.1f}h old)"
+        return None
+
+    def plan(self, case_id: int, fingerprint: str, mode: Optional[str], not_found: Optional[str] = None) -> HarPlan:
+        mode = mode if mode in HAR_MODES else "off"
+        not_found = not_found if not_found in ("fallback", "abort") else settings.HAR_REPLAY_NOT_FOUND
+        if mode == "off":
+            return HarPlan(mode=mode, case_id=case_id, fingerprint=fingerprint)
+
+        stale = self.stale_reason(case_id, fingerprint) if mode == "replay" else None
+        if mode == "replay" and stale is None:
+            return HarPlan(
+                mode=mode,
+                case_id=case_id,
+                fingerprint=fingerprint,
+                replay_path=self.har_path(case_id),
+                not_found=not_found,
+            )
+        if stale:
+            logger.info(f"HAR for case {case_id} is not replayable ({stale}), recording a fresh one")
+        # Record into a unique temp file; it only replaces the stored HAR if the case passes.
+        record_path = os.path.join(self.root_dir, f"case_{case_id}.{uuid.uuid4().hex}.recording.har.zip")
+        return HarPlan(mode=mode, case_id=case_id, fingerprint=fingerprint, record_path=record_path, stale_reason=stale)
+
+    def finalize(self, plan: HarPlan, success: bool) -> bool:
+        """Keep a recording from a passing run; discard it otherwise. Call after the context closed."""
+        if not plan.record_path:
+            return False
+        if not success or not os.path.isfile(plan.record_path):
+            self._remove(plan.record_path)
+            return False
+        os.replace(plan.record_path, self.har_path(plan.case_id))
+        meta = {"case_id": plan.case_id, "fingerprint": plan.fingerprint, "recorded_at": time.time()}
+        tmp_meta = f"{self.meta_path(plan.case_id)}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, self.meta_path(plan.case_id))
+        logger.info(f"Recorded HAR for case {plan.case_id}")
+        return True
+
+    def remove(self, case_id: int) -> None:
+        self._remove(self.har_path(case_id))
+        self._remove(self.meta_path(case_id))
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove {path}: {e}")
+
+
+# 全局 HAR 存储实例
+har_store = HarStore()
@@ -0,0 +1,279 @@
+"""
+执行计划编译模块
+
+把 TestCase.steps 编译为紧凑的预处理计划，执行时不再逐步重复解析：
+1. 动作别名归一化为 StepAction 枚举
+2. 等待时长预先解析为毫秒
+3. {{var}} 模板预先切分为字面量/变量片段，执行时只做拼接
+4. 候选选择器（元素定位、target、locator_chain 及 :visible 变体）预先展开
+
+编译结果按 (用例 ID, 指纹) 缓存在进程内和 Redis 中。指纹由编译器版本、用例 updated_at
+以及引用元素的 updated_at 计算，不再逐步序列化步骤；用例从未更新过（updated_at 为空）时
+才退回到对步骤内容求哈希。任何一项变化都会触发重新编译。
+"""
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.execution_plan import CasePlan, ElementSpec, thaw
+
+TEMPLATE_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# (variable name, original token) — the token is kept when the variable is unset
+TemplatePart = Union[str, Tuple[str, str]]
+
+StepNormalizer = Callable[[Mapping[str, Any]], Dict[str, Any]]
+SelectorExpander = Callable[[Mapping[str, Any], Optional[int], str, Optional[Mapping[int, ElementSpec]]], List[str]]
+
+
+class StepAction(str, Enum):
+    GOTO = "goto"
+    WAIT = "wait"
+    SCREENSHOT = "screenshot"
+    SET_VARIABLE = "set_variable"
+    CLICK = "click"
+    FILL = "fill"
+    SELECT = "select"
+    HOVER = "hover"
+    PRESS = "press"
+    ASSERT_TEXT = "assert_text"
+    ASSERT_VISIBLE = "assert_visible"
+    WAIT_FOR_SELECTOR = "wait_for_selector"
+    GET_TEXT = "get_text"
+    GET_ATTRIBUTE = "get_attribute"
+    UNKNOWN = "unknown"
+
+    @classmethod
+    def parse(cls, name: str) -> "StepAction":
+        try:
+            return cls(name)
+        except ValueError:
+            return cls.UNKNOWN
+
+
+@dataclass(frozen=True)
+class Template:
+    """A value with its {{var}} placeholders split out ahead of time."""
+
+    raw: Any
+    parts: Optional[Tuple[TemplatePart, ...]] = None
+
+    @classmethod
+    def parse(cls, raw: Any) -> "Template":
+        if not isinstance(raw, str) or "{{" not in raw:
+            return cls(raw=raw)
+        parts: List[TemplatePart] = []
+        position = 0
+        for match in TEMPLATE_PATTERN.finditer(raw):
+            if match.start() > position:
+                parts.append(raw[position:match.start()])
+            parts.append((match.group(1), match.group(0)))
+            position = match.end()
+        if position < len(raw):
+            parts.append(raw[position:])
+        return cls(raw=raw, parts=tuple(parts))
+
+    def render(self, context: Mapping[str, Any]) -> Any:
+        if self.parts is None:
+            return self.raw
+        return "".join(
+            part if isinstance(part, str) else str(context.get(part[0], part[1]))
+            for part in self.parts
+        )
+
+    def to_json(self) -> Any:
+        return {"raw": self.raw, "parts": [part if isinstance(part, str) else list(part) for part in self.parts or []]}
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, Any]) -> "Template":
+        parts = data.get("parts")
+        if not parts:
+            return cls(raw=data.get("raw"))
+        return cls(raw=data.get("raw"), parts=tuple(part if isinstance(part, str) else tuple(part) for part in parts))
+
+
+@dataclass(frozen=True)
+class CompiledStep:
+    index: int
+    action: StepAction
+    action_name: str  # canonical action string, kept for actions without an enum member
+    value: Template
+    selectors: Tuple[str, ...]
+    normalized: Mapping[str, Any]  # the normalized step dict, read-only
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "action_name": self.action_name,
+            "value": self.value.to_json(),
+            "selectors": list(self.selectors),
+            "normalized": thaw(self.normalized),
+        }
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, Any]) -> "CompiledStep":
+        return cls(
+            index=data["index"],
+            action=StepAction.parse(data["action_name"]),
+            action_name=data["action_name"],
+            value=Template.from_json(data["value"]),
+            selectors=tuple(data["selectors"]),
+            normalized=MappingProxyType(dict(data["normalized"])),
+        )
+
+
+@dataclass(frozen=True)
+class CompiledCase:
+    case_id: int
+    fingerprint: str
+    steps: Tuple[CompiledStep, ...]
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"case_id": self.case_id, "fingerprint": self.fingerprint, "steps": [step.to_json() for step in self.steps]},
+            ensure_ascii=False,
+            default=str,
+        )
+
+    @classmethod
+    def from_json(cls, payload: str) -> "CompiledCase":
+        data = json.loads(payload)
+        return cls(
+            case_id=data["case_id"],
+            fingerprint=data["fingerprint"],
+            steps=tuple(CompiledStep.from_json(step) for step in data["steps"]),
+        )
+
+
+def plan_fingerprint(plan: CasePlan) -> str:
+    """
+    Revision key of a case plan: compiler version, case updated_at and the
+    revisions of the elements its steps reference. The steps themselves are
+    not serialized; only cases that were never updated (updated_at is NULL)
+    fall back to hashing their content.
+    """
+    if plan.updated_at is None:
+        return _content_fingerprint(plan)
+    elements = ",".join(
+        f"{element.id}@{element.updated_at.isoformat() if element.updated_at else element.locator_value}"
+        for element in sorted(plan.elements.values(), key=lambda element: element.id)
+    )
+    key = f"{settings.PLAN_COMPILER_VERSION}|{plan.updated_at.isoformat()}|{elements}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _content_fingerprint(plan: CasePlan) -> str:
+    """Hash of the steps and every element locator they reference."""
+    payload = json.dumps(
+        {
+            "version": settings.PLAN_COMPILER_VERSION,
+            "steps": thaw(plan.steps),
+            "elements": sorted(
+                (element.id, element.locator_value, element.updated_at.isoformat() if element.updated_at else None)
+                for element in plan.elements.values()
+            ),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def compile_case(
+    plan: CasePlan,
+    normalize_step: StepNormalizer,
+    expand_selectors: SelectorExpander,
+    fingerprint: Optional[str] = None,
+) -> CompiledCase:
+    """Compile a case plan. The runner supplies its normalization and selector rules."""
+    steps = []
+    for index, raw_step in enumerate(plan.steps):
+        normalized = normalize_step(raw_step)
+        action_name = normalized["action"]
+        selectors = expand_selectors(normalized, normalized.get("element_id"), action_name, plan.elements)
+        steps.append(
+            CompiledStep(
+                index=index,
+                action=StepAction.parse(action_name),
+                action_name=action_name,
+                value=Template.parse(normalized.get("value")),
+                selectors=tuple(selectors),
+                normalized=MappingProxyType(normalized),
+            )
+        )
+    return CompiledCase(case_id=plan.id, fingerprint=fingerprint or plan_fingerprint(plan), steps=tuple(steps))
+
+
+class PlanCompilerCache:
+    """Two-level cache (process LRU + Redis) of compiled case plans."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, str], CompiledCase]" = OrderedDict()
+        self._redis: Optional[redis.Redis] = None
+
+    def _get_redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.from_url(
+                settings.REDIS_URL, encoding="utf-8", decode_responses=True, socket_connect_timeout=1
+            )
+        return self._redis
+
+    @staticmethod
+    def _redis_key(case_id: int, fingerprint: str) -> str:
+        return f"compiled_plan:{case_id}:{fingerprint}"
+
+    def _remember(self, compiled: CompiledCase) -> None:
+        key = (compiled.case_id, compiled.fingerprint)
+        self._entries[key] = compiled
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_compile(
+        self,
+        plan: CasePlan,
+        normalize_step: StepNormalizer,
+        expand_selectors: SelectorExpander,
+    ) -> CompiledCase:
+        fingerprint = plan_fingerprint(plan)
+        key = (plan.id, fingerprint)
+        compiled = self._entries.get(key)
+        if compiled is not None:
+            self._entries.move_to_end(key)
+            return compiled
+
+        if settings.PLAN_CACHE_REDIS_ENABLED:
+            try:
+                payload = await self._get_redis().get(self._redis_key(plan.id, fingerprint))
+                if payload:
+                    compiled = CompiledCase.from_json(payload)
+                    self._remember(compiled)
+                    return compiled
+            except Exception as e:
+                logger.debug(f"Compiled plan cache read failed for case {plan.id}: {e}")
+
+        compiled = compile_case(plan, normalize_step, expand_selectors, fingerprint)
+        self._remember(compiled)
+        if settings.PLAN_CACHE_REDIS_ENABLED:
+            try:
+                await self._get_redis().set(
+                    self._redis_key(plan.id, fingerprint), compiled.to_json(), ex=settings.PLAN_CACHE_TTL
+                )
+            except Exception as e:
+                logger.debug(f"Compiled plan cache write failed for case {plan.id}: {e}")
+        return compiled
+
+
+# 每个进程一个编译计划缓存
+plan_cache = PlanCompilerCache()
@@ -0,0 +1,110 @@
+"""
+执行进度推送模块
+
+Runner 在执行过程中把精简的进度事件发布到 Redis：
+1. PUBLISH 到频道 execution:progress:{run_id}，供在线订阅者实时接收
+2. 同时写入长度有限的回放列表 execution:progress:{run_id}:buffer，
+   晚到的订阅者可以先补齐历史事件
+
+run_id 即 Celery 任务 ID（分布式套件为 chord 回调任务 ID），
+WebSocket 接口见 app/api/v1/endpoints/execution.py。
+"""
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.logger import logger
+
+_redis_client: Optional[redis.Redis] = None
+
+
+def get_progress_redis() -> redis.Redis:
+    """Process-wide Redis client for progress events."""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
+    return _redis_client
+
+
+def progress_channel(run_id: str) -> str:
+    return f"execution:progress:{run_id}"
+
+
+def progress_buffer_key(run_id: str) -> str:
+    return f"execution:progress:{run_id}:buffer"
+
+
+def progress_seq_key(run_id: str) -> str:
+    return f"execution:progress:{run_id}:seq"
+
+
+class ProgressPublisher:
+    """Publishes progress events for one run. Never raises into the caller."""
+
+    def __init__(self, run_id: str, client: Optional[redis.Redis] = None):
+        self.run_id = run_id
+        self.client = client or get_progress_redis()
+
+    async def publish(self, event_type: str, **fields: Any) -> None:
+        try:
+            seq = await self.client.incr(progress_seq_key(self.run_id))
+            event = {"type": event_type, "run_id": self.run_id, "seq": seq, "ts": int(time.time() * 1000)}
+            event.update({key: value for key, value in fields.items() if value is not None})
+            message = json.dumps(event, ensure_ascii=False, default=str)
+
+            buffer_key = progress_buffer_key(self.run_id)
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.publish(progress_channel(self.run_id), message)
+                pipe.rpush(buffer_key, message)
+                pipe.ltrim(buffer_key, -settings.PROGRESS_BUFFER_SIZE, -1)
+                pipe.expire(buffer_key, settings.PROGRESS_TTL)
+                pipe.expire(progress_seq_key(self.run_id), settings.PROGRESS_TTL)
+                await pipe.execute()
+        except Exception as e:
+            logger.debug(f"Failed to publish progress event {event_type} for run {self.run_id}: {e}")
+
+    async def case_started(self, case_id: int, case_name: str, total_steps: int) -> None:
+        await self.publish("case_start", case_id=case_id, case_name=case_name, total_steps=total_steps)
+
+    async def step_finished(
+        self,
+        case_id: int,
+        step_index: int,
+        action: str,
+        status: str,
+        duration_ms: int,
+        used_selector: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        await self.publish(
+            "step",
+            case_id=case_id,
+            step_index=step_index,
+            action=action,
+            status=status,
+            duration_ms=duration_ms,
+            used_selector=used_selector,
+            error=(error or None) and str(error)[:300],
+        )
+
+    async def case_finished(self, case_id: int, success: bool, duration_ms: int, error: Optional[str] = None) -> None:
+        await self.publish(
+            "case_end",
+            case_id=case_id,
+            status="passed" if success else "failed",
+            duration_ms=duration_ms,
+            error=(error or None) and str(error)[:300],
+        )
+
+    async def run_finished(self, success: bool, **fields: Any) -> None:
+        await self.publish("run_end", status="passed" if success else "failed", **fields)
+
+
+async def read_progress_buffer(run_id: str, client: Optional[redis.Redis] = None) -> List[Dict[str, Any]]:
+    """Return buffered events for a run, oldest first."""
+    client = client or get_progress_redis()
+    raw = await client.lrange(progress_buffer_key(run_id), 0, -1)
+    return [json.loads(item) for item in raw]
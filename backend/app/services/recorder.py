@@ -12,8 +12,9 @@ import asyncio
 """
 import json
 from typing import Callable, Optional, List, Dict, Any
-from playwright.async_api import async_playwright, Page, BrowserContext, Browser
+from playwright.async_api import Page, BrowserContext, Browser
 from app.tools.playwright_tool import PlaywrightTool
+from app.tools.playwright_driver import playwright_driver
 
 # 使用全局日志系统
 from app.core.logger import logger
@@ -115,9 +116,13 @@ class RecorderService:
 
     async def start_recording(self, url: str, callback: Callable):
         self.event_callback = callback
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=False) # Headful for user interaction
-        self.context = await self.browser.new_context()
+        self.playwright = await playwright_driver.acquire()
+        try:
+            self.browser = await self.playwright.chromium.launch(headless=False) # Headful for user interaction
+            self.context = await self.browser.new_context()
+        except Exception:
+            await self.stop_recording()
+            raise
         
         # ─── Page Agent Integration ──────────────────────────────────────────
         # 1. Inject PageAgent script
@@ -272,19 +277,21 @@ class RecorderService:
             await self.event_callback(event)
 
     async def stop_recording(self):
+        logger.info("Stopping recording and closing browser...")
         try:
-            logger.info("Stopping recording and closing browser...")
             if self.context:
                 await self.context.close()
-                self.context = None
             if self.browser:
                 await self.browser.close()
-                self.browser = None
-            if self.playwright:
-                await self.playwright.stop()
-                self.playwright = None
             logger.info("Recording stopped and browser closed successfully")
         except Exception as e:
             logger.error(f"Error closing recording browser: {e}")
+        finally:
+            self.context = None
+            self.browser = None
+            # Always drop the driver reference, or the shared driver never idles out
+            if self.playwright:
+                self.playwright = None
+                await playwright_driver.release()
             
 recorder_service = RecorderService()
@@ -6,18 +6,25 @@
 2. 管理报告的数据库记录（CRUD 操作）
 3. 物理删除报告文件和目录
 4. 支持自定义报告名称（用于测试套件）
+5. 汇总截图去重节省的字节数，写入报告的 Environment 面板
+6. allure 以异步子进程运行并限制并发；后台生成时报告记录经历 pending -> ready/failed
 
 报告存储路径：backend/allure-reports/
 结果文件路径：backend/allure-results/
 """
+import asyncio
+import glob
+import json
 import os
 import subprocess
 import shutil
-from typing import List, Dict, Optional
+from typing import Any, Coroutine, List, Dict, Optional, Set, Tuple
 from sqlalchemy import select
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.report import TestReport
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.report import TestReport, REPORT_FAILED, REPORT_PENDING, REPORT_READY
 from app.schemas.report import TestReportCreate
 
 # 使用全局日志系统
@@ -41,6 +48,28 @@ class ReportService:
         os.makedirs(self.results_dir, exist_ok=True)
         os.makedirs(self.reports_dir, exist_ok=True)
 
+    @staticmethod
+    def _write_attachment_summary(source_dir: str) -> None:
+        """Sum the per-test screenshot_bytes_saved parameters into environment.properties."""
+        saved = 0
+        for path in glob.glob(os.path.join(source_dir, "*-result.json")):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    parameters = json.load(f).get("parameters") or []
+            except (OSError, ValueError):
+                continue
+            for parameter in parameters:
+                if parameter.get("name") == "screenshot_bytes_saved":
+                    try:
+                        saved += int(parameter.get("value") or 0)
+                    except (TypeError, ValueError):
+                        pass
+        try:
+            with open(os.path.join(source_dir, "environment.properties"), "w", encoding="utf-8") as f:
+                f.write(f"Screenshot.Bytes.Saved={saved}\n")
+        except OSError as e:
+            logger.debug(f"Failed to write attachment summary: {e}")
+
     async def generate_allure_report(
         self,
         test_case_id: Optional[int] = None,
@@ -51,9 +80,68 @@ class ReportService:
         error_message: Optional[str] = None,
         executor_id: Optional[int] = None,
         report_name: Optional[str] = None,
-        results_dir: Optional[str] = None
+        results_dir: Optional[str] = None,
+        background: Optional[bool] = None,
+        cleanup_results_dir: bool = False,
     ) -> TestReport:
-        """Generate Allure report and save to database."""
+        """
+        Generate Allure report and save to database.
+
+        With ``background`` (default REPORT_GENERATION_BACKGROUND) the row is
+        saved as pending and returned immediately; the HTML is generated by
+        report_generator and the row becomes ready or failed. With
+        ``cleanup_results_dir`` the service owns the results dir from the
+        moment it is called: it is removed once generation finished, or
+        right away if anything fails before the background render started.
+        """
+        # Use provided results_dir or default to self.results_dir
+        source_dir = results_dir if results_dir else self.results_dir
+        cleanup_dir = source_dir if cleanup_results_dir and results_dir else None
+        if background is None:
+            background = settings.REPORT_GENERATION_BACKGROUND
+
+        scheduled = False
+        try:
+            report_path = os.path.join(self.reports_dir, self._report_name(report_name, test_case_id, test_suite_id))
+
+            if background and self.db:
+                db_report = await self._save_report(
+                    test_case_id, test_suite_id, executor_id, report_path, status,
+                    browser_type, headless, error_message, REPORT_PENDING,
+                )
+                # From here on the background render owns (and removes) cleanup_dir
+                report_generator.submit(report_generator.render(source_dir, report_path, db_report.id, cleanup_dir))
+                scheduled = True
+                return db_report
+
+            report_path, report_status = await report_generator.generate(source_dir, report_path)
+
+            # Save to database if db session provided
+            if self.db:
+                return await self._save_report(
+                    test_case_id, test_suite_id, executor_id, report_path, status,
+                    browser_type, headless, error_message, report_status,
+                )
+
+            # Return a mock report if no db
+            return TestReport(
+                id=0,
+                test_case_id=test_case_id,
+                test_suite_id=test_suite_id,
+                report_path=report_path,
+                status=status,
+                report_status=report_status,
+                browser_type=browser_type,
+                headless=headless,
+                error_message=error_message,
+                created_at=datetime.now()
+            )
+        finally:
+            if cleanup_dir and not scheduled:
+                shutil.rmtree(cleanup_dir, ignore_errors=True)
+
+    @staticmethod
+    def _report_name(report_name: Optional[str], test_case_id: Optional[int], test_suite_id: Optional[int]) -> str:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         if not report_name:
@@ -66,58 +154,38 @@ class ReportService:
             # Sanitize report name to be filesystem friendly
             safe_name = "".join([c for c in report_name if c.isalnum() or c in (' ', '-', '_')]).strip().replace(' ', '_')
             report_name = f"{safe_name}_{timestamp}"
-        
-        report_path = os.path.join(self.reports_dir, report_name)
-        
-        # Use provided results_dir or default to self.results_dir
-        source_dir = results_dir if results_dir else self.results_dir
-        
-        try:
-            subprocess.run(
-                ["allure", "generate", source_dir, "-o", report_path, "--clean"],
-                check=True,
-                timeout=30
-            )
-            logger.info(f"Allure report generated: {report_path}")
-        except FileNotFoundError:
-            logger.warning("Allure CLI not found, skipping HTML report generation")
-            report_path = "allure_not_installed"
-        except Exception as e:
-            logger.error(f"Failed to generate report: {e}")
-            report_path = f"error: {str(e)}"
-        
-        # Save to database if db session provided
-        if self.db:
-            report_data = TestReportCreate(
-                test_case_id=test_case_id,
-                test_suite_id=test_suite_id,
-                executor_id=executor_id,
-                report_path=report_path,
-                status=status,
-                browser_type=browser_type,
-                headless=headless,
-                error_message=error_message
-            )
-            
-            db_report = TestReport(**report_data.model_dump())
-            self.db.add(db_report)
-            await self.db.commit()
-            await self.db.refresh(db_report)
-            return db_report
-        
-        # Return a mock report if no db
-        return TestReport(
-            id=0,
+        return report_name
+
+    async def _save_report(
+        self,
+        test_case_id: Optional[int],
+        test_suite_id: Optional[int],
+        executor_id: Optional[int],
+        report_path: str,
+        status: str,
+        browser_type: str,
+        headless: bool,
+        error_message: Optional[str],
+        report_status: str,
+    ) -> TestReport:
+        report_data = TestReportCreate(
             test_case_id=test_case_id,
             test_suite_id=test_suite_id,
+            executor_id=executor_id,
             report_path=report_path,
             status=status,
+            report_status=report_status,
             browser_type=browser_type,
             headless=headless,
-            error_message=error_message,
-            created_at=datetime.now()
+            error_message=error_message
         )
 
+        db_report = TestReport(**report_data.model_dump())
+        self.db.add(db_report)
+        await self.db.commit()
+        await self.db.refresh(db_report)
+        return db_report
+
     # CRUD helper methods for report management
     async def get_reports(self, skip: int = 0, limit: int = 100) -> List[TestReport]:
         stmt = select(TestReport).offset(skip).limit(limit)
@@ -186,3 +254,82 @@ class ReportService:
         path = os.path.join(self.reports_dir, report_name)
         if os.path.exists(path):
             shutil.rmtree(path)
+
+
+class AllureReportGenerator:
+    """
+    Runs ``allure generate`` as an async subprocess, at most
+    REPORT_GENERATION_CONCURRENCY at a time, so the JVM never blocks the event loop.
+    Background renders are tracked so shutdown can wait for them.
+    """
+
+    def __init__(self):
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(max(1, settings.REPORT_GENERATION_CONCURRENCY))
+        return self._semaphore
+
+    async def generate(self, source_dir: str, report_path: str) -> Tuple[str, str]:
+        """Returns (report_path, report_status); the path is a marker string on failure."""
+        async with self._get_semaphore():
+            await asyncio.to_thread(ReportService._write_attachment_summary, source_dir)
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    "allure", "generate", source_dir, "-o", report_path, "--clean",
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+            except FileNotFoundError:
+                logger.warning("Allure CLI not found, skipping HTML report generation")
+                return "allure_not_installed", REPORT_FAILED
+            try:
+                _, stderr = await asyncio.wait_for(process.communicate(), timeout=settings.REPORT_GENERATION_TIMEOUT)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                logger.error(f"Allure report generation timed out after {settings.REPORT_GENERATION_TIMEOUT}s")
+                return f"error: timed out after {settings.REPORT_GENERATION_TIMEOUT}s", REPORT_FAILED
+            if process.returncode != 0:
+                message = stderr.decode(errors="ignore").strip()[:500]
+                logger.error(f"Failed to generate report: {message}")
+                return f"error: allure exited with {process.returncode}: {message}", REPORT_FAILED
+        logger.info(f"Allure report generated: {report_path}")
+        return report_path, REPORT_READY
+
+    async def render(self, source_dir: str, report_path: str, report_id: int, cleanup_dir: Optional[str]) -> None:
+        """Generate a pending report and record the outcome on its row."""
+        try:
+            path, report_status = await self.generate(source_dir, report_path)
+        except Exception as e:
+            logger.error(f"Failed to generate report {report_id}: {e}", exc_info=True)
+            path, report_status = f"error: {str(e)}", REPORT_FAILED
+        finally:
+            if cleanup_dir:
+                shutil.rmtree(cleanup_dir, ignore_errors=True)
+        try:
+            async with AsyncSessionLocal() as db:
+                report = await db.get(TestReport, report_id)
+                if report is None:
+                    return
+                report.report_path = path
+                report.report_status = report_status
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Failed to update report {report_id} to {report_status}: {e}")
+
+    def submit(self, coro: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def drain(self) -> None:
+        """Wait for background renders (shutdown)."""
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+
+# 每个进程一个报告生成器，限制同时运行的 allure 进程数
+report_generator = AllureReportGenerator()
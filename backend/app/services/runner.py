@@ -9,25 +9,42 @@
 """
 import os
 import re
+import time
 import uuid
 import json
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
 import allure_commons
-from allure_commons.model2 import TestResult, TestStepResult, Status, StatusDetails
-from allure_commons.types import AttachmentType
+from allure_commons.model2 import TestResult, TestStepResult, Status, StatusDetails, Parameter
 
+from app.core.config import settings
 from app.core.logger import logger
-from app.models.case import TestCase
-from app.models.element import PageElement
-from app.models.module import Module
 from app.models.heal_log import HealLog
+from app.models.case_timing import CaseTiming
 from app.tools.playwright_tool import PlaywrightTool
+from app.tools.browser_pool import BrowserPool
+from app.tools.network_profiles import NetworkBlocker, resolve_network_profile
+from app.services.progress import ProgressPublisher
+from app.services.artifact_store import artifact_store
+from app.services.session_cache import SessionFixtureConfig, session_state_cache
+from app.services.har_store import case_fingerprint, har_store
+from app.services.execution_plan import CasePlan, ElementSpec, load_case_plan
+from app.services.plan_compiler import CompiledStep, plan_cache
+from app.services.screenshot_policy import ScreenshotPolicy
+from app.services.settle_policy import SettlePolicy
+from app.services.trace_policy import TRACE_ATTACHMENT_TYPE, TracePolicy
+from app.services.video_store import VideoPolicy, video_store
+from app.services.attachment_writer import AttachmentWriter
+from app.services.selector_ranking import (
+    SelectorObservation,
+    SelectorScore,
+    observations_from_step,
+    selector_ranker,
+    step_key,
+)
 from app.services.ai_service import ai_service
 from app.db.session import AsyncSessionLocal
 
@@ -50,6 +67,9 @@ class TestRunner:
 
     INTERACTIVE_ACTIONS = {"click", "fill", "select", "hover", "press"}
 
+    # Actions whose targets may legitimately be hidden
+    TEXT_READ_ACTIONS = {"get_text", "get_attribute", "assert_text"}
+
     ACTION_ALIASES = {
         "open": "goto",
         "visit": "goto",
@@ -71,8 +91,27 @@ class TestRunner:
         "check_visible": "assert_visible",
     }
 
-    def __init__(self, db: AsyncSession, results_dir: Optional[str] = None):
+    def __init__(
+        self,
+        db: AsyncSession,
+        results_dir: Optional[str] = None,
+        browser_pool: Optional[BrowserPool] = None,
+        progress: Optional[ProgressPublisher] = None,
+        har_mode: Optional[str] = None,
+        screenshot_options: Optional[Dict[str, Any]] = None,
+        video_mode: Optional[str] = None,
+    ):
         self.db = db
+        self.browser_pool = browser_pool
+        self.progress = progress
+        # off / record / replay; None falls back to the project's execution_config["har"]
+        self.har_mode = har_mode
+        # Per-run screenshot policy overrides, merged over the project's execution_config["screenshots"]
+        self.screenshot_options = screenshot_options
+        # off / on_failure / always; None falls back to the project's execution_config["video"]
+        self.video_mode = video_mode
+        # case_id -> historical selector stats used to order candidates
+        self._selector_stats: Dict[int, Dict[Tuple[str, str], SelectorScore]] = {}
         if results_dir:
             self.results_dir = results_dir
         else:
@@ -86,7 +125,12 @@ class TestRunner:
         headless: bool = True,
         browser_type: str = "chromium",
         executor_id: int = None,
+        plan: Optional[CasePlan] = None,
     ) -> Dict[str, Any]:
+        """
+        Execute one test case. ``plan`` is the case's preloaded execution plan
+        (see app.services.execution_plan); it is loaded here when not given.
+        """
         result: Dict[str, Any] = {
             "success": False,
             "steps": [],
@@ -96,19 +140,71 @@ class TestRunner:
         }
         execution_context: Dict[str, Any] = {}
 
-        stmt = (
-            select(TestCase)
-            .options(joinedload(TestCase.module).joinedload(Module.project))
-            .where(TestCase.id == test_case_id)
-        )
-        res = await self.db.execute(stmt)
-        test_case = res.scalars().first()
+        test_case = plan or await load_case_plan(self.db, test_case_id)
 
         if not test_case:
             result["error"] = "Test case not found"
             return result
 
-        base_url = test_case.module.project.base_url if test_case.module and test_case.module.project else None
+        compiled_case = await plan_cache.get_or_compile(test_case, self._normalize_step, self._build_selector_candidates)
+
+        project = test_case.project
+        base_url = test_case.base_url
+        execution_config = test_case.execution_config
+
+        # Seed the context with a cached login session when the project defines one.
+        session_config = SessionFixtureConfig.from_project_config(execution_config)
+        context_options: Dict[str, Any] = {}
+        if session_config and session_config.login_case_id != test_case.id:
+            storage_state, created = await session_state_cache.get_or_create(
+                project.id,
+                browser_type,
+                session_config.ttl,
+                lambda: self._run_session_fixture(session_config.login_case_id, base_url, headless, browser_type),
+            )
+            result["session_fixture"] = {
+                "login_case_id": session_config.login_case_id,
+                "applied": storage_state is not None,
+                "reused": storage_state is not None and not created,
+                "login_failed": storage_state is None,
+            }
+            if storage_state is not None:
+                context_options["storage_state"] = storage_state
+
+        har_config = execution_config.get("har") or {}
+        har_plan = har_store.plan(
+            test_case.id,
+            case_fingerprint(test_case, base_url),
+            self.har_mode or har_config.get("mode"),
+            har_config.get("not_found"),
+        )
+        context_options.update(har_plan.context_options())
+
+        video_policy = VideoPolicy.from_config(
+            execution_config.get("video"), {"mode": self.video_mode} if self.video_mode else None
+        )
+        video_record_dir: Optional[str] = None
+        video_path: Optional[str] = None
+        failure_offset_s: Optional[float] = None
+        if video_policy.enabled:
+            video_record_dir = video_store.recording_dir()
+            context_options.update(video_policy.context_options(video_record_dir))
+
+        selector_observations: List[SelectorObservation] = []
+        if settings.SELECTOR_RANKING_ENABLED:
+            try:
+                self._selector_stats[test_case.id] = await selector_ranker.load(self.db, test_case.id)
+            except Exception as e:
+                logger.warning(f"Failed to load selector stats for case {test_case.id}: {e}")
+
+        screenshot_policy = ScreenshotPolicy.from_config(execution_config.get("screenshots"), self.screenshot_options)
+        attachment_writer = AttachmentWriter()
+        settle_policy = SettlePolicy.from_config(execution_config.get("settle"))
+        trace_policy = TracePolicy.from_config(execution_config.get("tracing"))
+
+        network_blocker = NetworkBlocker(
+            resolve_network_profile(execution_config.get("network_profile"))
+        )
 
         test_uuid = str(uuid.uuid4())
         test_result = TestResult(uuid=test_uuid, name=test_case.name)
@@ -118,15 +214,39 @@ class TestRunner:
         if executor_id:
              test_result.labels.append(allure_commons.model2.Label(name="executor", value=str(executor_id)))
 
-        async with PlaywrightTool(headless=headless, browser_type=browser_type) as tool:
+        if self.progress:
+            await self.progress.case_started(test_case.id, test_case.name, len(test_case.steps or []))
+
+        async with PlaywrightTool(
+            headless=headless,
+            browser_type=browser_type,
+            pool=self.browser_pool,
+            context_options=context_options,
+            semantic_weights=execution_config.get("semantic_weights"),
+        ) as tool:
+            video_started = time.monotonic()
             try:
+                if har_plan.replay_path:
+                    await tool.replay_har(har_plan.replay_path, not_found=har_plan.not_found)
+                await network_blocker.install(tool.context)
+                if trace_policy.enabled:
+                    try:
+                        await tool.start_tracing(title=test_case.name, **trace_policy.tracing_kwargs())
+                    except Exception as e:
+                        logger.warning(f"Failed to start tracing for case {test_case.id}: {e}")
                 if base_url:
                     await tool.goto(base_url)
-                    await tool.wait(800)
+                    await tool.settle(**settle_policy.settle_kwargs())
 
-                for step_index, raw_step in enumerate(test_case.steps or []):
+                for compiled_step in compiled_case.steps:
+                    step_index = compiled_step.index
                     step_start = int(datetime.now().timestamp() * 1000)
-                    normalized_step = self._normalize_step(raw_step)
+                    normalized_step = compiled_step.normalized
+                    if tool.tracing and trace_policy.should_rotate(step_index):
+                        try:
+                            await tool.rotate_trace_chunk()
+                        except Exception as e:
+                            logger.debug(f"Trace chunk rotation failed: {e}")
                     
                     # Create Allure step
                     step_title = f"[{step_index + 1}] {normalized_step['action']} {normalized_step.get('value') or ''}"
@@ -137,6 +257,7 @@ class TestRunner:
                         stop=step_start, # Will update later
                         status=Status.BROKEN # Default
                     )
+                    step_result: Optional[Dict[str, Any]] = None
 
                     try:
                         step_result = await self._execute_step(
@@ -145,26 +266,30 @@ class TestRunner:
                             context=execution_context,
                             step_index=step_index,
                             case_id=test_case.id,
+                            compiled=compiled_step,
+                            settle=settle_policy,
                         )
                         result["steps"].append(step_result)
+                        selector_observations.extend(
+                            observations_from_step(
+                                step_key(normalized_step),
+                                normalized_step.get("element_id"),
+                                step_result,
+                                int(datetime.now().timestamp() * 1000) - step_start,
+                            )
+                        )
 
-                        # Take screenshot immediately after step
-                        try:
-                            screenshot_bytes = await tool.screenshot()
-                            attachment_uuid = str(uuid.uuid4())
-                            with open(os.path.join(self.results_dir, f"{attachment_uuid}.png"), "wb") as f:
-                                f.write(screenshot_bytes)
-                            
-                            # Add attachment to the STEP result
-                            step_res_obj.attachments.append(
-                                allure_commons.model2.Attachment(
-                                    name="Screenshot",
-                                    source=f"{attachment_uuid}.png",
-                                    type=AttachmentType.PNG,
-                                )
+                        # Take screenshot after the step when the policy asks for one
+                        step_failed = not step_result["success"]
+                        if screenshot_policy.should_capture(step_index, normalized_step["action"], step_failed):
+                            await self._attach_screenshot(
+                                tool,
+                                step_res_obj,
+                                screenshot_policy,
+                                attachment_writer,
+                                "Error Screenshot" if step_failed else "Screenshot",
+                                failure=step_failed,
                             )
-                        except Exception:
-                            pass
 
                         if step_result["success"]:
                             step_res_obj.status = Status.PASSED
@@ -178,42 +303,77 @@ class TestRunner:
                         step_res_obj.status = Status.FAILED
                         step_res_obj.statusDetails = StatusDetails(message=str(e))
                         # If screenshot wasn't taken in try block (e.g. error in execute_step), take it here
-                        if not step_res_obj.attachments:
-                             try:
-                                screenshot_bytes = await tool.screenshot()
-                                attachment_uuid = str(uuid.uuid4())
-                                with open(os.path.join(self.results_dir, f"{attachment_uuid}.png"), "wb") as f:
-                                    f.write(screenshot_bytes)
-                                step_res_obj.attachments.append(
-                                    allure_commons.model2.Attachment(
-                                        name="Error Screenshot",
-                                        source=f"{attachment_uuid}.png",
-                                        type=AttachmentType.PNG,
-                                    )
-                                )
-                             except:
-                                 pass
+                        if not step_res_obj.attachments and screenshot_policy.captures_failures:
+                            await self._attach_screenshot(
+                                tool, step_res_obj, screenshot_policy, attachment_writer, "Error Screenshot", failure=True
+                            )
                         test_result.steps.append(step_res_obj)
+                        if self.progress:
+                            await self.progress.step_finished(
+                                case_id=test_case.id,
+                                step_index=step_index,
+                                action=normalized_step["action"],
+                                status="failed",
+                                duration_ms=int(datetime.now().timestamp() * 1000) - step_start,
+                                used_selector=(step_result or {}).get("used_selector"),
+                                error=str(e),
+                            )
                         raise e
                     
                     step_res_obj.stop = int(datetime.now().timestamp() * 1000)
                     test_result.steps.append(step_res_obj)
+                    if self.progress:
+                        await self.progress.step_finished(
+                            case_id=test_case.id,
+                            step_index=step_index,
+                            action=normalized_step["action"],
+                            status="passed",
+                            duration_ms=step_res_obj.stop - step_start,
+                            used_selector=step_result.get("used_selector"),
+                        )
 
                 result["success"] = True
                 test_result.status = Status.PASSED
             except Exception as e:
+                failure_offset_s = time.monotonic() - video_started
                 result["error"] = str(e)
                 test_result.status = Status.FAILED
                 test_result.statusDetails = StatusDetails(message=str(e))
-                try:
-                    import base64
-                    screenshot_bytes = await tool.screenshot()
-                    result["screenshot"] = base64.b64encode(screenshot_bytes).decode("utf-8")
-                except Exception:
-                    pass
+                if screenshot_policy.captures_failures:
+                    try:
+                        # Keep only a reference in the result; the image goes to the artifact store.
+                        screenshot_bytes = await tool.screenshot(**screenshot_policy.screenshot_kwargs())
+                        result["screenshot"] = await artifact_store.aput(screenshot_bytes, screenshot_policy.extension)
+                    except Exception:
+                        pass
+                # Landing on the login page means the cached session has expired server-side.
+                if "storage_state" in context_options and tool.page and session_config.is_auth_redirect(tool.page.url):
+                    session_state_cache.invalidate(project.id, browser_type)
+                    result["session_fixture"]["invalidated"] = True
             finally:
                 test_result.stop = int(datetime.now().timestamp() * 1000)
                 result["context"] = execution_context
+                if tool.tracing:
+                    result["trace"] = await self._finish_trace(tool, test_result, keep=not result["success"])
+                if video_record_dir and tool.page and tool.page.video:
+                    try:
+                        video_path = await tool.page.video.path()
+                    except Exception as e:
+                        logger.debug(f"Video path unavailable: {e}")
+                test_result.parameters.append(
+                    Parameter(name="screenshot_bytes_saved", value=str(attachment_writer.bytes_saved))
+                )
+                if har_plan.mode != "off":
+                    result["har"] = har_plan.summary()
+                    test_result.parameters.append(Parameter(name="network_mode", value=result["har"]["mode"]))
+                if not network_blocker.profile.is_noop:
+                    network_stats = network_blocker.stats()
+                    result["network_blocking"] = network_stats
+                    test_result.parameters.extend([
+                        Parameter(name="network_profile", value=network_stats["profile"]),
+                        Parameter(name="blocked_requests", value=str(network_stats["blocked_requests"])),
+                        Parameter(name="blocked_bytes", value=str(network_stats["blocked_bytes"])),
+                    ])
                 with open(os.path.join(self.results_dir, f"{test_uuid}-result.json"), "w") as f:
                     import attr
                     import json
@@ -226,9 +386,134 @@ class TestRunner:
                             return super().default(obj)
 
                     json.dump(attr.asdict(test_result), f, cls=AllureEncoder, indent=4)
+                # Reports are generated from the results dir, so every attachment must be on disk first.
+                await attachment_writer.close()
+                result["attachments"] = attachment_writer.stats()
+
+        # The HAR is only flushed when the context closes, so finalize after the tool exits.
+        if har_plan.record_path:
+            result["har"]["recorded"] = har_store.finalize(har_plan, result["success"])
+        # Likewise the video file is complete only once the context is closed.
+        if video_record_dir:
+            try:
+                result["video"] = video_store.finalize(
+                    video_policy,
+                    video_record_dir,
+                    video_path,
+                    project_id=project.id if project else None,
+                    case_id=test_case.id,
+                    success=result["success"],
+                    failure_offset_s=failure_offset_s,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to store video for case {test_case.id}: {e}")
 
+        result["duration_ms"] = test_result.stop - test_result.start
+        await self._write_case_timing(
+            case_id=test_case.id,
+            duration_ms=result["duration_ms"],
+            status="success" if result["success"] else "failure",
+        )
+        if settings.SELECTOR_RANKING_ENABLED:
+            try:
+                await selector_ranker.flush(self.db, test_case.id, selector_observations)
+            except Exception as e:
+                logger.warning(f"Failed to record selector stats for case {test_case.id}: {e}")
+        if self.progress:
+            await self.progress.case_finished(test_case.id, result["success"], result["duration_ms"], result["error"])
         return result
 
+    async def _finish_trace(self, tool: PlaywrightTool, test_result: TestResult, keep: bool) -> Dict[str, Any]:
+        """Export the trace into the results dir and attach it when ``keep``; discard it otherwise."""
+        source = f"{uuid.uuid4()}-attachment.zip" if keep else None
+        try:
+            written = await tool.stop_tracing(os.path.join(self.results_dir, source) if source else None)
+        except Exception as e:
+            logger.warning(f"Failed to stop tracing: {e}")
+            return {"kept": False, "error": str(e)}
+        if written:
+            test_result.attachments.append(
+                allure_commons.model2.Attachment(name="Playwright Trace", source=source, type=TRACE_ATTACHMENT_TYPE)
+            )
+        return {"kept": written, "source": source if written else None}
+
+    async def _attach_screenshot(
+        self,
+        tool: PlaywrightTool,
+        step_res_obj: TestStepResult,
+        policy: ScreenshotPolicy,
+        writer: AttachmentWriter,
+        name: str,
+        failure: bool = False,
+    ) -> None:
+        """
+        Capture a screenshot per the policy and queue it for writing as a step attachment.
+        Failure captures are only deduplicated exactly, never replaced by a similar earlier image.
+        """
+        try:
+            screenshot_bytes = await tool.screenshot(**policy.screenshot_kwargs())
+            source, _ = await writer.submit_content(
+                self.results_dir, screenshot_bytes, policy.extension, exact_only=failure
+            )
+            step_res_obj.attachments.append(
+                allure_commons.model2.Attachment(name=name, source=source, type=policy.attachment_type)
+            )
+        except Exception as e:
+            logger.debug(f"Screenshot capture failed: {e}")
+
+    async def _run_session_fixture(
+        self,
+        login_case_id: int,
+        base_url: Optional[str],
+        headless: bool,
+        browser_type: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Run the project's login case and return the resulting storage_state.
+        Steps are executed without Allure output or progress events; returns
+        None when the login case is missing or any step fails.
+        """
+        login_case = await load_case_plan(self.db, login_case_id)
+        if not login_case:
+            logger.warning(f"Session login case {login_case_id} not found")
+            return None
+
+        context: Dict[str, Any] = {}
+        settle_policy = SettlePolicy.from_config(login_case.execution_config.get("settle"))
+        try:
+            async with PlaywrightTool(
+                headless=headless,
+                browser_type=browser_type,
+                pool=self.browser_pool,
+                semantic_weights=login_case.execution_config.get("semantic_weights"),
+            ) as tool:
+                if base_url:
+                    await tool.goto(base_url)
+                    await tool.settle(**settle_policy.settle_kwargs())
+                compiled_case = await plan_cache.get_or_compile(
+                    login_case, self._normalize_step, self._build_selector_candidates
+                )
+                for compiled_step in compiled_case.steps:
+                    step_index = compiled_step.index
+                    step_result = await self._execute_step(
+                        tool=tool,
+                        step=compiled_step.normalized,
+                        context=context,
+                        step_index=step_index,
+                        case_id=login_case.id,
+                        compiled=compiled_step,
+                        settle=settle_policy,
+                    )
+                    if not step_result["success"]:
+                        logger.warning(
+                            f"Session login case {login_case_id} failed at step {step_index + 1}: {step_result.get('error')}"
+                        )
+                        return None
+                return await tool.context.storage_state()
+        except Exception as e:
+            logger.warning(f"Session login case {login_case_id} failed: {e}")
+            return None
+
     def _canonical_action(self, action: Any) -> str:
         raw = str(action or "").strip().lower()
         return self.ACTION_ALIASES.get(raw, raw)
@@ -299,9 +584,15 @@ class TestRunner:
         context: Dict[str, Any],
         step_index: int,
         case_id: int,
+        elements: Optional[Mapping[int, ElementSpec]] = None,
+        compiled: Optional[CompiledStep] = None,
+        settle: Optional[SettlePolicy] = None,
     ) -> Dict[str, Any]:
         action = step.get("action")
-        resolved_value = self._resolve_variables(step.get("value"), context)
+        if compiled is not None:
+            resolved_value = compiled.value.render(context)
+        else:
+            resolved_value = self._resolve_variables(step.get("value"), context)
         element_id = step.get("element_id")
         variable_name = step.get("variable_name")
 
@@ -332,11 +623,23 @@ class TestRunner:
                         return step_res
                     resolved_value = str(wait_ms)
                     step_res["resolved_value"] = resolved_value
+                    if settle is not None and settle.rewrite_waits and settle.mode != "none":
+                        # Wait for the page to settle instead, never longer than the original wait.
+                        settle_start = time.monotonic()
+                        step_res["settled"] = await tool.settle(**settle.settle_kwargs(timeout_ms=wait_ms))
+                        step_res["waited_ms"] = int((time.monotonic() - settle_start) * 1000)
+                        step_res["success"] = True
+                        return step_res
                 result = await tool.execute_action(action=action, selector=None, value=resolved_value)
+                if action == "goto" and result["success"] and settle is not None:
+                    await tool.settle(**settle.settle_kwargs())
                 step_res["success"] = result["success"]
                 step_res["error"] = result.get("error")
-                if result.get("output") is not None:
-                    step_res["output"] = result.get("output")
+                output = result.get("output")
+                if isinstance(output, bytes):
+                    output = await artifact_store.aput(output, "png")
+                if output is not None:
+                    step_res["output"] = output
                 return step_res
 
             # Check for AI_AUTO instruction for direct PageAgent execution
@@ -351,7 +654,12 @@ class TestRunner:
                     step_res["used_selector"] = agent_res["used_selector"]
                 return step_res
 
-            selectors = await self._build_selector_candidates(step, element_id, action)
+            if compiled is not None:
+                selectors = list(compiled.selectors)
+            else:
+                selectors = self._build_selector_candidates(step, element_id, action, elements)
+            if case_id in self._selector_stats:
+                selectors = selector_ranker.order(self._selector_stats[case_id], step_key(step), selectors)
             if action in self.ELEMENT_ACTIONS and not selectors:
                 step_res["error"] = f"Action '{action}' requires selector, but none was resolved"
                 return step_res
@@ -429,19 +737,18 @@ class TestRunner:
 
         return variants
 
-    async def _build_selector_candidates(
+    def _build_selector_candidates(
         self,
         step: Dict[str, Any],
         element_id: Optional[int],
         action: str,
+        elements: Optional[Mapping[int, ElementSpec]] = None,
     ) -> List[str]:
         candidates: List[str] = []
 
         primary_selector = step.get("target") or step.get("selector")
-        if element_id:
-            stmt = select(PageElement).where(PageElement.id == element_id)
-            res = await self.db.execute(stmt)
-            element = res.scalars().first()
+        if element_id and elements:
+            element = elements.get(int(element_id))
             if element and element.locator_value:
                 candidates.append(str(element.locator_value))
 
@@ -449,7 +756,7 @@ class TestRunner:
             candidates.append(str(primary_selector))
 
         locator_chain = step.get("locator_chain")
-        if isinstance(locator_chain, dict):
+        if isinstance(locator_chain, Mapping):
             ordered = [
                 locator_chain.get("primary"),
                 locator_chain.get("fallback_1"),
@@ -458,7 +765,7 @@ class TestRunner:
                 locator_chain.get("fallback_image"),
             ]
             candidates.extend([str(s) for s in ordered if s])
-        elif isinstance(locator_chain, list):
+        elif isinstance(locator_chain, (list, tuple)):
             candidates.extend([str(s) for s in locator_chain if s])
 
         expanded: List[str] = []
@@ -606,26 +913,15 @@ class TestRunner:
         element_id: Optional[int],
     ) -> Dict[str, Any]:
         
-        tried_selectors: List[str] = []
-        last_error: Optional[str] = None
+        if settings.SELECTOR_RESOLUTION_MODE == "race" and len(selectors) > 1:
+            res = await self._race_selectors(tool, action, selectors, value)
+        else:
+            res = await self._try_selectors_sequentially(tool, action, selectors, value)
+        if res["success"]:
+            return res
+        tried_selectors: List[str] = res["tried_selectors"]
+        last_error: Optional[str] = res.get("error")
 
-        for idx, selector in enumerate(selectors):
-            tried_selectors.append(selector)
-            try:
-                res = await tool.execute_action(action=action, selector=selector, value=value)
-                if res["success"]:
-                    return {
-                        "success": True,
-                        "used_selector": selector,
-                        "tried_selectors": tried_selectors,
-                        "output": res.get("output"),
-                        "error": None
-                    }
-                else:
-                    last_error = res.get("error")
-            except Exception as e:
-                last_error = str(e)
-        
         # If all selectors failed, try PageAgent fallback
         if action in self.INTERACTIVE_ACTIONS:
             fallback_res = await self._execute_via_page_agent(tool, action, value, step)
@@ -657,6 +953,100 @@ class TestRunner:
         }
 
 
+    async def _try_selectors_sequentially(
+        self,
+        tool: PlaywrightTool,
+        action: str,
+        selectors: List[str],
+        value: Any,
+    ) -> Dict[str, Any]:
+        """Try candidates one after another, each with the tool's own timeout."""
+        tried_selectors: List[str] = []
+        last_error: Optional[str] = None
+
+        for selector in selectors:
+            tried_selectors.append(selector)
+            try:
+                res = await tool.execute_action(action=action, selector=selector, value=value)
+                if res["success"]:
+                    return {
+                        "success": True,
+                        "used_selector": selector,
+                        "tried_selectors": tried_selectors,
+                        "output": res.get("output"),
+                        "error": None
+                    }
+                else:
+                    last_error = res.get("error")
+            except Exception as e:
+                last_error = str(e)
+
+        return {"success": False, "tried_selectors": tried_selectors, "error": last_error}
+
+    async def _race_selectors(
+        self,
+        tool: PlaywrightTool,
+        action: str,
+        selectors: List[str],
+        value: Any,
+    ) -> Dict[str, Any]:
+        """
+        Probe all candidates concurrently under one per-step deadline and act
+        on the first that resolves. If acting on the winner fails, the race is
+        rerun over the remaining candidates with whatever time is left.
+        """
+        deadline = time.monotonic() + settings.STEP_DEADLINE_MS / 1000
+        require_visible = action not in self.TEXT_READ_ACTIONS
+        remaining = list(selectors)
+        tried_selectors: List[str] = []
+        last_error: Optional[str] = None
+
+        while remaining:
+            budget_ms = int((deadline - time.monotonic()) * 1000)
+            if budget_ms <= 0:
+                break
+            try:
+                index, _ = await tool.race_locators(remaining, timeout=budget_ms, require_visible=require_visible)
+            except Exception as e:
+                last_error = str(e)
+                break
+
+            selector = remaining.pop(index)
+            tried_selectors.append(selector)
+            budget_ms = max(int((deadline - time.monotonic()) * 1000), settings.SELECTOR_ACTION_MIN_TIMEOUT_MS)
+            res = await tool.execute_action(action=action, selector=selector, value=value, timeout_ms=budget_ms)
+            if res["success"]:
+                return {
+                    "success": True,
+                    "used_selector": selector,
+                    "tried_selectors": tried_selectors,
+                    "output": res.get("output"),
+                    "error": None,
+                }
+            last_error = res.get("error")
+
+        if not tried_selectors:
+            # Nothing resolved: give the primary selector one short attempt so the
+            # tool's semantic recovery still gets a chance.
+            tried_selectors.append(selectors[0])
+            res = await tool.execute_action(
+                action=action,
+                selector=selectors[0],
+                value=value,
+                timeout_ms=settings.SELECTOR_ACTION_MIN_TIMEOUT_MS,
+            )
+            if res["success"]:
+                return {
+                    "success": True,
+                    "used_selector": res.get("resolved_selector") or selectors[0],
+                    "tried_selectors": tried_selectors,
+                    "output": res.get("output"),
+                    "error": None,
+                }
+            last_error = f"{last_error} | {res.get('error')}"
+
+        return {"success": False, "tried_selectors": tried_selectors, "error": last_error}
+
     async def _write_heal_log(
         self,
         case_id: Optional[int],
@@ -682,3 +1072,12 @@ class TestRunner:
             await self.db.commit()
         except Exception:
             pass
+
+    async def _write_case_timing(self, case_id: int, duration_ms: int, status: str) -> None:
+        try:
+            self.db.add(CaseTiming(case_id=case_id, duration_ms=duration_ms, status=status))
+            await self.db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to record timing for case {case_id}: {e}")
+            # The session is reused for report generation; leave it usable.
+            await self.db.rollback()
@@ -0,0 +1,94 @@
+"""
+截图策略模块
+
+控制用例执行过程中何时截图以及截图格式，项目可在 execution_config["screenshots"]
+中配置，单次执行也可以通过 ExecutionOptions.screenshots 覆盖：
+1. mode: never / on_failure / every_n / actions / always
+2. every_n: every_n 模式下每 N 步截一次图（失败步骤始终截图）
+3. actions: actions 模式下需要截图的动作列表，如 ["click", "assert_text"]
+4. format / quality / full_page / scale / clip: 透传给 page.screenshot()
+
+配置示例：
+    {"screenshots": {"mode": "every_n", "every_n": 5, "format": "jpeg", "quality": 70}}
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Mapping, Optional
+
+from allure_commons.types import AttachmentType
+
+from app.core.config import settings
+from app.core.logger import logger
+
+SCREENSHOT_MODES = ("never", "on_failure", "every_n", "actions", "always")
+
+
+@dataclass(frozen=True)
+class ScreenshotPolicy:
+    mode: str = "always"
+    every_n: int = 1
+    actions: FrozenSet[str] = frozenset()
+    format: str = "png"
+    quality: Optional[int] = None
+    full_page: bool = False
+    scale: str = "device"
+    clip: Optional[Mapping[str, float]] = None
+
+    @classmethod
+    def from_config(cls, *specs: Optional[Mapping[str, Any]]) -> "ScreenshotPolicy":
+        """Merge settings defaults with project and run overrides (later specs win)."""
+        merged: Dict[str, Any] = {
+            "mode": settings.SCREENSHOT_MODE,
+            "format": settings.SCREENSHOT_FORMAT,
+            "quality": settings.SCREENSHOT_QUALITY,
+        }
+        for spec in specs:
+            merged.update({key: value for key, value in (spec or {}).items() if value is not None})
+
+        mode = merged.get("mode")
+        if mode not in SCREENSHOT_MODES:
+            logger.warning(f"Unknown screenshot mode '{mode}', using 'always'")
+            mode = "always"
+        image_format = "jpeg" if str(merged.get("format", "png")).lower() in ("jpeg", "jpg") else "png"
+        quality = merged.get("quality")
+        clip = merged.get("clip")
+        return cls(
+            mode=mode,
+            every_n=max(int(merged.get("every_n") or 1), 1),
+            actions=frozenset(merged.get("actions") or ()),
+            format=image_format,
+            quality=max(0, min(int(quality), 100)) if image_format == "jpeg" and quality is not None else None,
+            full_page=bool(merged.get("full_page", False)),
+            scale="css" if merged.get("scale") == "css" else "device",
+            clip=dict(clip) if isinstance(clip, Mapping) else None,
+        )
+
+    @property
+    def captures_failures(self) -> bool:
+        return self.mode != "never"
+
+    def should_capture(self, step_index: int, action: str, failed: bool) -> bool:
+        if self.mode == "never":
+            return False
+        if failed or self.mode == "always":
+            return True
+        if self.mode == "every_n":
+            return (step_index + 1) % self.every_n == 0
+        if self.mode == "actions":
+            return action in self.actions
+        return False
+
+    @property
+    def extension(self) -> str:
+        return "jpg" if self.format == "jpeg" else "png"
+
+    @property
+    def attachment_type(self) -> AttachmentType:
+        return AttachmentType.JPG if self.format == "jpeg" else AttachmentType.PNG
+
+    def screenshot_kwargs(self) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {"type": self.format, "full_page": self.full_page, "scale": self.scale}
+        if self.quality is not None:
+            kwargs["quality"] = self.quality
+        if self.clip:
+            kwargs["clip"] = self.clip
+        return kwargs
@@ -0,0 +1,246 @@
+"""
+选择器排序模块
+
+Runner 每个步骤都会返回 used_selector / tried_selectors，本模块把这些结果
+沉淀为 (用例, 步骤目标, 选择器) 粒度的统计，并据此调整候选选择器的尝试顺序。
+步骤目标（step_key）取步骤引用的页面元素，没有元素时取原始选择器，
+不依赖步骤序号，插入或调整步骤顺序后统计仍然跟随同一个元素：
+1. 成功率按 Beta(1,1) 先验估计：(成功+1) / (成功+失败+2)
+2. 成功率相同时耗时更短的优先，没有统计的候选保持原有顺序
+3. 计数按 SELECTOR_STATS_HALF_LIFE_HOURS 半衰期衰减，
+   长期未验证的"赢家"会逐渐回落到先验，从而被重新评估
+
+统计在用例开始时加载一次（进程内缓存 SELECTOR_STATS_CACHE_TTL 秒），
+用例结束时批量写回 selector_stats 表。
+"""
+import math
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.models.selector_stat import SelectorStat
+
+StatKey = Tuple[str, str]  # (step_key, selector)
+
+# Weight of the newest sample in the latency moving average.
+LATENCY_EWMA_ALPHA = 0.3
+
+
+@dataclass
+class SelectorScore:
+    selector: str
+    element_id: Optional[int] = None
+    successes: float = 0.0
+    failures: float = 0.0
+    avg_latency_ms: Optional[float] = None
+    decayed_at: Optional[datetime] = None
+    last_success_at: Optional[datetime] = None
+    last_failure_at: Optional[datetime] = None
+
+    @classmethod
+    def from_row(cls, row: SelectorStat) -> "SelectorScore":
+        return cls(
+            selector=row.selector,
+            element_id=row.element_id,
+            successes=row.successes,
+            failures=row.failures,
+            avg_latency_ms=row.avg_latency_ms,
+            decayed_at=row.decayed_at,
+            last_success_at=row.last_success_at,
+            last_failure_at=row.last_failure_at,
+        )
+
+    def _decay_factor(self, now: datetime) -> float:
+        if self.decayed_at is None:
+            return 1.0
+        elapsed_hours = max((now - self.decayed_at).total_seconds() / 3600, 0.0)
+        return 0.5 ** (elapsed_hours / settings.SELECTOR_STATS_HALF_LIFE_HOURS)
+
+    def decay_to(self, now: datetime) -> None:
+        """Apply half-life decay to the counts up to ``now``."""
+        factor = self._decay_factor(now)
+        self.successes *= factor
+        self.failures *= factor
+        self.decayed_at = now
+
+    def success_rate(self, now: datetime) -> float:
+        factor = self._decay_factor(now)
+        successes, failures = self.successes * factor, self.failures * factor
+        return (successes + 1) / (successes + failures + 2)
+
+    def to_dict(self, now: datetime) -> Dict[str, Any]:
+        return {
+            "selector": self.selector,
+            "element_id": self.element_id,
+            "successes": round(self.successes, 3),
+            "failures": round(self.failures, 3),
+            "success_rate": round(self.success_rate(now), 4),
+            "avg_latency_ms": round(self.avg_latency_ms) if self.avg_latency_ms is not None else None,
+            "last_success_at": self.last_success_at,
+            "last_failure_at": self.last_failure_at,
+        }
+
+
+def step_key(step: Mapping[str, Any]) -> str:
+    """Position-independent identity of a step's target: its page element, else the selector as written."""
+    if step.get("element_id") is not None:
+        return f"element:{step['element_id']}"
+    return f"selector:{step.get('selector') or step.get('target') or ''}"
+
+
+@dataclass(frozen=True)
+class SelectorObservation:
+    step_key: str
+    element_id: Optional[int]
+    selector: str
+    success: bool
+    latency_ms: Optional[int] = None
+
+
+def observations_from_step(
+    step_key: str,
+    element_id: Optional[int],
+    step_result: Dict[str, Any],
+    latency_ms: int,
+) -> List[SelectorObservation]:
+    """Turn a step result's tried/used selectors into observations."""
+    tried = step_result.get("tried_selectors") or []
+    used = step_result.get("used_selector") if step_result.get("success") else None
+    observations = [
+        SelectorObservation(step_key, element_id, selector, False)
+        for selector in tried
+        if selector != used
+    ]
+    if used and used in tried:
+        observations.append(SelectorObservation(step_key, element_id, used, True, latency_ms))
+    return observations
+
+
+def _sort_key(score: Optional[SelectorScore], now: datetime) -> Tuple[float, float]:
+    if score is None:
+        return (-0.5, math.inf)
+    latency = score.avg_latency_ms if score.avg_latency_ms is not None else math.inf
+    return (-round(score.success_rate(now), 3), latency)
+
+
+class SelectorRanker:
+    """Loads, applies and persists per-target selector statistics."""
+
+    def __init__(self):
+        self._cache: Dict[int, Tuple[float, Dict[StatKey, SelectorScore]]] = {}
+
+    async def load(self, db: AsyncSession, case_id: int) -> Dict[StatKey, SelectorScore]:
+        cached = self._cache.get(case_id)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        res = await db.execute(select(SelectorStat).where(SelectorStat.case_id == case_id))
+        stats = {(row.step_key, row.selector): SelectorScore.from_row(row) for row in res.scalars().all()}
+        self._cache[case_id] = (time.monotonic() + settings.SELECTOR_STATS_CACHE_TTL, stats)
+        return stats
+
+    def order(self, stats: Dict[StatKey, SelectorScore], step_key: str, selectors: List[str]) -> List[str]:
+        """Reorder candidates by observed success rate, then latency. Stable for ties."""
+        if not stats or len(selectors) < 2:
+            return selectors
+        now = datetime.now(timezone.utc)
+        return sorted(selectors, key=lambda selector: _sort_key(stats.get((step_key, selector)), now))
+
+    async def flush(self, db: AsyncSession, case_id: int, observations: List[SelectorObservation]) -> None:
+        """Fold a run's observations into the stored statistics."""
+        if not observations:
+            return
+        stats = await self.load(db, case_id)
+        now = datetime.now(timezone.utc)
+        touched: Dict[StatKey, SelectorScore] = {}
+        for obs in observations:
+            key = (obs.step_key, obs.selector)
+            score = touched.get(key)
+            if score is None:
+                # Work on a copy so the cache is only updated once the write succeeds.
+                score = replace(stats[key]) if key in stats else SelectorScore(selector=obs.selector)
+                score.decay_to(now)
+                touched[key] = score
+            if obs.element_id is not None:
+                score.element_id = obs.element_id
+            if obs.success:
+                score.successes += 1
+                score.last_success_at = now
+                if obs.latency_ms is not None:
+                    score.avg_latency_ms = (
+                        float(obs.latency_ms)
+                        if score.avg_latency_ms is None
+                        else LATENCY_EWMA_ALPHA * obs.latency_ms + (1 - LATENCY_EWMA_ALPHA) * score.avg_latency_ms
+                    )
+            else:
+                score.failures += 1
+                score.last_failure_at = now
+
+        rows = [
+            {
+                "case_id": case_id,
+                "step_key": step_key,
+                "selector": selector,
+                "element_id": score.element_id,
+                "successes": score.successes,
+                "failures": score.failures,
+                "avg_latency_ms": score.avg_latency_ms,
+                "decayed_at": score.decayed_at,
+                "last_success_at": score.last_success_at,
+                "last_failure_at": score.last_failure_at,
+            }
+            for (step_key, selector), score in touched.items()
+        ]
+        stmt = insert(SelectorStat).values(rows)
+        # Concurrent runs of the same case may overwrite each other's increments; the
+        # statistics only steer ordering, so last-writer-wins is acceptable.
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_selector_stats_case_step_selector",
+            set_={
+                column: stmt.excluded[column]
+                for column in (
+                    "element_id",
+                    "successes",
+                    "failures",
+                    "avg_latency_ms",
+                    "decayed_at",
+                    "last_success_at",
+                    "last_failure_at",
+                )
+            },
+        )
+        try:
+            await db.execute(stmt)
+            await db.commit()
+        except Exception:
+            # The caller's session is reused afterwards (report generation); leave it usable.
+            await db.rollback()
+            raise
+        stats.update(touched)
+        logger.debug(f"Flushed {len(rows)} selector stat(s) for case {case_id}")
+
+    async def ranking(self, db: AsyncSession, case_id: int) -> List[Dict[str, Any]]:
+        """Current per-target ranking, best candidate first."""
+        res = await db.execute(select(SelectorStat).where(SelectorStat.case_id == case_id))
+        by_step: Dict[str, List[SelectorScore]] = {}
+        for row in res.scalars().all():
+            by_step.setdefault(row.step_key, []).append(SelectorScore.from_row(row))
+        now = datetime.now(timezone.utc)
+        steps = []
+        for key in sorted(by_step):
+            scores = sorted(by_step[key], key=lambda score: _sort_key(score, now))
+            for score in scores:
+                score.decay_to(now)
+            steps.append({"step_key": key, "candidates": [score.to_dict(now) for score in scores]})
+        return steps
+
+
+# 全局选择器排序实例
+selector_ranker = SelectorRanker()
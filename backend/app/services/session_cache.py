@@ -0,0 +1,119 @@
+"""
+登录态缓存模块
+
+项目可以在 execution_config["session"] 中指定一个登录用例作为"会话夹具"：
+1. 每个 worker 进程在 TTL 内只执行一次登录用例
+2. 缓存其 Playwright storage_state（cookies + localStorage）
+3. 同项目的其他用例直接使用预置登录态的 BrowserContext
+4. 用例失败且停留在登录跳转页时自动失效缓存
+5. 登录用例失败时记录失败 SESSION_FAILURE_TTL 秒，排队中的用例不再逐个重跑失败的登录
+
+配置示例：
+    {"session": {"login_case_id": 12, "ttl": 1800, "auth_redirect_pattern": "/login"}}
+"""
+import asyncio
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logger import logger
+
+
+@dataclass(frozen=True)
+class SessionFixtureConfig:
+    login_case_id: int
+    ttl: int
+    auth_redirect_pattern: "re.Pattern[str]"
+
+    @classmethod
+    def from_project_config(cls, execution_config: Optional[Dict[str, Any]]) -> Optional["SessionFixtureConfig"]:
+        session = (execution_config or {}).get("session") or {}
+        login_case_id = session.get("login_case_id")
+        if not login_case_id:
+            return None
+        pattern = session.get("auth_redirect_pattern") or settings.SESSION_AUTH_REDIRECT_PATTERN
+        try:
+            compiled = re.compile(pattern, re.IGNORECASE)
+        except re.error:
+            logger.warning(f"Invalid auth_redirect_pattern '{pattern}', using default")
+            compiled = re.compile(settings.SESSION_AUTH_REDIRECT_PATTERN, re.IGNORECASE)
+        return cls(
+            login_case_id=int(login_case_id),
+            ttl=int(session.get("ttl") or settings.SESSION_CACHE_TTL),
+            auth_redirect_pattern=compiled,
+        )
+
+    def is_auth_redirect(self, url: Optional[str]) -> bool:
+        return bool(url) and bool(self.auth_redirect_pattern.search(url))
+
+
+class SessionStateCache:
+    """Per-process cache of storage_state keyed by project and browser type."""
+
+    def __init__(self):
+        self._entries: Dict[Tuple[int, str], Tuple[Dict[str, Any], float]] = {}
+        # (project_id, browser_type) -> monotonic time until which the login is not retried
+        self._failed_until: Dict[Tuple[int, str], float] = {}
+        self._locks: Dict[Tuple[int, str], asyncio.Lock] = {}
+
+    def get(self, project_id: int, browser_type: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get((project_id, browser_type))
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+        return None
+
+    def failed_recently(self, project_id: int, browser_type: str) -> bool:
+        return self._failed_until.get((project_id, browser_type), 0.0) > time.monotonic()
+
+    async def get_or_create(
+        self,
+        project_id: int,
+        browser_type: str,
+        ttl: int,
+        factory: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+    ) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Return (storage_state, created). Concurrent callers for the same
+        project wait for a single login run instead of each logging in.
+        A failed login is remembered for SESSION_FAILURE_TTL seconds, during
+        which callers get (None, False) without running the login again.
+        """
+        key = (project_id, browser_type)
+        cached = self.get(project_id, browser_type)
+        if cached is not None:
+            return cached, False
+        if self.failed_recently(project_id, browser_type):
+            return None, False
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self.get(project_id, browser_type)
+            if cached is not None:
+                return cached, False
+            if self.failed_recently(project_id, browser_type):
+                return None, False
+            state = await factory()
+            if state is not None:
+                self._entries[key] = (state, time.monotonic() + ttl)
+                self._failed_until.pop(key, None)
+                logger.info(f"Cached session state for project {project_id} ({browser_type}) for {ttl}s")
+            else:
+                self._failed_until[key] = time.monotonic() + settings.SESSION_FAILURE_TTL
+                logger.warning(
+                    f"Session login for project {project_id} ({browser_type}) failed; "
+                    f"not retrying for {settings.SESSION_FAILURE_TTL}s"
+                )
+            return state, state is not None
+
+    def invalidate(self, project_id: int, browser_type: Optional[str] = None) -> None:
+        for entries in (self._entries, self._failed_until):
+            for key in list(entries):
+                if key[0] == project_id and (browser_type is None or key[1] == browser_type):
+                    del entries[key]
+        logger.info(f"Invalidated cached session state for project {project_id}")
+
+
+# 每个 worker 进程一个登录态缓存
+session_state_cache = SessionStateCache()
@@ -0,0 +1,72 @@
+"""
+页面稳定等待策略模块
+
+导航后不再固定 sleep，而是等待页面"稳定"，项目可在 execution_config["settle"] 中配置：
+1. mode: none / load / networkidle / dom
+   - load: 等待 load_state（load / domcontentloaded / networkidle）
+   - networkidle: 进行中的请求数不超过 max_inflight 并持续 quiet_ms
+   - dom: 注入的 MutationObserver 在 quiet_ms 内未观察到 DOM 变化
+2. timeout_ms: 等待上限，超时不算失败，继续执行后续步骤
+3. rewrite_waits: 为 true 时，固定时长的 wait 步骤改为 settle 等待，
+   上限为原来的等待时长（页面提前稳定即提前结束）
+
+配置示例：
+    {"settle": {"mode": "dom", "quiet_ms": 300, "rewrite_waits": true}}
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.tools.playwright_tool import SETTLE_MODES
+
+LOAD_STATES = ("load", "domcontentloaded", "networkidle")
+
+
+@dataclass(frozen=True)
+class SettlePolicy:
+    mode: str = "load"
+    timeout_ms: int = 10000
+    load_state: str = "load"
+    max_inflight: int = 0
+    quiet_ms: int = 500
+    rewrite_waits: bool = False
+
+    @classmethod
+    def from_config(cls, *specs: Optional[Mapping[str, Any]]) -> "SettlePolicy":
+        """Merge settings defaults with project overrides (later specs win)."""
+        merged: Dict[str, Any] = {
+            "mode": settings.SETTLE_MODE,
+            "timeout_ms": settings.SETTLE_TIMEOUT_MS,
+            "load_state": settings.SETTLE_LOAD_STATE,
+            "max_inflight": settings.SETTLE_MAX_INFLIGHT,
+            "quiet_ms": settings.SETTLE_QUIET_MS,
+            "rewrite_waits": settings.SETTLE_REWRITE_WAITS,
+        }
+        for spec in specs:
+            merged.update({key: value for key, value in (spec or {}).items() if value is not None})
+
+        mode = merged.get("mode")
+        if mode not in SETTLE_MODES:
+            logger.warning(f"Unknown settle mode '{mode}', using 'load'")
+            mode = "load"
+        load_state = merged.get("load_state")
+        return cls(
+            mode=mode,
+            timeout_ms=max(int(merged.get("timeout_ms") or 0), 0),
+            load_state=load_state if load_state in LOAD_STATES else "load",
+            max_inflight=max(int(merged.get("max_inflight") or 0), 0),
+            quiet_ms=max(int(merged.get("quiet_ms") or 0), 0),
+            rewrite_waits=bool(merged.get("rewrite_waits")),
+        )
+
+    def settle_kwargs(self, timeout_ms: Optional[int] = None) -> Dict[str, Any]:
+        """Arguments for PlaywrightTool.settle(); ``timeout_ms`` caps the configured timeout."""
+        timeout = self.timeout_ms if timeout_ms is None else min(timeout_ms, self.timeout_ms)
+        return {
+            "mode": self.mode,
+            "timeout": timeout,
+            "load_state": self.load_state,
+            "max_inflight": self.max_inflight,
+            "quiet_ms": self.quiet_ms,
+        }
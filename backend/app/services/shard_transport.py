@@ -0,0 +1,129 @@
+"""
+分片结果传输模块
+
+分布式执行套件时，每个分片在各自的 worker 上生成 Allure 结果文件，
+汇总节点需要在没有共享文件系统的情况下拿到这些文件。
+
+本模块把结果目录打包为 zip 并通过可替换的传输方式交给汇总任务：
+1. redis（默认）: 写入 Redis 键（带过期时间），任务结果只携带键名
+2. inline: 以 base64 形式随 Celery 任务结果写入结果后端，不受 RESULT_MAX_BYTES 限制，
+   截图较多时会显著增大结果后端，仅适合小套件或本地调试
+
+测试或本地环境可继承 ResultTransport 提供自己的实现并注册到 TRANSPORTS。
+"""
+import base64
+import io
+import os
+import uuid
+import zipfile
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Type
+
+from app.core.config import settings
+from app.core.logger import logger
+
+
+def pack_results_dir(results_dir: str) -> bytes:
+    """Zip every file in an Allure results directory."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        if os.path.isdir(results_dir):
+            for name in sorted(os.listdir(results_dir)):
+                path = os.path.join(results_dir, name)
+                if os.path.isfile(path):
+                    archive.write(path, arcname=name)
+    return buffer.getvalue()
+
+
+def unpack_results_archive(data: bytes, dest_dir: str) -> int:
+    """Extract a results archive into dest_dir and return the number of files."""
+    os.makedirs(dest_dir, exist_ok=True)
+    count = 0
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for member in archive.infolist():
+            # Results dirs are flat; ignore anything that tries to escape dest_dir.
+            name = os.path.basename(member.filename)
+            if not name or member.is_dir():
+                continue
+            with open(os.path.join(dest_dir, name), "wb") as f:
+                f.write(archive.read(member))
+            count += 1
+    return count
+
+
+class ResultTransport(ABC):
+    """Ships a shard's Allure results directory to the aggregating task."""
+
+    name = "base"
+
+    @abstractmethod
+    def send(self, results_dir: str) -> Dict[str, Any]:
+        """Package results_dir and return a JSON-serialisable reference."""
+
+    @abstractmethod
+    def receive(self, payload: Dict[str, Any], dest_dir: str) -> int:
+        """Materialise a payload produced by send() into dest_dir."""
+
+
+class InlineResultTransport(ResultTransport):
+    """Embeds the zipped results in the Celery result itself."""
+
+    name = "inline"
+
+    def send(self, results_dir: str) -> Dict[str, Any]:
+        data = pack_results_dir(results_dir)
+        if len(data) > settings.RESULT_MAX_BYTES:
+            logger.warning(
+                f"Inline shard results are {len(data)} bytes (result budget {settings.RESULT_MAX_BYTES}); "
+                "use SHARD_RESULT_TRANSPORT=redis for large suites"
+            )
+        return {
+            "transport": self.name,
+            "size": len(data),
+            "data": base64.b64encode(data).decode("ascii"),
+        }
+
+    def receive(self, payload: Dict[str, Any], dest_dir: str) -> int:
+        return unpack_results_archive(base64.b64decode(payload["data"]), dest_dir)
+
+
+class RedisResultTransport(ResultTransport):
+    """Stores the zipped results under a Redis key so the result backend stays small."""
+
+    name = "redis"
+
+    def __init__(self, url: str = None, ttl: int = None):
+        import redis
+
+        self.client = redis.Redis.from_url(url or settings.REDIS_URL)
+        self.ttl = ttl or settings.SHARD_RESULT_TTL
+
+    def send(self, results_dir: str) -> Dict[str, Any]:
+        data = pack_results_dir(results_dir)
+        key = f"shard_results:{uuid.uuid4()}"
+        self.client.set(key, data, ex=self.ttl)
+        return {"transport": self.name, "size": len(data), "key": key}
+
+    def receive(self, payload: Dict[str, Any], dest_dir: str) -> int:
+        data = self.client.get(payload["key"])
+        if data is None:
+            raise RuntimeError(f"Shard results expired or missing: {payload['key']}")
+        count = unpack_results_archive(data, dest_dir)
+        self.client.delete(payload["key"])
+        return count
+
+
+TRANSPORTS: Dict[str, Type[ResultTransport]] = {
+    InlineResultTransport.name: InlineResultTransport,
+    RedisResultTransport.name: RedisResultTransport,
+}
+
+
+def get_result_transport(name: str = None) -> ResultTransport:
+    """Instantiate a transport by name, defaulting to settings.SHARD_RESULT_TRANSPORT."""
+    name = name or settings.SHARD_RESULT_TRANSPORT
+    transport_cls = TRANSPORTS.get(name)
+    if transport_cls is None:
+        logger.warning(f"Unknown shard result transport '{name}', falling back to redis")
+        transport_cls = RedisResultTransport
+    return transport_cls()
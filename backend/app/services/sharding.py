@@ -0,0 +1,119 @@
+"""
+套件分片规划模块
+
+分布式执行时，墙钟时间由最慢的分片决定。本模块：
+1. 根据历史执行耗时估算每个用例的耗时（无历史的新用例使用默认值）
+2. 使用 LPT（最长处理时间优先）装箱把用例分配到 N 个分片
+3. 对比预测与实际的分片耗时，输出用于调参的报告
+"""
+import heapq
+from statistics import median
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.case_timing import CaseTiming
+
+
+async def estimate_case_durations(
+    db: AsyncSession,
+    case_ids: Sequence[int],
+    history: int = None,
+    default_ms: int = None,
+) -> Dict[int, int]:
+    """
+    Estimate each case's duration as the median of its last ``history``
+    successful runs. Cases without history get ``default_ms``.
+    """
+    history = history or settings.SHARD_TIMING_HISTORY
+    default_ms = default_ms or settings.SHARD_DEFAULT_CASE_DURATION_MS
+    estimates = {case_id: default_ms for case_id in case_ids}
+    if not case_ids:
+        return estimates
+
+    row_number = func.row_number().over(
+        partition_by=CaseTiming.case_id,
+        order_by=CaseTiming.created_at.desc(),
+    ).label("rn")
+    recent = (
+        select(CaseTiming.case_id, CaseTiming.duration_ms, row_number)
+        .where(CaseTiming.case_id.in_(list(case_ids)))
+        .where(CaseTiming.status == "success")
+        .subquery()
+    )
+    result = await db.execute(
+        select(recent.c.case_id, recent.c.duration_ms).where(recent.c.rn <= history)
+    )
+
+    samples: Dict[int, List[int]] = {}
+    for case_id, duration_ms in result.all():
+        samples.setdefault(case_id, []).append(duration_ms)
+    for case_id, durations in samples.items():
+        estimates[case_id] = int(median(durations))
+    return estimates
+
+
+def plan_shards(
+    cases: Sequence[Tuple[int, str]],
+    estimates: Dict[int, int],
+    shard_count: int,
+    default_ms: int = None,
+) -> List[Dict[str, Any]]:
+    """
+    Longest-processing-time-first bin packing.
+
+    Cases are sorted by estimated duration (longest first) and each one is
+    placed on the currently least loaded shard. Returns non-empty shards as
+    ``{"cases": [(case_id, case_name), ...], "predicted_ms": int}``.
+    """
+    default_ms = default_ms or settings.SHARD_DEFAULT_CASE_DURATION_MS
+    shard_count = max(1, min(shard_count, len(cases)))
+    shards: List[Dict[str, Any]] = [{"cases": [], "predicted_ms": 0} for _ in range(shard_count)]
+
+    # (load, shard index) min-heap; the index keeps ties deterministic.
+    heap = [(0, index) for index in range(shard_count)]
+    ordered = sorted(cases, key=lambda case: estimates.get(case[0], default_ms), reverse=True)
+    for case in ordered:
+        load, index = heapq.heappop(heap)
+        duration = estimates.get(case[0], default_ms)
+        shards[index]["cases"].append(case)
+        shards[index]["predicted_ms"] = load + duration
+        heapq.heappush(heap, (load + duration, index))
+
+    return [shard for shard in shards if shard["cases"]]
+
+
+def build_shard_report(shards: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compare predicted and actual shard durations.
+
+    ``shards`` entries need ``predicted_ms`` and ``duration_ms``. The
+    makespan (slowest shard) is what decides suite wall-clock time.
+    """
+    rows = []
+    for shard in shards:
+        predicted = shard.get("predicted_ms")
+        actual = shard.get("duration_ms")
+        error_pct: Optional[float] = None
+        if predicted and actual is not None:
+            error_pct = round((actual - predicted) / predicted * 100, 1)
+        rows.append({
+            "shard_index": shard.get("shard_index"),
+            "cases": shard.get("cases"),
+            "predicted_ms": predicted,
+            "actual_ms": actual,
+            "error_pct": error_pct,
+        })
+
+    predicted_makespan = max((row["predicted_ms"] or 0 for row in rows), default=0)
+    actual_makespan = max((row["actual_ms"] or 0 for row in rows), default=0)
+    actual_total = sum(row["actual_ms"] or 0 for row in rows)
+    return {
+        "shards": rows,
+        "predicted_makespan_ms": predicted_makespan,
+        "actual_makespan_ms": actual_makespan,
+        # 1.0 means perfectly balanced shards
+        "balance": round(actual_total / (actual_makespan * len(rows)), 3) if actual_makespan and rows else None,
+    }
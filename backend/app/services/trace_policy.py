@@ -0,0 +1,62 @@
+"""
+Playwright 追踪策略模块
+
+失败用例保留 Playwright trace（含截图、DOM 快照、源码），通过 Trace Viewer 即可
+回放失败现场，不再需要以有头模式重跑套件。项目可在 execution_config["tracing"] 中配置：
+1. mode: off / on_failure
+2. chunk_steps: 每 N 步丢弃一次之前的追踪分片（0 表示整个用例一个分片），
+   长用例只保留最近 1~N 步，控制 driver 端的追踪数据量
+3. screenshots / snapshots / sources: 透传给 context.tracing.start()
+
+通过的用例在内存中结束追踪、不导出 trace 文件；失败用例的 trace 写入结果目录，
+并以 application/vnd.allure.playwright-trace 类型附加到 Allure 结果。
+
+配置示例：
+    {"tracing": {"mode": "on_failure", "chunk_steps": 20, "sources": false}}
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+from app.core.config import settings
+from app.core.logger import logger
+
+TRACE_MODES = ("off", "on_failure")
+TRACE_ATTACHMENT_TYPE = "application/vnd.allure.playwright-trace"
+
+
+@dataclass(frozen=True)
+class TracePolicy:
+    mode: str = "off"
+    chunk_steps: int = 0
+    screenshots: bool = True
+    snapshots: bool = True
+    sources: bool = True
+
+    @classmethod
+    def from_config(cls, *specs: Optional[Mapping[str, Any]]) -> "TracePolicy":
+        """Merge settings defaults with project overrides (later specs win)."""
+        merged: Dict[str, Any] = {"mode": settings.TRACE_MODE, "chunk_steps": settings.TRACE_CHUNK_STEPS}
+        for spec in specs:
+            merged.update({key: value for key, value in (spec or {}).items() if value is not None})
+
+        mode = merged.get("mode")
+        if mode not in TRACE_MODES:
+            logger.warning(f"Unknown tracing mode '{mode}', using 'off'")
+            mode = "off"
+        return cls(
+            mode=mode,
+            chunk_steps=max(int(merged.get("chunk_steps") or 0), 0),
+            screenshots=bool(merged.get("screenshots", True)),
+            snapshots=bool(merged.get("snapshots", True)),
+            sources=bool(merged.get("sources", True)),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def should_rotate(self, step_index: int) -> bool:
+        return self.chunk_steps > 0 and step_index > 0 and step_index % self.chunk_steps == 0
+
+    def tracing_kwargs(self) -> Dict[str, Any]:
+        return {"screenshots": self.screenshots, "snapshots": self.snapshots, "sources": self.sources}
@@ -0,0 +1,229 @@
+"""
+用例录屏存储模块
+
+为每个用例的 BrowserContext 录制视频（record_video_dir），只保留需要的录像：
+1. mode: off / on_failure（仅失败用例保留）/ always（本次执行被标记为保留录像）
+2. 失败用例的录像裁剪为失败前 trim_seconds 秒，可按 scale_width 缩放
+3. 裁剪/缩放由 ffmpeg 子进程在后台完成（限制并发），不阻塞 Celery 任务；
+   未安装 ffmpeg 时保留原始录像
+4. 每个项目的录像总量受 budget_mb 限制，超出时从最旧的录像开始删除
+
+项目可在 execution_config["video"] 中配置，单次执行可通过 ExecutionOptions.video_mode 覆盖 mode：
+    {"video": {"mode": "on_failure", "trim_seconds": 20, "scale_width": 640, "budget_mb": 200}}
+
+存储路径：backend/videos/project_{id}/case_{id}_{时间戳}.webm
+"""
+import asyncio
+import os
+import shutil
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Set
+
+from app.core.config import settings
+from app.core.logger import logger
+
+VIDEO_MODES = ("off", "on_failure", "always")
+
+
+@dataclass(frozen=True)
+class VideoPolicy:
+    mode: str = "off"
+    width: int = 1280
+    height: int = 720
+    trim_seconds: int = 0
+    scale_width: int = 0
+    budget_mb: int = 500
+
+    @classmethod
+    def from_config(cls, *specs: Optional[Mapping[str, Any]]) -> "VideoPolicy":
+        """Merge settings defaults with project and run overrides (later specs win)."""
+        merged: Dict[str, Any] = {
+            "mode": settings.VIDEO_MODE,
+            "width": settings.VIDEO_WIDTH,
+            "height": settings.VIDEO_HEIGHT,
+            "trim_seconds": settings.VIDEO_TRIM_SECONDS,
+            "scale_width": settings.VIDEO_SCALE_WIDTH,
+            "budget_mb": settings.VIDEO_BUDGET_MB,
+        }
+        for spec in specs:
+            merged.update({key: value for key, value in (spec or {}).items() if value is not None})
+
+        mode = merged.get("mode")
+        if mode not in VIDEO_MODES:
+            logger.warning(f"Unknown video mode '{mode}', using 'off'")
+            mode = "off"
+        return cls(
+            mode=mode,
+            width=max(int(merged.get("width") or 0), 0),
+            height=max(int(merged.get("height") or 0), 0),
+            trim_seconds=max(int(merged.get("trim_seconds") or 0), 0),
+            scale_width=max(int(merged.get("scale_width") or 0), 0),
+            budget_mb=max(int(merged.get("budget_mb") or 0), 0),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def keeps(self, success: bool) -> bool:
+        return self.mode == "always" or (self.mode == "on_failure" and not success)
+
+    def context_options(self, record_dir: str) -> Dict[str, Any]:
+        options: Dict[str, Any] = {"record_video_dir": record_dir}
+        if self.width and self.height:
+            options["record_video_size"] = {"width": self.width, "height": self.height}
+        return options
+
+
+class VideoStore:
+    """Per-project video storage with background transcoding and a size budget."""
+
+    def __init__(self, root_dir: Optional[str] = None):
+        if not root_dir:
+            # video_store.py 位于 backend/app/services/，需要向上3级
+            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            root_dir = os.path.join(base_dir, "videos")
+        self.root_dir = root_dir
+        os.makedirs(self.root_dir, exist_ok=True)
+        self._tasks: Set[asyncio.Task] = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(max(1, settings.VIDEO_TRANSCODE_CONCURRENCY))
+        return self._semaphore
+
+    def project_dir(self, project_id: Optional[int]) -> str:
+        return os.path.join(self.root_dir, f"project_{project_id or 0}")
+
+    def recording_dir(self) -> str:
+        """A fresh directory for Playwright to record one context into."""
+        path = os.path.join(self.root_dir, "_recording", uuid.uuid4().hex)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def finalize(
+        self,
+        policy: VideoPolicy,
+        record_dir: str,
+        video_path: Optional[str],
+        *,
+        project_id: Optional[int],
+        case_id: int,
+        success: bool,
+        failure_offset_s: Optional[float] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Keep or discard a finished recording. Call after the context closed.
+        Kept videos are moved into the project dir; trimming, scaling and budget
+        enforcement are scheduled in the background.
+        """
+        try:
+            if not policy.keeps(success) or not video_path or not os.path.isfile(video_path):
+                return None
+            project_dir = self.project_dir(project_id)
+            os.makedirs(project_dir, exist_ok=True)
+            dest = os.path.join(project_dir, f"case_{case_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}.webm")
+            os.replace(video_path, dest)
+        finally:
+            shutil.rmtree(record_dir, ignore_errors=True)
+
+        start_s: Optional[float] = None
+        duration_s: Optional[float] = None
+        if failure_offset_s is not None and policy.trim_seconds:
+            start_s = max(0.0, failure_offset_s - policy.trim_seconds)
+            duration_s = failure_offset_s - start_s + 1  # keep a second after the failure
+        task = asyncio.ensure_future(self._process(dest, project_id, policy, start_s, duration_s))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return {"path": dest, "mode": policy.mode, "trimmed_from_s": start_s}
+
+    async def _process(
+        self,
+        path: str,
+        project_id: Optional[int],
+        policy: VideoPolicy,
+        start_s: Optional[float],
+        duration_s: Optional[float],
+    ) -> None:
+        try:
+            if (start_s is not None or policy.scale_width) and shutil.which("ffmpeg"):
+                async with self._get_semaphore():
+                    await self._transcode(path, policy.scale_width, start_s, duration_s)
+            self.enforce_budget(project_id, policy.budget_mb)
+        except Exception as e:
+            logger.warning(f"Video post-processing failed for {path}: {e}")
+
+    async def _transcode(
+        self, path: str, scale_width: int, start_s: Optional[float], duration_s: Optional[float]
+    ) -> None:
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp.webm"
+        cmd: List[str] = ["ffmpeg", "-y", "-loglevel", "error"]
+        if start_s:
+            cmd += ["-ss", f"{start_s:.2f}"]
+        cmd += ["-i", path]
+        if duration_s:
+            cmd += ["-t", f"{duration_s:.2f}"]
+        if scale_width:
+            cmd += ["-vf", f"scale={scale_width}:-2"]
+        cmd += ["-c:v", "libvpx", "-b:v", "0", "-crf", "40", "-deadline", "realtime", "-an", tmp_path]
+
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), timeout=settings.VIDEO_TRANSCODE_TIMEOUT)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            self._remove(tmp_path)
+            logger.warning(f"ffmpeg timed out transcoding {path}, keeping the original")
+            return
+        if process.returncode != 0:
+            self._remove(tmp_path)
+            logger.warning(f"ffmpeg failed for {path}: {stderr.decode(errors='ignore')[:500]}")
+            return
+        os.replace(tmp_path, path)
+
+    def enforce_budget(self, project_id: Optional[int], budget_mb: int) -> List[str]:
+        """Delete the project's oldest videos until it fits ``budget_mb``. Returns deleted paths."""
+        if budget_mb <= 0:
+            return []
+        project_dir = self.project_dir(project_id)
+        try:
+            entries = [entry for entry in os.scandir(project_dir) if entry.is_file() and entry.name.endswith(".webm")]
+        except FileNotFoundError:
+            return []
+        videos = sorted(((entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in entries))
+        total = sum(size for _, size, _ in videos)
+        budget = budget_mb * 1024 * 1024
+        evicted = []
+        for _, size, path in videos:
+            if total <= budget:
+                break
+            self._remove(path)
+            total -= size
+            evicted.append(path)
+        if evicted:
+            logger.info(f"Evicted {len(evicted)} video(s) of project {project_id} to stay within {budget_mb}MB")
+        return evicted
+
+    async def drain(self) -> None:
+        """Wait for queued post-processing (shutdown)."""
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove {path}: {e}")
+
+
+# 全局录像存储实例
+video_store = VideoStore()
@@ -0,0 +1,203 @@
+"""
+Warm browser pool for test execution.
+
+Keeps launched browsers alive per (browser_type, headless) so that each test
+case only pays for a fresh, isolated BrowserContext instead of a full
+browser launch.
+
+- Health check: disconnected browsers are dropped on checkout
+- Capacity: at most ``max_contexts_per_browser`` open contexts per browser
+- Recycling: a browser is retired after ``max_uses_per_browser`` contexts and
+  closed once its last context is released, bounding Chromium memory growth
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from playwright.async_api import Browser, BrowserContext
+
+from app.core.config import settings
+from app.tools.playwright_driver import playwright_driver
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, bool]
+
+
+@dataclass(eq=False)
+class PooledBrowser:
+    """A launched browser tracked by the pool."""
+    key: PoolKey
+    browser: Browser
+    launched_at: float
+    uses: int = 0
+    active_contexts: int = 0
+    retiring: bool = False
+
+    def is_healthy(self) -> bool:
+        return self.browser.is_connected()
+
+
+class BrowserPool:
+    """
+    Per-process pool of warm Playwright browsers.
+
+    Usage:
+        entry, context = await pool.acquire("chromium", True)
+        try:
+            page = await context.new_page()
+            ...
+        finally:
+            await pool.release(entry, context)
+    """
+
+    def __init__(
+        self,
+        max_contexts_per_browser: int = 4,
+        max_uses_per_browser: int = 50,
+        max_browsers_per_key: int = 2,
+    ):
+        self.max_contexts_per_browser = max(1, max_contexts_per_browser)
+        self.max_uses_per_browser = max(1, max_uses_per_browser)
+        self.max_browsers_per_key = max(1, max_browsers_per_key)
+        self._playwright = None
+        self._browsers: Dict[PoolKey, List[PooledBrowser]] = {}
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Created lazily so the pool binds to the loop that actually uses it.
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def _launch(self, key: PoolKey) -> PooledBrowser:
+        browser_type, headless = key
+        # The pool holds one reference on the shared driver. Re-acquiring it before each
+        # launch lets acquire() restart a driver that stopped responding.
+        playwright = await playwright_driver.acquire()
+        if self._playwright is not None:
+            await playwright_driver.release()
+        self._playwright = playwright
+
+        if browser_type == "firefox":
+            browser = await self._playwright.firefox.launch(headless=headless)
+        elif browser_type == "webkit":
+            browser = await self._playwright.webkit.launch(headless=headless)
+        else:  # default to chromium
+            browser = await self._playwright.chromium.launch(headless=headless)
+
+        logger.info(f"Browser pool launched {browser_type}, headless={headless}")
+        return PooledBrowser(key=key, browser=browser, launched_at=time.monotonic())
+
+    async def _close_browser(self, entry: PooledBrowser) -> None:
+        try:
+            await entry.browser.close()
+        except Exception as e:
+            logger.warning(f"Failed to close pooled browser {entry.key}: {e}")
+        logger.info(f"Browser pool closed {entry.key[0]} after {entry.uses} uses")
+
+    def _prune_unhealthy(self, key: PoolKey) -> None:
+        entries = self._browsers.get(key, [])
+        alive = [entry for entry in entries if entry.is_healthy()]
+        if len(alive) != len(entries):
+            logger.warning(f"Browser pool dropped {len(entries) - len(alive)} disconnected browser(s) for {key}")
+        self._browsers[key] = alive
+
+    def _pick(self, key: PoolKey) -> Optional[PooledBrowser]:
+        candidates = [
+            entry for entry in self._browsers.get(key, [])
+            if not entry.retiring and entry.active_contexts < self.max_contexts_per_browser
+        ]
+        if not candidates:
+            return None
+        # Fill the least loaded browser first to spread renderer load.
+        return min(candidates, key=lambda entry: entry.active_contexts)
+
+    async def _checkout(self, key: PoolKey) -> PooledBrowser:
+        condition = self._get_condition()
+        async with condition:
+            while True:
+                self._prune_unhealthy(key)
+                entry = self._pick(key)
+                if entry is None and len(self._browsers[key]) < self.max_browsers_per_key:
+                    entry = await self._launch(key)
+                    self._browsers[key].append(entry)
+                if entry is not None:
+                    entry.active_contexts += 1
+                    entry.uses += 1
+                    if entry.uses >= self.max_uses_per_browser:
+                        entry.retiring = True
+                    return entry
+                await condition.wait()
+
+    async def acquire(
+        self,
+        browser_type: str = "chromium",
+        headless: bool = True,
+        **context_options: Any,
+    ) -> Tuple[PooledBrowser, BrowserContext]:
+        """Check out a browser and open a fresh context on it."""
+        entry = await self._checkout((browser_type, headless))
+        try:
+            context = await entry.browser.new_context(**context_options)
+        except Exception:
+            await self.release(entry, None)
+            raise
+        return entry, context
+
+    async def release(self, entry: PooledBrowser, context: Optional[BrowserContext]) -> None:
+        """Close the context and return its browser slot to the pool."""
+        if context is not None:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.warning(f"Failed to close pooled context: {e}")
+
+        condition = self._get_condition()
+        async with condition:
+            entry.active_contexts = max(0, entry.active_contexts - 1)
+            should_close = entry.active_contexts == 0 and (entry.retiring or not entry.is_healthy())
+            if should_close:
+                entries = self._browsers.get(entry.key, [])
+                if entry in entries:
+                    entries.remove(entry)
+            condition.notify_all()
+
+        if should_close:
+            await self._close_browser(entry)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool state for logging and diagnostics."""
+        return {
+            f"{browser_type}:{'headless' if headless else 'headed'}": [
+                {
+                    "uses": entry.uses,
+                    "active_contexts": entry.active_contexts,
+                    "retiring": entry.retiring,
+                    "age_s": round(time.monotonic() - entry.launched_at, 1),
+                }
+                for entry in entries
+            ]
+            for (browser_type, headless), entries in self._browsers.items()
+        }
+
+    async def close(self) -> None:
+        """Close every pooled browser and the Playwright driver."""
+        entries = [entry for entries in self._browsers.values() for entry in entries]
+        self._browsers = {}
+        for entry in entries:
+            await self._close_browser(entry)
+        if self._playwright is not None:
+            await playwright_driver.release()
+            self._playwright = None
+        self._condition = None
+
+
+# 每个 worker 进程一个浏览器池
+browser_pool = BrowserPool(
+    max_contexts_per_browser=settings.BROWSER_POOL_MAX_CONTEXTS,
+    max_uses_per_browser=settings.BROWSER_POOL_MAX_USES,
+    max_browsers_per_key=settings.BROWSER_POOL_MAX_BROWSERS,
+)
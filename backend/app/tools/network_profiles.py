@@ -0,0 +1,164 @@
+"""
+Network resource blocking profiles.
+
+A profile lists resource types and URL patterns that assertions never look at
+(images, fonts, media, analytics). NetworkBlocker installs a context-level
+route that aborts matching requests and records what was skipped so the run
+report can show the savings.
+
+Projects choose a profile via execution_config["network_profile"], either a
+built-in name or a dict:
+    {"extends": "lite", "resource_types": ["stylesheet"], "url_patterns": ["cdn\\.example\\.com/banners"],
+     "allow_patterns": ["captcha"]}
+
+Note: routing disables the browser HTTP cache for the context, so the "none"
+profile installs no route at all.
+"""
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Tuple
+
+from playwright.async_api import BrowserContext, Route
+
+logger = logging.getLogger(__name__)
+
+TRACKER_PATTERNS: Tuple[str, ...] = (
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"doubleclick\.net",
+    r"hm\.baidu\.com",
+    r"cnzz\.com",
+    r"connect\.facebook\.net",
+    r"hotjar\.com",
+    r"segment\.(io|com)",
+    r"sentry\.io",
+    r"clarity\.ms",
+)
+
+# Rough transfer sizes used when a blocked URL has never been seen unblocked.
+DEFAULT_RESOURCE_BYTES: Dict[str, int] = {
+    "image": 40 * 1024,
+    "font": 60 * 1024,
+    "media": 500 * 1024,
+    "script": 30 * 1024,
+    "stylesheet": 20 * 1024,
+}
+
+# URL -> last observed response size, shared by all contexts in the process.
+_observed_sizes: Dict[str, int] = {}
+_OBSERVED_SIZES_LIMIT = 20000
+
+
+@dataclass(frozen=True)
+class NetworkProfile:
+    name: str
+    resource_types: FrozenSet[str] = frozenset()
+    url_patterns: Tuple[str, ...] = ()
+    allow_patterns: Tuple[str, ...] = ()
+
+    @property
+    def is_noop(self) -> bool:
+        return not self.resource_types and not self.url_patterns
+
+
+BUILTIN_PROFILES: Dict[str, NetworkProfile] = {
+    "none": NetworkProfile(name="none"),
+    "lite": NetworkProfile(name="lite", resource_types=frozenset({"image", "font", "media"})),
+    "strict": NetworkProfile(
+        name="strict",
+        resource_types=frozenset({"image", "font", "media"}),
+        url_patterns=TRACKER_PATTERNS,
+    ),
+}
+
+
+def resolve_network_profile(spec: Any) -> NetworkProfile:
+    """Build a profile from a project setting (name, dict or None)."""
+    if not spec:
+        return BUILTIN_PROFILES["none"]
+    if isinstance(spec, str):
+        profile = BUILTIN_PROFILES.get(spec)
+        if profile is None:
+            logger.warning(f"Unknown network profile '{spec}', blocking disabled")
+            return BUILTIN_PROFILES["none"]
+        return profile
+    if isinstance(spec, Mapping):
+        base = resolve_network_profile(spec.get("extends")) if spec.get("extends") else BUILTIN_PROFILES["none"]
+        return NetworkProfile(
+            name=spec.get("name") or f"{base.name}+custom",
+            resource_types=base.resource_types | frozenset(spec.get("resource_types") or []),
+            url_patterns=base.url_patterns + tuple(spec.get("url_patterns") or []),
+            allow_patterns=base.allow_patterns + tuple(spec.get("allow_patterns") or []),
+        )
+    logger.warning(f"Invalid network profile setting: {spec!r}")
+    return BUILTIN_PROFILES["none"]
+
+
+def _compile(patterns: Tuple[str, ...]) -> Optional["re.Pattern[str]"]:
+    valid = []
+    for pattern in patterns:
+        try:
+            re.compile(pattern)
+            valid.append(f"(?:{pattern})")
+        except re.error:
+            logger.warning(f"Ignoring invalid network profile pattern: {pattern}")
+    return re.compile("|".join(valid), re.IGNORECASE) if valid else None
+
+
+@dataclass
+class NetworkBlocker:
+    """Aborts requests matching a profile on one BrowserContext and counts them."""
+
+    profile: NetworkProfile
+    blocked_requests: int = 0
+    blocked_bytes: int = 0
+    by_type: Dict[str, int] = field(default_factory=dict)
+    _block_re: Optional["re.Pattern[str]"] = field(default=None, init=False, repr=False)
+    _allow_re: Optional["re.Pattern[str]"] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self._block_re = _compile(self.profile.url_patterns)
+        self._allow_re = _compile(self.profile.allow_patterns)
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        if self._allow_re is not None and self._allow_re.search(url):
+            return False
+        if resource_type in self.profile.resource_types:
+            return True
+        return self._block_re is not None and bool(self._block_re.search(url))
+
+    async def install(self, context: BrowserContext) -> None:
+        if self.profile.is_noop:
+            return
+        await context.route("**/*", self._handle_route)
+        context.on("response", self._record_response_size)
+
+    async def _handle_route(self, route: Route) -> None:
+        request = route.request
+        if not self.should_block(request.url, request.resource_type):
+            await route.fallback()
+            return
+        self.blocked_requests += 1
+        self.by_type[request.resource_type] = self.by_type.get(request.resource_type, 0) + 1
+        self.blocked_bytes += _observed_sizes.get(request.url, DEFAULT_RESOURCE_BYTES.get(request.resource_type, 0))
+        try:
+            await route.abort("blockedbyclient")
+        except Exception as e:
+            logger.debug(f"Failed to abort {request.url}: {e}")
+
+    def _record_response_size(self, response) -> None:
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            if len(_observed_sizes) >= _OBSERVED_SIZES_LIMIT:
+                _observed_sizes.clear()
+            _observed_sizes[response.url] = int(length)
+
+    def stats(self) -> Dict[str, Any]:
+        # blocked_bytes is an estimate: aborted requests never transfer a body.
+        return {
+            "profile": self.profile.name,
+            "blocked_requests": self.blocked_requests,
+            "blocked_bytes": self.blocked_bytes,
+            "by_type": dict(self.by_type),
+        }
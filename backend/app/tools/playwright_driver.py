@@ -0,0 +1,144 @@
+"""
+Process-wide shared Playwright driver.
+
+``async_playwright().start()`` spawns a Node driver process. Starting one per
+PlaywrightTool / RecorderService session means dozens of drivers per worker
+under concurrency. This module keeps one driver per event loop and hands out
+reference-counted handles to it; everything on that loop multiplexes over the
+same driver connection.
+
+- Refcounting: ``acquire()`` / ``release()``; the driver is stopped once it has
+  been unreferenced for PLAYWRIGHT_DRIVER_IDLE_TIMEOUT seconds, so sequential
+  runs do not pay a restart each time
+- Restart: ``acquire()`` probes the driver with a real round-trip through the
+  public API (at most every PLAYWRIGHT_DRIVER_PROBE_INTERVAL seconds) and starts
+  a new one if the old driver no longer answers
+- One driver per loop because Playwright objects are bound to the loop that
+  created them (API process and Celery worker runtime each get their own)
+"""
+import asyncio
+import logging
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Optional
+
+from playwright.async_api import Playwright, async_playwright
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def probe(playwright: Optional[Playwright], timeout: float = 5.0) -> bool:
+    """
+    True if the driver answers a request. Uses an APIRequestContext round-trip,
+    which needs no browser and only touches Playwright's public API.
+    """
+    if playwright is None:
+        return False
+    try:
+        context = await asyncio.wait_for(playwright.request.new_context(), timeout)
+        await asyncio.wait_for(context.dispose(), timeout)
+        return True
+    except Exception as e:
+        logger.debug(f"Playwright driver probe failed: {e}")
+        return False
+
+
+@dataclass(eq=False)
+class _LoopDriver:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    playwright: Optional[Playwright] = None
+    refs: int = 0
+    starts: int = 0
+    probed_at: float = 0.0
+    idle_timer: Optional[asyncio.TimerHandle] = None
+
+
+class SharedPlaywrightDriver:
+    """Reference-counted Playwright driver, one per event loop."""
+
+    def __init__(self, idle_timeout: Optional[float] = None, probe_interval: Optional[float] = None):
+        self.idle_timeout = idle_timeout if idle_timeout is not None else settings.PLAYWRIGHT_DRIVER_IDLE_TIMEOUT
+        self.probe_interval = (
+            probe_interval if probe_interval is not None else settings.PLAYWRIGHT_DRIVER_PROBE_INTERVAL
+        )
+        self._drivers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopDriver]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _state(self) -> _LoopDriver:
+        loop = asyncio.get_running_loop()
+        state = self._drivers.get(loop)
+        if state is None:
+            state = self._drivers[loop] = _LoopDriver()
+        return state
+
+    async def acquire(self) -> Playwright:
+        """Return the loop's driver, starting or restarting it if needed."""
+        state = self._state()
+        async with state.lock:
+            if state.idle_timer is not None:
+                state.idle_timer.cancel()
+                state.idle_timer = None
+            now = time.monotonic()
+            if state.playwright is not None and now - state.probed_at >= self.probe_interval:
+                if not await probe(state.playwright):
+                    logger.warning("Shared Playwright driver is no longer responding, restarting it")
+                    await self._stop(state)
+                state.probed_at = now
+            if state.playwright is None:
+                state.playwright = await async_playwright().start()
+                state.starts += 1
+                state.probed_at = now
+                logger.info(f"Shared Playwright driver started (start #{state.starts})")
+            state.refs += 1
+            return state.playwright
+
+    async def release(self) -> None:
+        """Drop one reference; the driver stops after idling without references."""
+        state = self._state()
+        async with state.lock:
+            state.refs = max(0, state.refs - 1)
+            if state.refs == 0 and state.playwright is not None and state.idle_timer is None:
+                loop = asyncio.get_running_loop()
+                state.idle_timer = loop.call_later(
+                    self.idle_timeout, lambda: asyncio.ensure_future(self._stop_if_idle(state))
+                )
+
+    async def _stop_if_idle(self, state: _LoopDriver) -> None:
+        async with state.lock:
+            state.idle_timer = None
+            if state.refs == 0 and state.playwright is not None:
+                await self._stop(state)
+                logger.info("Shared Playwright driver stopped after idling")
+
+    async def _stop(self, state: _LoopDriver) -> None:
+        playwright, state.playwright = state.playwright, None
+        try:
+            await playwright.stop()
+        except Exception as e:
+            logger.debug(f"Failed to stop Playwright driver: {e}")
+
+    async def close(self) -> None:
+        """Stop the current loop's driver regardless of outstanding references (shutdown)."""
+        state = self._state()
+        async with state.lock:
+            if state.idle_timer is not None:
+                state.idle_timer.cancel()
+                state.idle_timer = None
+            if state.playwright is not None:
+                await self._stop(state)
+            state.refs = 0
+
+    def stats(self) -> dict:
+        try:
+            state = self._state()
+        except RuntimeError:
+            return {}
+        return {"running": state.playwright is not None, "refs": state.refs, "starts": state.starts}
+
+
+# 每个进程（每个事件循环）共享一个 Playwright driver
+playwright_driver = SharedPlaywrightDriver()
@@ -6,11 +6,34 @@ import asyncio
 import logging
 import re
 import time
-from typing import Optional, Dict, Any, List, Tuple
-from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Locator, expect
+from typing import Optional, Dict, Any, List, Tuple, TYPE_CHECKING
+from playwright.async_api import Page, Browser, BrowserContext, Locator, expect
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from app.tools.playwright_driver import playwright_driver
+from app.tools.semantic_scoring import resolve_weights, score_candidates
+from app.tools.site_profiles import site_profiles
+
+if TYPE_CHECKING:
+    from app.tools.browser_pool import BrowserPool, PooledBrowser
 
 logger = logging.getLogger(__name__)
 
+SETTLE_MODES = ("none", "load", "networkidle", "dom")
+
+# Injected into every document: records when the DOM last changed so settle(mode="dom")
+# can wait for a quiet period. Idempotent, so it can also be evaluated on demand.
+DOM_OBSERVER_SCRIPT = """
+(() => {
+  if (window.__uiAutoDom) return;
+  const state = window.__uiAutoDom = { version: 0, lastMutation: Date.now() };
+  new MutationObserver(() => {
+    state.version += 1;
+    state.lastMutation = Date.now();
+  }).observe(document, { subtree: true, childList: true, attributes: true, characterData: true });
+})();
+"""
+
 
 class PlaywrightTool:
     """
@@ -18,20 +41,42 @@ class PlaywrightTool:
     Provides methods for common actions like navigation, clicking, filling forms, etc.
     """
     
-    def __init__(self, headless: bool = True, browser_type: str = "chromium"):
+    def __init__(
+        self,
+        headless: bool = True,
+        browser_type: str = "chromium",
+        pool: Optional["BrowserPool"] = None,
+        context_options: Optional[Dict[str, Any]] = None,
+        semantic_weights: Optional[Dict[str, Any]] = None,
+    ):
         """
         Initialize PlaywrightTool.
         
         Args:
             headless: Whether to run browser in headless mode
             browser_type: Browser type - "chromium", "firefox", or "webkit"
+            pool: Optional browser pool; when given, a warm browser is reused
+                and only a fresh context is created for this tool
+            context_options: Extra keyword arguments for browser.new_context(),
+                e.g. storage_state to start with a logged-in session
+            semantic_weights: Overrides for semantic_scoring.DEFAULT_WEIGHTS
+                used when healing a selector
         """
         self.headless = headless
         self.browser_type = browser_type
+        self.pool = pool
+        self.context_options: Dict[str, Any] = dict(context_options or {})
+        self.semantic_weights = resolve_weights(semantic_weights)
         self.playwright = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        self._pool_entry: Optional["PooledBrowser"] = None
+        self._inflight_requests: set = set()
+        self.last_resolution: Optional[Dict[str, Any]] = None
+        self.tracing = False
+        # kind -> (url, dom version, candidates) of the last semantic scan
+        self._semantic_cache: Dict[str, Tuple[str, str, List[Dict[str, Any]]]] = {}
     
     async def __aenter__(self):
         """Context manager entry - initialize browser."""
@@ -44,30 +89,122 @@ class PlaywrightTool:
     
     async def start(self):
         """Start Playwright and launch browser."""
-        self.playwright = await async_playwright().start()
-        
-        # Launch appropriate browser based on browser_type
-        if self.browser_type == "firefox":
-            self.browser = await self.playwright.firefox.launch(headless=self.headless)
-        elif self.browser_type == "webkit":
-            self.browser = await self.playwright.webkit.launch(headless=self.headless)
-        else:  # default to chromium
-            self.browser = await self.playwright.chromium.launch(headless=self.headless)
-        
-        self.context = await self.browser.new_context()
-        self.page = await self.context.new_page()
+        if self.pool is not None:
+            self._pool_entry, self.context = await self.pool.acquire(
+                self.browser_type, self.headless, **self.context_options
+            )
+            self.browser = self._pool_entry.browser
+            await self._prepare_context()
+            await self._open_page()
+            logger.info(f"Playwright context acquired from pool: {self.browser_type}, headless={self.headless}")
+            return
+
+        self.playwright = await playwright_driver.acquire()
+        try:
+            # Launch appropriate browser based on browser_type
+            if self.browser_type == "firefox":
+                self.browser = await self.playwright.firefox.launch(headless=self.headless)
+            elif self.browser_type == "webkit":
+                self.browser = await self.playwright.webkit.launch(headless=self.headless)
+            else:  # default to chromium
+                self.browser = await self.playwright.chromium.launch(headless=self.headless)
+
+            self.context = await self.browser.new_context(**self.context_options)
+            await self._prepare_context()
+            await self._open_page()
+        except BaseException:
+            # __aexit__ does not run when start() fails, so clean up here.
+            await self.close()
+            raise
         logger.info(f"Playwright browser started: {self.browser_type}, headless={self.headless}")
     
+    async def _prepare_context(self) -> None:
+        """Install the DOM observer and in-flight request tracking used by settle()."""
+        await self.context.add_init_script(DOM_OBSERVER_SCRIPT)
+        self.context.on("request", self._inflight_requests.add)
+        self.context.on("requestfinished", self._inflight_requests.discard)
+        self.context.on("requestfailed", self._inflight_requests.discard)
+
+    async def _open_page(self) -> None:
+        self.page = await self.context.new_page()
+        self.page.on("framenavigated", self._on_frame_navigated)
+
+    def _on_frame_navigated(self, frame) -> None:
+        # A new document restarts the DOM version counter, so cached scans no longer apply.
+        if self.page is not None and frame == self.page.main_frame:
+            self._semantic_cache.clear()
+
     async def close(self):
         """Close browser and cleanup resources."""
-        if self.context:
-            await self.context.close()
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
+        if self._pool_entry is not None:
+            await self.pool.release(self._pool_entry, self.context)
+            self._pool_entry = None
+            self.context = None
+            self.browser = None
+            self.page = None
+            logger.info("Playwright context released to pool")
+            return
+        try:
+            if self.context:
+                await self.context.close()
+            if self.browser:
+                await self.browser.close()
+        finally:
+            if self.playwright:
+                await playwright_driver.release()
+                self.playwright = None
         logger.info("Playwright browser closed")
     
+    async def start_tracing(
+        self,
+        *,
+        screenshots: bool = True,
+        snapshots: bool = True,
+        sources: bool = True,
+        title: Optional[str] = None,
+    ) -> None:
+        """Start context tracing and open the first chunk."""
+        if not self.context:
+            raise RuntimeError("Browser not started. Call start() first.")
+        await self.context.tracing.start(screenshots=screenshots, snapshots=snapshots, sources=sources, title=title)
+        await self.context.tracing.start_chunk(title=title)
+        self.tracing = True
+
+    async def rotate_trace_chunk(self) -> None:
+        """Discard the current chunk without exporting it and start a new one."""
+        if not self.tracing:
+            return
+        await self.context.tracing.stop_chunk()
+        await self.context.tracing.start_chunk()
+
+    async def stop_tracing(self, path: Optional[str] = None) -> bool:
+        """
+        Stop tracing. The current chunk is exported to ``path`` when given and
+        discarded otherwise. Returns True if a trace file was written.
+        """
+        if not self.tracing:
+            return False
+        self.tracing = False
+        try:
+            await self.context.tracing.stop_chunk(path=path)
+        finally:
+            await self.context.tracing.stop()
+        return path is not None
+
+    async def replay_har(self, har_path: str, not_found: str = "fallback") -> None:
+        """
+        Serve matching requests from a recorded HAR instead of the network.
+
+        Args:
+            har_path: HAR file (or .zip archive) recorded via record_har_path
+            not_found: "fallback" sends unmatched requests to the network,
+                "abort" fails them
+        """
+        if not self.context:
+            raise RuntimeError("Browser not started. Call start() first.")
+        await self.context.route_from_har(har_path, not_found=not_found)
+        logger.info(f"Replaying network from HAR {har_path} (not_found={not_found})")
+
     async def goto(self, url: str, **kwargs) -> None:
         """
         Navigate to a URL.
@@ -86,6 +223,84 @@ class PlaywrightTool:
         await self.page.goto(url, **kwargs)
         logger.debug(f"Navigated to {url}")
 
+    async def settle(
+        self,
+        mode: str = "load",
+        *,
+        timeout: int = 10000,
+        load_state: str = "load",
+        max_inflight: int = 0,
+        quiet_ms: int = 500,
+    ) -> bool:
+        """
+        Wait until the page has settled instead of sleeping for a fixed time.
+
+        Args:
+            mode: "load" waits for ``load_state``; "networkidle" waits until at
+                most ``max_inflight`` requests are pending for ``quiet_ms``;
+                "dom" waits until the DOM has not mutated for ``quiet_ms``;
+                "none" returns immediately
+            timeout: Upper bound in milliseconds; reaching it is not an error
+
+        Returns:
+            True if the condition was met, False if the timeout was reached
+        """
+        if not self.page:
+            raise RuntimeError("Browser not started. Call start() first.")
+        if mode == "none" or timeout <= 0:
+            return True
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + timeout / 1000
+        try:
+            if mode == "networkidle":
+                idle_since = None
+                while True:
+                    now = loop.time()
+                    if len(self._inflight_requests) <= max_inflight:
+                        idle_since = idle_since if idle_since is not None else now
+                        if (now - idle_since) * 1000 >= quiet_ms:
+                            return True
+                    else:
+                        idle_since = None
+                    if now >= deadline:
+                        return False
+                    await asyncio.sleep(0.05)
+
+            if mode == "dom":
+                while True:
+                    remaining = int((deadline - loop.time()) * 1000)
+                    if remaining <= 0:
+                        return False
+                    try:
+                        await self.page.evaluate(DOM_OBSERVER_SCRIPT)
+                        await self.page.wait_for_function(
+                            "quiet => Date.now() - window.__uiAutoDom.lastMutation >= quiet",
+                            arg=quiet_ms,
+                            timeout=remaining,
+                            polling=100,
+                        )
+                        return True
+                    except PlaywrightTimeoutError:
+                        return False
+                    except PlaywrightError as e:
+                        # A navigation destroyed the execution context; observe the new document.
+                        logger.debug(f"DOM settle retrying after navigation: {e}")
+                        await asyncio.sleep(0.05)
+
+            await self.page.wait_for_load_state(load_state, timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+        finally:
+            logger.debug(f"Settle mode={mode} took {int((loop.time() - started) * 1000)}ms")
+
+    @staticmethod
+    def _remaining_ms(timeout: int, started: float) -> int:
+        """What is left of ``timeout`` since ``started``; never 0, which Playwright reads as no limit."""
+        return max(timeout - int((time.monotonic() - started) * 1000), 1)
+
     def _strip_visible_pseudo(self, selector: str) -> str:
         return re.sub(r":visible\b", "", selector or "", flags=re.IGNORECASE).strip()
 
@@ -95,47 +310,132 @@ class PlaywrightTool:
         *,
         timeout: int = 10000,
         require_visible: bool = True,
-        max_candidates: int = 10,
+        record: bool = True,
     ) -> Locator:
         """
         Resolve a selector to a concrete locator.
         Prefer a visible match when multiple nodes or hidden duplicates exist.
+
+        The candidates (the selector as written and without ``:visible``) are
+        combined into a single locator and Playwright waits for it in the
+        browser, so a successful resolution is one protocol round-trip instead
+        of a count() plus per-node is_visible() calls every poll. The result is
+        a Locator pinned to the first match rather than an ElementHandle,
+        because every caller acts through Locator APIs. Diagnostics of the last
+        resolution are kept in ``self.last_resolution`` unless ``record`` is
+        false (concurrent probes of race_locators).
         """
         if not self.page:
             raise RuntimeError("Browser not started. Call start() first.")
 
-        candidates = [selector]
         stripped = self._strip_visible_pseudo(selector)
-        if stripped and stripped != selector:
-            candidates.append(stripped)
+        if require_visible:
+            # ":visible" matches are a subset of the visible matches of the stripped selector.
+            candidates = [f"{stripped or selector} >> visible=true"]
+        else:
+            candidates = [selector]
+            if stripped and stripped != selector:
+                candidates.append(stripped)
 
-        deadline = time.monotonic() + (timeout / 1000)
-        last_count = 0
+        combined: Optional[Locator] = None
+        for candidate in candidates:
+            locator = self.page.locator(candidate)
+            combined = locator if combined is None else combined.or_(locator)
+        resolved = combined.first
 
-        while time.monotonic() < deadline:
-            for candidate in candidates:
-                locator = self.page.locator(candidate)
-                count = await locator.count()
-                last_count = max(last_count, count)
-                if count == 0:
-                    continue
+        started = time.monotonic()
+        try:
+            await resolved.wait_for(state="attached", timeout=timeout)
+        except PlaywrightTimeoutError:
+            try:
+                matched_count = await self.page.locator(stripped or selector).count()
+            except PlaywrightError:
+                matched_count = 0
+            if record:
+                self.last_resolution = {
+                    "selector": selector,
+                    "resolved": False,
+                    "require_visible": require_visible,
+                    "matched_count": matched_count,
+                    "elapsed_ms": int((time.monotonic() - started) * 1000),
+                }
+            visibility_hint = "visible " if require_visible else ""
+            raise TimeoutError(
+                f"No {visibility_hint}element resolved for selector '{selector}' within {timeout}ms; "
+                f"matched_count={matched_count}"
+            )
 
-                if not require_visible:
-                    return locator.first
+        if record:
+            self.last_resolution = {
+                "selector": selector,
+                "resolved": True,
+                "require_visible": require_visible,
+                "elapsed_ms": int((time.monotonic() - started) * 1000),
+            }
+        return resolved
 
-                for idx in range(min(count, max_candidates)):
-                    item = locator.nth(idx)
-                    try:
-                        if await item.is_visible():
-                            return item
-                    except Exception:
-                        continue
+    async def race_locators(
+        self,
+        selectors: List[str],
+        *,
+        timeout: int = 10000,
+        require_visible: bool = True,
+    ) -> Tuple[int, Locator]:
+        """
+        Probe several selectors concurrently and return (index, locator) of the
+        first one that resolves. When several resolve in the same round the
+        lowest index wins, so candidate priority is kept. Remaining probes are
+        cancelled; all of them share a single timeout. ``self.last_resolution``
+        describes the race as a whole, not whichever probe finished last.
+        """
+        if not selectors:
+            raise ValueError("No selectors to resolve")
 
-            await asyncio.sleep(0.2)
+        started = time.monotonic()
+        tasks = {
+            asyncio.ensure_future(
+                self._get_preferred_locator(selector, timeout=timeout, require_visible=require_visible, record=False)
+            ): index
+            for index, selector in enumerate(selectors)
+        }
+        pending = set(tasks)
+        errors: Dict[int, str] = {}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winners = []
+                for task in done:
+                    if task.exception() is None:
+                        winners.append((tasks[task], task.result()))
+                    else:
+                        errors[tasks[task]] = str(task.exception())
+                if winners:
+                    index, locator = min(winners, key=lambda item: item[0])
+                    self.last_resolution = {
+                        "selector": selectors[index],
+                        "resolved": True,
+                        "require_visible": require_visible,
+                        "raced": len(selectors),
+                        "elapsed_ms": int((time.monotonic() - started) * 1000),
+                    }
+                    return index, locator
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
 
-        visibility_hint = "visible " if require_visible else ""
+        self.last_resolution = {
+            "selector": selectors[0],
+            "resolved": False,
+            "require_visible": require_visible,
+            "raced": len(selectors),
+            "errors": {selectors[index]: errors[index] for index in sorted(errors)},
+            "elapsed_ms": int((time.monotonic() - started) * 1000),
+        }
         raise TimeoutError(
-            f"No {visibility_hint}element resolved for selector '{selector}' within {timeout}ms; matched_count={last_count}"
+            f"None of {len(selectors)} selector(s) resolved within {timeout}ms: "
+            + "; ".join(f"{selectors[index]} -> {errors[index]}" for index in sorted(errors))
         )
 
     def _extract_hint_tokens(
@@ -213,12 +513,34 @@ class PlaywrightTool:
         return any(marker in combined for marker in search_markers)
 
     async def _collect_semantic_candidates(self, kind: str) -> List[Dict[str, Any]]:
+        """
+        Scan the page for candidates of ``kind`` ("editable" or "clickable").
+
+        Scans are cached per (kind, URL, DOM version). The version comes from the
+        document's time origin, the MutationObserver counter in
+        DOM_OBSERVER_SCRIPT, scroll offset and viewport size, so new documents
+        and geometry changes also invalidate the cache; main-frame navigations
+        clear it outright. On an unchanged page the in-page check returns
+        without rescanning.
+        """
         if not self.page:
             raise RuntimeError("Browser not started. Call start() first.")
 
-        return await self.page.evaluate(
+        url = self.page.url
+        cached = self._semantic_cache.get(kind)
+        known_version = cached[1] if cached and cached[0] == url else None
+
+        scan = await self.page.evaluate(
             """
-            (kind) => {
+            ({ kind, knownVersion }) => {
+              const dom = window.__uiAutoDom;
+              // timeOrigin is unique per document, so a reload of the same URL never reuses a scan.
+              const version = dom
+                ? `${performance.timeOrigin}:${dom.version}:${window.scrollX}:${window.scrollY}:${window.innerWidth}x${window.innerHeight}`
+                : null;
+              if (version !== null && version === knownVersion) {
+                return { version, candidates: null };
+              }
               const cssEscape = (value) => {
                 const text = String(value ?? '');
                 if (window.CSS && typeof window.CSS.escape === 'function') {
@@ -283,7 +605,7 @@ class PlaywrightTool:
                 clickable: "button, [role='button'], input[type='submit'], input[type='button'], a[href], summary"
               };
               const rootSelector = selectorMap[kind] || selectorMap.editable;
-              return Array.from(document.querySelectorAll(rootSelector))
+              const candidates = Array.from(document.querySelectorAll(rootSelector))
                 .slice(0, 60)
                 .map((el) => {
                   const rect = el.getBoundingClientRect();
@@ -312,89 +634,17 @@ class PlaywrightTool:
                   };
                 })
                 .filter((item) => item.visible && item.selector);
+              return { version, candidates };
             }
             """,
-            kind,
+            {"kind": kind, "knownVersion": known_version},
         )
-
-    def _score_semantic_candidate(
-        self,
-        candidate: Dict[str, Any],
-        *,
-        action: str,
-        selector: str,
-        step_description: Optional[str] = None,
-        value: Optional[str] = None,
-    ) -> float:
-        url = str(self.page.url if self.page else "").lower()
-        text_blob = " ".join(
-            [
-                str(candidate.get("selector", "")),
-                str(candidate.get("tag", "")),
-                str(candidate.get("type", "")),
-                str(candidate.get("id", "")),
-                str(candidate.get("name", "")),
-                str(candidate.get("placeholder", "")),
-                str(candidate.get("aria_label", "")),
-                str(candidate.get("title", "")),
-                str(candidate.get("class_name", "")),
-                str(candidate.get("text", "")),
-                str(candidate.get("role", "")),
-            ]
-        ).lower()
-        score = 0.0
-
-        if candidate.get("visible"):
-            score += 10
-        if candidate.get("editable"):
-            score += 18
-        if not candidate.get("disabled"):
-            score += 6
-        if not candidate.get("read_only"):
-            score += 6
-        if candidate.get("tag") in {"input", "textarea"}:
-            score += 10
-
-        width = float(candidate.get("width") or 0)
-        height = float(candidate.get("height") or 0)
-        x = float(candidate.get("x") or 0)
-        y = float(candidate.get("y") or 0)
-        viewport_width = float(candidate.get("viewport_width") or 1)
-        viewport_height = float(candidate.get("viewport_height") or 1)
-        center_x = x + width / 2
-        center_y = y + height / 2
-        score += min(width / 40, 12)
-        score += min(height / 20, 6)
-        score += max(0, 12 - abs(center_x - viewport_width / 2) / 80)
-        score += max(0, 8 - abs(center_y - viewport_height * 0.35) / 80)
-
-        search_intent = self._looks_like_search_intent(action, selector, step_description, value)
-        if search_intent:
-            if candidate.get("tag") == "textarea":
-                score += 12
-            if candidate.get("role") == "searchbox":
-                score += 10
-            for term in ["search", "query", "keyword", "搜索", "百度", "chat", "submit", "搜索词"]:
-                if term in text_blob:
-                    score += 8
-            if candidate.get("placeholder"):
-                score += 6
-
-        for token in self._extract_hint_tokens(selector, step_description, value):
-            if token and token in text_blob:
-                score += 5
-
-        if "baidu." in url:
-            if candidate.get("id") == "chat-textarea":
-                score += 60
-            if "chat-input-textarea" in text_blob:
-                score += 24
-            if candidate.get("id") == "chat-submit-button":
-                score += 60
-            if "百度一下" in text_blob:
-                score += 30
-
-        return score
+        if scan["candidates"] is None:
+            logger.debug(f"Semantic candidates cache hit: kind={kind} version={scan['version']}")
+            return cached[2]
+        if scan["version"] is not None:
+            self._semantic_cache[kind] = (url, scan["version"], scan["candidates"])
+        return scan["candidates"]
 
     async def _find_semantic_selector(
         self,
@@ -423,24 +673,18 @@ class PlaywrightTool:
         if not candidates:
             return None
 
-        scored = sorted(
-            (
-                (self._score_semantic_candidate(
-                    candidate,
-                    action=action,
-                    selector=selector,
-                    step_description=step_description,
-                    value=value,
-                ), candidate)
-                for candidate in candidates
-            ),
-            key=lambda item: item[0],
-            reverse=True,
+        search_intent = self._looks_like_search_intent(action, selector, step_description, value)
+        scores = score_candidates(
+            candidates,
+            search_intent=search_intent,
+            hint_tokens=self._extract_hint_tokens(selector, step_description, value),
+            weights=self.semantic_weights,
+            profile=site_profiles.lookup(self.page.url),
         )
+        scored = sorted(zip(scores, candidates), key=lambda item: item[0], reverse=True)
 
         best_score, best_candidate = scored[0]
         second_score = scored[1][0] if len(scored) > 1 else 0.0
-        search_intent = self._looks_like_search_intent(action, selector, step_description, value)
         if len(candidates) == 1 and best_score >= 18:
             return best_candidate.get("selector")
         if search_intent and best_score >= 24:
@@ -488,43 +732,49 @@ class PlaywrightTool:
                 return locator, healed_selector
             raise original_error
 
-    async def _maybe_click_submit_after_enter(
+    async def _run_site_hooks(
         self,
         *,
+        action: str,
         resolved_selector: str,
+        key: Optional[str] = None,
         step_description: Optional[str],
         timeout: int,
     ) -> None:
+        """Run the current site profile's follow-up clicks for this action, if any."""
         if not self.page:
             raise RuntimeError("Browser not started. Call start() first.")
 
-        url = str(self.page.url or "").lower()
-        if "baidu." not in url or resolved_selector != "#chat-textarea":
+        profile = site_profiles.lookup(self.page.url)
+        if profile is None:
             return
 
-        await self.page.wait_for_timeout(150)
-        submit_selector = await self._find_semantic_selector(
-            action="click",
-            selector="#chat-submit-button",
-            value="submit",
-            step_description=f"{step_description or ''} 搜索 提交 百度一下",
-        )
-        if not submit_selector:
-            return
+        for hook in profile.hooks_for(action, resolved_selector, key):
+            await self.page.wait_for_timeout(hook.delay_ms)
+            submit_selector = await self._find_semantic_selector(
+                action="click",
+                selector=hook.click,
+                value="submit",
+                step_description=f"{step_description or ''} {hook.hint}",
+            )
+            if not submit_selector:
+                continue
 
-        locator, recovered_submit_selector = await self._resolve_locator(
-            submit_selector,
-            action="click",
-            timeout=min(timeout, 3000),
-            require_visible=True,
-            step_description="点击搜索提交按钮",
-        )
-        await locator.click()
-        logger.info(
-            "Search submit fallback triggered after Enter | input=%s submit=%s",
-            resolved_selector,
-            recovered_submit_selector,
-        )
+            locator, recovered_submit_selector = await self._resolve_locator(
+                submit_selector,
+                action="click",
+                timeout=min(timeout, 3000),
+                require_visible=True,
+                step_description="点击搜索提交按钮",
+            )
+            await locator.click()
+            logger.info(
+                "Site hook triggered | profile=%s after=%s input=%s click=%s",
+                profile.name,
+                action,
+                resolved_selector,
+                recovered_submit_selector,
+            )
     
     async def click(self, selector: str, **kwargs) -> str:
         """
@@ -586,52 +836,58 @@ class PlaywrightTool:
         await self.page.wait_for_timeout(milliseconds)
         logger.debug(f"Waited for {milliseconds}ms")
     
-    async def get_text(self, selector: str) -> Optional[str]:
+    async def get_text(self, selector: str, timeout: int = 10000) -> Optional[str]:
         """
         Get text content of an element.
         
         Args:
             selector: CSS selector or XPath
+            timeout: Total budget in ms for resolving and reading the element
             
         Returns:
             The text content or None
         """
         if not self.page:
             raise RuntimeError("Browser not started. Call start() first.")
-        locator = await self._get_preferred_locator(selector, timeout=10000, require_visible=False)
-        text = await locator.text_content()
+        started = time.monotonic()
+        locator = await self._get_preferred_locator(selector, timeout=timeout, require_visible=False)
+        text = await locator.text_content(timeout=self._remaining_ms(timeout, started))
         logger.debug(f"Got text from {selector}: {text}")
         return text
     
-    async def assert_text(self, selector: str, expected_text: str) -> None:
+    async def assert_text(self, selector: str, expected_text: str, timeout: int = 10000) -> None:
         """
         Assert that an element contains expected text.
         
         Args:
             selector: CSS selector or XPath
             expected_text: The expected text
+            timeout: Total budget in ms for resolving the element and the assertion
             
         Raises:
             AssertionError: If text doesn't match
         """
         if not self.page:
             raise RuntimeError("Browser not started. Call start() first.")
-        locator = await self._get_preferred_locator(selector, timeout=10000, require_visible=False)
-        await expect(locator).to_have_text(expected_text)
+        started = time.monotonic()
+        locator = await self._get_preferred_locator(selector, timeout=timeout, require_visible=False)
+        await expect(locator).to_have_text(expected_text, timeout=self._remaining_ms(timeout, started))
         logger.debug(f"Asserted text in {selector}: {expected_text}")
 
-    async def assert_text_contains(self, selector: str, expected_text: str) -> None:
+    async def assert_text_contains(self, selector: str, expected_text: str, timeout: int = 10000) -> None:
         """Assert that an element contains expected text."""
         if not self.page:
             raise RuntimeError("Browser not started. Call start() first.")
-        locator = await self._get_preferred_locator(selector, timeout=10000, require_visible=False)
-        await expect(locator).to_contain_text(expected_text)
+        started = time.monotonic()
+        locator = await self._get_preferred_locator(selector, timeout=timeout, require_visible=False)
+        await expect(locator).to_contain_text(expected_text, timeout=self._remaining_ms(timeout, started))
         logger.debug(f"Asserted text contains in {selector}: {expected_text}")
 
     async def assert_visible(self, selector: str, timeout: int = 10000, step_description: str = "") -> str:
         """Assert an element is visible."""
         if not self.page:
             raise RuntimeError("Browser not started. Call start() first.")
+        started = time.monotonic()
         locator, resolved_selector = await self._resolve_locator(
             selector,
             action="assert_visible",
@@ -639,7 +895,7 @@ class PlaywrightTool:
             require_visible=True,
             step_description=step_description,
         )
-        await expect(locator).to_be_visible(timeout=timeout)
+        await expect(locator).to_be_visible(timeout=self._remaining_ms(timeout, started))
         logger.debug(f"Asserted visible: {selector}")
         return resolved_selector
 
@@ -718,21 +974,23 @@ class PlaywrightTool:
             step_description=step_description,
         )
         await locator.press(key, **kwargs)
-        if str(key).strip().lower() == "enter":
-            await self._maybe_click_submit_after_enter(
-                resolved_selector=resolved_selector,
-                step_description=step_description,
-                timeout=timeout,
-            )
+        await self._run_site_hooks(
+            action="press",
+            resolved_selector=resolved_selector,
+            key=key,
+            step_description=step_description,
+            timeout=timeout,
+        )
         logger.debug(f"Pressed key '{key}' on {selector}")
         return resolved_selector
 
-    async def get_attribute(self, selector: str, name: str) -> Optional[str]:
+    async def get_attribute(self, selector: str, name: str, timeout: int = 10000) -> Optional[str]:
         """Get attribute value of an element."""
         if not self.page:
             raise RuntimeError("Browser not started. Call start() first.")
-        locator = await self._get_preferred_locator(selector, timeout=10000, require_visible=False)
-        value = await locator.get_attribute(name)
+        started = time.monotonic()
+        locator = await self._get_preferred_locator(selector, timeout=timeout, require_visible=False)
+        value = await locator.get_attribute(name, timeout=self._remaining_ms(timeout, started))
         logger.debug(f"Got attribute {name} from {selector}: {value}")
         return value
     
@@ -862,26 +1120,29 @@ class PlaywrightTool:
                 call_kwargs.pop("state", None)
                 result["resolved_selector"] = await self.press(selector, str(value), **call_kwargs)
             
-            elif action == "text_content":
+            elif action in ("text_content", "get_text"):
                 if not selector:
                     raise ValueError("Selector required for text_content action")
-                text = await self.get_text(selector)
+                text = await self.get_text(selector, timeout=int(call_kwargs.get("timeout", 10000)))
                 result["output"] = text
 
             elif action == "get_attribute":
                 if not selector:
                     raise ValueError("Selector required for get_attribute action")
                 attr_name = str(value or "value")
-                result["output"] = await self.get_attribute(selector, attr_name)
+                result["output"] = await self.get_attribute(
+                    selector, attr_name, timeout=int(call_kwargs.get("timeout", 10000))
+                )
             
             elif action == "assert_text":
                 if not selector or not value:
                     raise ValueError("Selector and expected text required for assert_text action")
                 exact = bool(call_kwargs.get("exact", False))
+                timeout = int(call_kwargs.get("timeout", 10000))
                 if exact:
-                    await self.assert_text(selector, str(value))
+                    await self.assert_text(selector, str(value), timeout=timeout)
                 else:
-                    await self.assert_text_contains(selector, str(value))
+                    await self.assert_text_contains(selector, str(value), timeout=timeout)
 
             elif action == "assert_visible":
                 if not selector:
@@ -0,0 +1,178 @@
+"""
+Batched scoring of semantic locator candidates.
+
+The candidates collected by PlaywrightTool._collect_semantic_candidates are
+turned into a feature matrix one column at a time. Geometry and flag columns
+are NumPy array expressions. Text columns are built from a single array of
+lowercased text blobs: ``np.strings.find`` runs once per search term, hint
+token or site boost over the whole batch, not once per candidate. A weight
+vector then scores every row in a single matrix product.
+
+Site-specific boosts come from the page's SiteProfile (see site_profiles).
+Weights default to DEFAULT_WEIGHTS and can be overridden per project through
+execution_config["semantic_weights"], e.g. {"editable": 25, "hint_token": 8}.
+"""
+import logging
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.tools.site_profiles import CandidateBoost, SiteProfile
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TERMS = ("search", "query", "keyword", "搜索", "百度", "chat", "submit", "搜索词")
+
+# Feature order of the matrix rows; every feature has exactly one weight.
+FEATURES: Tuple[str, ...] = (
+    "visible",
+    "editable",
+    "enabled",
+    "writable",
+    "input_tag",
+    "width",  # min(width / 40, 12)
+    "height",  # min(height / 20, 6)
+    "center_x",  # closeness to the horizontal centre, 0..12
+    "center_y",  # closeness to 35% of the viewport height, 0..8
+    "search_textarea",
+    "search_role",
+    "search_term",  # count of SEARCH_TERMS found, search intent only
+    "search_placeholder",
+    "hint_token",  # count of step hint tokens found
+)
+
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "visible": 10,
+    "editable": 18,
+    "enabled": 6,
+    "writable": 6,
+    "input_tag": 10,
+    "width": 1,
+    "height": 1,
+    "center_x": 1,
+    "center_y": 1,
+    "search_textarea": 12,
+    "search_role": 10,
+    "search_term": 8,
+    "search_placeholder": 6,
+    "hint_token": 5,
+}
+
+_BLOB_FIELDS = ("selector", "tag", "type", "id", "name", "placeholder", "aria_label", "title", "class_name", "text", "role")
+
+
+def resolve_weights(overrides: Optional[Mapping[str, Any]] = None) -> Tuple[float, ...]:
+    """Weight vector in FEATURES order, with unknown override keys ignored."""
+    weights = dict(DEFAULT_WEIGHTS)
+    for name, value in (overrides or {}).items():
+        if name not in weights:
+            logger.warning(f"Unknown semantic weight '{name}' ignored")
+            continue
+        try:
+            weights[name] = float(value)
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid semantic weight {name}={value!r} ignored")
+    return tuple(float(weights[name]) for name in FEATURES)
+
+
+def _numbers(candidates: Sequence[Mapping[str, Any]], field: str) -> np.ndarray:
+    return np.fromiter((float(candidate.get(field) or 0) for candidate in candidates), dtype=float, count=len(candidates))
+
+
+def _flags(candidates: Sequence[Mapping[str, Any]], field: str) -> np.ndarray:
+    return np.fromiter((bool(candidate.get(field)) for candidate in candidates), dtype=bool, count=len(candidates))
+
+
+def _strings(candidates: Sequence[Mapping[str, Any]], field: str) -> np.ndarray:
+    return np.array([str(candidate.get(field) or "") for candidate in candidates], dtype=np.str_)
+
+
+def _text_blobs(candidates: Sequence[Mapping[str, Any]]) -> np.ndarray:
+    """Lowercased space-joined _BLOB_FIELDS of every candidate, as one string array."""
+    blob = None
+    for field in _BLOB_FIELDS:
+        column = np.array([str(candidate.get(field, "")) for candidate in candidates], dtype=np.str_)
+        blob = column if blob is None else np.strings.add(np.strings.add(blob, " "), column)
+    return np.strings.lower(blob)
+
+
+def _count_contained(blobs: np.ndarray, terms: Sequence[str]) -> np.ndarray:
+    """Per blob, how many of ``terms`` it contains."""
+    counts = np.zeros(len(blobs), dtype=float)
+    for term in terms:
+        if term:
+            counts += np.strings.find(blobs, term) >= 0
+    return counts
+
+
+def _boost_column(
+    boost: CandidateBoost, candidates: Sequence[Mapping[str, Any]], blobs: np.ndarray
+) -> np.ndarray:
+    """Vectorized CandidateBoost.matches over the batch."""
+    values = blobs if boost.field == "blob" else _strings(candidates, boost.field)
+    if boost.equals is not None:
+        return values == boost.equals
+    if boost.contains is not None:
+        return np.strings.find(np.strings.lower(values), boost.contains) >= 0
+    return np.fromiter((bool(boost.pattern.search(value)) for value in values.tolist()), dtype=bool, count=len(values))
+
+
+def feature_matrix(
+    candidates: Sequence[Mapping[str, Any]],
+    *,
+    search_intent: bool,
+    hint_tokens: Sequence[str],
+    boosts: Sequence[CandidateBoost] = (),
+) -> np.ndarray:
+    """Candidates x (FEATURES + boosts) matrix; boost columns follow FEATURES in order."""
+    blobs = _text_blobs(candidates)
+    tags = _strings(candidates, "tag")
+    width = _numbers(candidates, "width")
+    height = _numbers(candidates, "height")
+    center_x = _numbers(candidates, "x") + width / 2
+    center_y = _numbers(candidates, "y") + height / 2
+    viewport_width = np.fromiter(
+        (float(candidate.get("viewport_width") or 1) for candidate in candidates), dtype=float, count=len(candidates)
+    )
+    viewport_height = np.fromiter(
+        (float(candidate.get("viewport_height") or 1) for candidate in candidates), dtype=float, count=len(candidates)
+    )
+    zeros = np.zeros(len(candidates), dtype=float)
+    columns = [
+        _flags(candidates, "visible"),
+        _flags(candidates, "editable"),
+        ~_flags(candidates, "disabled"),
+        ~_flags(candidates, "read_only"),
+        (tags == "input") | (tags == "textarea"),
+        np.minimum(width / 40, 12),
+        np.minimum(height / 20, 6),
+        np.maximum(0.0, 12 - np.abs(center_x - viewport_width / 2) / 80),
+        np.maximum(0.0, 8 - np.abs(center_y - viewport_height * 0.35) / 80),
+        (tags == "textarea") if search_intent else zeros,
+        (_strings(candidates, "role") == "searchbox") if search_intent else zeros,
+        _count_contained(blobs, SEARCH_TERMS) if search_intent else zeros,
+        (_strings(candidates, "placeholder") != "") if search_intent else zeros,
+        _count_contained(blobs, hint_tokens),
+        *(_boost_column(boost, candidates, blobs) for boost in boosts),
+    ]
+    return np.column_stack([np.asarray(column, dtype=float) for column in columns])
+
+
+def score_candidates(
+    candidates: Sequence[Mapping[str, Any]],
+    *,
+    search_intent: bool,
+    hint_tokens: Sequence[str],
+    weights: Optional[Sequence[float]] = None,
+    profile: Optional[SiteProfile] = None,
+) -> List[float]:
+    """
+    Score all candidates in one pass; returns scores in candidate order.
+    A site profile's boosts become extra indicator columns weighted by their score.
+    """
+    if not candidates:
+        return []
+    boosts = profile.boosts if profile else ()
+    weights = (tuple(weights) if weights is not None else resolve_weights()) + tuple(boost.score for boost in boosts)
+    matrix = feature_matrix(candidates, search_intent=search_intent, hint_tokens=hint_tokens, boosts=boosts)
+    return (matrix @ np.asarray(weights, dtype=float)).tolist()
@@ -0,0 +1,217 @@
+"""
+Site profiles: per-host locator heuristics kept out of PlaywrightTool.
+
+A profile is keyed by host suffixes (``"baidu.com"`` matches ``www.baidu.com``)
+and carries:
+- boosts: precompiled matchers that add to a semantic candidate's score
+- hooks: follow-up actions, e.g. click the submit button after Enter
+  in a search box whose form ignores the key press
+
+Built-in profiles are merged with an optional JSON file (SITE_PROFILES_PATH)
+shaped like::
+
+    {"profiles": [{"name": "my-app", "hosts": ["app.example.com"],
+                   "boosts": [{"field": "id", "equals": "search", "score": 40}],
+                   "hooks": [{"after": "press", "key": "Enter", "selector": "#search",
+                              "click": "#go", "hint": "search submit"}]}]}
+
+The file is re-read when its mtime changes (checked at most every
+SITE_PROFILES_RELOAD_INTERVAL seconds), so workers pick up edits without a
+restart. Lookups walk the host's suffixes through a dict and memoize per host.
+"""
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Pattern, Tuple
+from urllib.parse import urlsplit
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CANDIDATE_FIELDS = (
+    "selector", "tag", "type", "id", "name", "placeholder", "aria_label", "title", "class_name", "text", "role", "blob",
+)
+
+
+@dataclass(frozen=True)
+class CandidateBoost:
+    """
+    Adds ``score`` to candidates whose ``field`` equals / contains / matches a value.
+    ``"blob"`` is the candidate's lowercased text blob; matching is vectorized in semantic_scoring.
+    """
+
+    field: str
+    score: float
+    equals: Optional[str] = None
+    contains: Optional[str] = None
+    pattern: Optional[Pattern[str]] = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "CandidateBoost":
+        field = data.get("field", "blob")
+        if field not in CANDIDATE_FIELDS:
+            raise ValueError(f"unknown candidate field '{field}'")
+        if not any(data.get(key) for key in ("equals", "contains", "pattern")):
+            raise ValueError("boost needs one of equals / contains / pattern")
+        return cls(
+            field=field,
+            score=float(data.get("score", 0)),
+            equals=data.get("equals"),
+            contains=str(data["contains"]).lower() if data.get("contains") else None,
+            pattern=re.compile(data["pattern"], re.IGNORECASE) if data.get("pattern") else None,
+        )
+
+
+@dataclass(frozen=True)
+class PostActionHook:
+    """After ``after`` (with ``key``) on ``selector``, heal and click ``click``."""
+
+    after: str
+    selector: str
+    click: str
+    key: Optional[str] = None
+    hint: str = ""
+    delay_ms: int = 150
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "PostActionHook":
+        return cls(
+            after=data.get("after", "press"),
+            selector=data["selector"],
+            click=data["click"],
+            key=str(data["key"]).lower() if data.get("key") else None,
+            hint=data.get("hint", ""),
+            delay_ms=int(data.get("delay_ms", 150)),
+        )
+
+    def applies(self, action: str, selector: str, key: Optional[str] = None) -> bool:
+        if action != self.after or selector != self.selector:
+            return False
+        return self.key is None or str(key or "").strip().lower() == self.key
+
+
+@dataclass(frozen=True)
+class SiteProfile:
+    name: str
+    hosts: Tuple[str, ...]
+    boosts: Tuple[CandidateBoost, ...] = ()
+    hooks: Tuple[PostActionHook, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "SiteProfile":
+        return cls(
+            name=data["name"],
+            hosts=tuple(str(host).lower().lstrip(".") for host in data.get("hosts") or ()),
+            boosts=tuple(CandidateBoost.from_dict(boost) for boost in data.get("boosts") or ()),
+            hooks=tuple(PostActionHook.from_dict(hook) for hook in data.get("hooks") or ()),
+        )
+
+    def hooks_for(self, action: str, selector: str, key: Optional[str] = None) -> List[PostActionHook]:
+        return [hook for hook in self.hooks if hook.applies(action, selector, key)]
+
+
+BUILTIN_PROFILES: Tuple[Dict[str, Any], ...] = (
+    {
+        "name": "baidu",
+        "hosts": ["baidu.com", "baidu.cn"],
+        "boosts": [
+            {"field": "id", "equals": "chat-textarea", "score": 60},
+            {"field": "blob", "contains": "chat-input-textarea", "score": 24},
+            {"field": "id", "equals": "chat-submit-button", "score": 60},
+            {"field": "blob", "contains": "百度一下", "score": 30},
+        ],
+        "hooks": [
+            {
+                "after": "press",
+                "key": "Enter",
+                "selector": "#chat-textarea",
+                "click": "#chat-submit-button",
+                "hint": "搜索 提交 百度一下",
+            }
+        ],
+    },
+)
+
+
+def _host_suffixes(host: str) -> List[str]:
+    labels = host.split(".")
+    return [".".join(labels[index:]) for index in range(len(labels))]
+
+
+class SiteProfileRegistry:
+    """Host-suffix index of site profiles with mtime-based hot reload."""
+
+    def __init__(self, path: Optional[str] = None, reload_interval: Optional[float] = None):
+        self.path = path if path is not None else settings.SITE_PROFILES_PATH
+        self.reload_interval = (
+            reload_interval if reload_interval is not None else settings.SITE_PROFILES_RELOAD_INTERVAL
+        )
+        self._by_host: Dict[str, SiteProfile] = {}
+        self._memo: Dict[str, Optional[SiteProfile]] = {}
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._build(self._read_file())
+
+    def _read_file(self) -> List[Dict[str, Any]]:
+        if not self.path:
+            return []
+        try:
+            self._mtime = os.path.getmtime(self.path)
+            with open(self.path, "r", encoding="utf-8") as f:
+                return list(json.load(f).get("profiles") or [])
+        except FileNotFoundError:
+            self._mtime = None
+            return []
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Failed to load site profiles from {self.path}: {e}")
+            return []
+
+    def _build(self, file_profiles: List[Dict[str, Any]]) -> None:
+        by_host: Dict[str, SiteProfile] = {}
+        # File profiles come last so they can replace a built-in profile for the same host.
+        for data in (*BUILTIN_PROFILES, *file_profiles):
+            try:
+                profile = SiteProfile.from_dict(data)
+            except (AttributeError, KeyError, TypeError, ValueError, re.error) as e:
+                name = data.get("name", "?") if isinstance(data, Mapping) else "?"
+                logger.warning(f"Skipping invalid site profile {name}: {e}")
+                continue
+            for host in profile.hosts:
+                by_host[host] = profile
+        self._by_host = by_host
+        self._memo = {}
+
+    def _maybe_reload(self) -> None:
+        if not self.path:
+            return
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+        if mtime != self._mtime:
+            logger.info(f"Reloading site profiles from {self.path}")
+            self._build(self._read_file())
+
+    def lookup(self, url: Optional[str]) -> Optional[SiteProfile]:
+        """Profile for the most specific matching host suffix of ``url``, if any."""
+        self._maybe_reload()
+        host = (urlsplit(url or "").hostname or "").lower()
+        if not host:
+            return None
+        if host in self._memo:
+            return self._memo[host]
+        profile = next((self._by_host[suffix] for suffix in _host_suffixes(host) if suffix in self._by_host), None)
+        self._memo[host] = profile
+        return profile
+
+
+# Process-wide registry; PlaywrightTool looks profiles up per page URL.
+site_profiles = SiteProfileRegistry()
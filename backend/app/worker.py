@@ -3,48 +3,214 @@ Celery Worker 任务定义模块
 
 本模块定义了所有异步执行的 Celery 任务：
 1. run_test_case_task: 执行单个测试用例
-2. run_test_suite_task: 并发执行测试套件中的所有用例
+2. run_test_suite_task: 有界并发执行测试套件中的所有用例
+3. run_suite_shard_task / merge_suite_shards_task: 分布式执行套件
+   (chord 扇出到多个 worker，回调任务汇总 Allure 结果并生成一份报告)
 
 任务执行流程：
 - 接收来自 API 的任务请求
+- 协程提交到 worker 进程常驻的事件循环 (app/core/worker_runtime.py)
 - 在独立的数据库会话中执行测试
 - 生成 Allure 测试报告
 - 返回执行结果
 """
 import asyncio
-import nest_asyncio
+import os
+import shutil
+import time
+import uuid
+from typing import Any, Dict, List, Tuple
+
+from celery import chord, group
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
 from app.core.celery_app import celery_app
 from app.services.runner import TestRunner
-from app.services.report_service import ReportService
-from app.db.session import AsyncSessionLocal
+from app.services.report_service import ReportService, report_generator
+from app.db.session import AsyncSessionLocal, engine
+from app.core.worker_runtime import worker_runtime
+from app.services.ai_service import ai_service
+from app.core.config import settings
+from app.tools.browser_pool import browser_pool
+from app.tools.playwright_driver import playwright_driver
+from app.services.video_store import video_store
+from app.core.concurrency import ConcurrencyLimiter
+from app.services.shard_transport import get_result_transport
+from app.services.sharding import plan_shards, build_shard_report
+from app.services.progress import ProgressPublisher
+from app.services.artifact_store import enforce_result_budget, slim_case_result
+from app.services.execution_plan import load_case_plans
 
 # 初始化日志系统
 from app.core.logger import logger
 
-# 允许嵌套事件循环 - Celery worker 需要
-nest_asyncio.apply()
 
-@celery_app.task(acks_late=True)
-def run_test_case_task(case_id: int, headless: bool = True, browser_type: str = "chromium", executor_id: int = None):
+def _get_browser_pool():
+    """Return the worker's browser pool, or None when pooling is disabled."""
+    return browser_pool if settings.BROWSER_POOL_ENABLED else None
+
+
+async def _close_browser_pool():
+    if settings.BROWSER_POOL_ENABLED:
+        logger.info(f"Browser pool stats before shutdown: {browser_pool.stats()}")
+        await browser_pool.close()
+
+
+async def _dispose_db_engine():
+    await engine.dispose()
+
+
+# Hooks run in reverse registration order: videos, browsers, the Playwright driver,
+# pending reports (they still write to the DB), AI clients, then DB.
+worker_runtime.add_shutdown_hook(_dispose_db_engine)
+worker_runtime.add_shutdown_hook(ai_service.aclose)
+worker_runtime.add_shutdown_hook(report_generator.drain)
+worker_runtime.add_shutdown_hook(playwright_driver.close)
+worker_runtime.add_shutdown_hook(_close_browser_pool)
+worker_runtime.add_shutdown_hook(video_store.drain)
+
+
+@worker_process_init.connect
+def _init_worker_process(**kwargs):
+    # Connections inherited from the parent across fork must not be reused.
+    engine.sync_engine.dispose(close=False)
+    worker_runtime.start()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _shutdown_worker_process(**kwargs):
+    worker_runtime.stop()
+
+
+def _make_temp_results_dir(prefix: str) -> str:
+    """Create a unique temporary Allure results directory for one execution."""
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    temp_results_dir = os.path.join(base_dir, "temp_results", f"{prefix}_{uuid.uuid4()}")
+    os.makedirs(temp_results_dir, exist_ok=True)
+    return temp_results_dir
+
+
+def _cleanup_temp_dir(temp_results_dir: str) -> None:
+    if os.path.exists(temp_results_dir):
+        try:
+            shutil.rmtree(temp_results_dir, ignore_errors=True)
+            logger.info(f"Cleaned up temp results directory: {temp_results_dir}")
+        except Exception as e:
+            logger.warning(f"Failed to clean up temp dir {temp_results_dir}: {e}")
+
+
+def _build_limiter(max_concurrency: int = None, adaptive_concurrency: bool = None) -> ConcurrencyLimiter:
+    if adaptive_concurrency is None:
+        adaptive_concurrency = settings.SUITE_ADAPTIVE_CONCURRENCY
+    concurrency_limit = max_concurrency or settings.SUITE_MAX_CONCURRENCY
+    return ConcurrencyLimiter(
+        concurrency_limit,
+        adaptive=adaptive_concurrency,
+        max_limit=max(concurrency_limit, settings.SUITE_ADAPTIVE_MAX_CONCURRENCY) if adaptive_concurrency else None,
+        min_free_memory_mb=settings.SUITE_MIN_FREE_MEMORY_MB,
+        max_load_per_cpu=settings.SUITE_MAX_LOAD_PER_CPU,
+    )
+
+
+async def _run_suite_cases(
+    suite_id: int,
+    cases: List[Tuple[int, str]],
+    results_dir: str,
+    headless: bool,
+    browser_type: str,
+    limiter: ConcurrencyLimiter,
+    progress: ProgressPublisher = None,
+    har_mode: str = None,
+    screenshot_options: Dict[str, Any] = None,
+    video_mode: str = None,
+) -> List[Dict[str, Any]]:
+    """Run (case_id, case_name) pairs concurrently, bounded by the limiter."""
+    # Load every case, project and referenced element up front so the
+    # per-case runners do not query them again.
+    async with AsyncSessionLocal() as db:
+        plans = await load_case_plans(db, [case_id for case_id, _ in cases])
+
+    async def run_single_case(case_id: int, case_name: str):
+        """Run a single test case in its own DB session"""
+        async with limiter, AsyncSessionLocal() as db:
+            # All cases share the results dir; the runner writes UUID-based filenames,
+            # so concurrent Allure result files do not collide.
+            runner = TestRunner(
+                db,
+                results_dir=results_dir,
+                browser_pool=_get_browser_pool(),
+                progress=progress,
+                har_mode=har_mode,
+                screenshot_options=screenshot_options,
+                video_mode=video_mode,
+            )
+            try:
+                logger.info(f"Running test case {case_id} ({case_name}) in suite {suite_id}")
+                plan = plans.get(case_id)
+                if plan is None:
+                    raise ValueError("Test case not found")
+                result = await runner.run_test_case(
+                    case_id, headless=headless, browser_type=browser_type, plan=plan
+                )
+                return {
+                    "case_id": case_id,
+                    "case_name": case_name,
+                    "result": slim_case_result(result),
+                    "success": result.get("success", False),
+                    "error": result.get("error")
+                }
+            except Exception as e:
+                logger.error(f"Failed to run test case {case_id}: {e}")
+                return {
+                    "case_id": case_id,
+                    "case_name": case_name,
+                    "result": None,
+                    "success": False,
+                    "error": str(e)
+                }
+
+    results = await asyncio.gather(*[run_single_case(case_id, case_name) for case_id, case_name in cases])
+    logger.info(f"Suite {suite_id} concurrency stats: {limiter.stats()}")
+    return list(results)
+
+@celery_app.task(bind=True, acks_late=True)
+def run_test_case_task(
+    self,
+    case_id: int,
+    headless: bool = True,
+    browser_type: str = "chromium",
+    executor_id: int = None,
+    har_mode: str = None,
+    screenshot_options: Dict[str, Any] = None,
+    video_mode: str = None,
+):
     """
     执行单个测试用例的 Celery 任务
+
+    执行进度以任务 ID 为 run_id 推送到 Redis，见 app/services/progress.py。
     """
-    import tempfile
-    import shutil
-    import uuid
-    import os
-    
     logger.info(f"Starting test case execution for case_id={case_id}, headless={headless}, browser={browser_type}, executor={executor_id}")
     
     # Create a unique temporary directory for this execution
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    temp_results_dir = os.path.join(base_dir, "temp_results", f"case_{case_id}_{uuid.uuid4()}")
-    os.makedirs(temp_results_dir, exist_ok=True)
+    temp_results_dir = _make_temp_results_dir(f"case_{case_id}")
+    # Once ReportService returned it owns the results dir and removes it after generation
+    results_handed_off = False
     
+    progress = ProgressPublisher(self.request.id)
+
     async def _run():
+        nonlocal results_handed_off
         async with AsyncSessionLocal() as db:
             # Initialize with temp results dir
-            runner = TestRunner(db, results_dir=temp_results_dir)
+            runner = TestRunner(
+                db,
+                results_dir=temp_results_dir,
+                browser_pool=_get_browser_pool(),
+                progress=progress,
+                har_mode=har_mode,
+                screenshot_options=screenshot_options,
+                video_mode=video_mode,
+            )
             
             result = await runner.run_test_case(case_id, headless=headless, browser_type=browser_type, executor_id=executor_id)
             logger.info(f"Test case {case_id} completed. Success: {result.get('success')}")
@@ -62,77 +228,60 @@ def run_test_case_task(case_id: int, headless: bool = True, browser_type: str =
                     status=status,
                     error_message=error_msg,
                     executor_id=executor_id,
-                    results_dir=temp_results_dir  # Pass temp dir
+                    results_dir=temp_results_dir,  # Pass temp dir
+                    cleanup_results_dir=True,
                 )
-                logger.info(f"Report generated: {report.report_path}")
+                results_handed_off = True
+                logger.info(f"Report {report.report_status}: {report.report_path}")
                 result['report_id'] = report.id
                 result['report_path'] = report.report_path
+                result['report_status'] = report.report_status
             except Exception as e:
                 logger.error(f"Failed to generate report: {e}", exc_info=True)
                 result['report_error'] = str(e)
             
+            await progress.run_finished(result.get("success", False), report_id=result.get("report_id"))
             return result
     
     try:
-        result = asyncio.run(_run())
-        return result
+        result = worker_runtime.run(_run())
+        return enforce_result_budget(result, settings.RESULT_MAX_BYTES)
     except Exception as e:
         logger.error(f"Test case {case_id} failed with error: {e}", exc_info=True)
         raise
     finally:
         # cleanup temp directory
-        if os.path.exists(temp_results_dir):
-            try:
-                shutil.rmtree(temp_results_dir, ignore_errors=True)
-                logger.info(f"Cleaned up temp results directory: {temp_results_dir}")
-            except Exception as e:
-                logger.warning(f"Failed to clean up temp dir {temp_results_dir}: {e}")
+        if not results_handed_off:
+            _cleanup_temp_dir(temp_results_dir)
 
-@celery_app.task(acks_late=True)
-def run_test_suite_task(suite_id: int, headless: bool = True, browser_type: str = "chromium", executor_id: int = None):
+@celery_app.task(bind=True, acks_late=True)
+def run_test_suite_task(
+    self,
+    suite_id: int,
+    headless: bool = True,
+    browser_type: str = "chromium",
+    executor_id: int = None,
+    max_concurrency: int = None,
+    adaptive_concurrency: bool = None,
+    har_mode: str = None,
+    screenshot_options: Dict[str, Any] = None,
+    video_mode: str = None,
+):
     """
     并发执行测试套件中所有用例的 Celery 任务
+
+    同时执行的用例数受 max_concurrency 限制（默认取配置），
+    adaptive_concurrency 为 True 时根据主机内存和负载动态调整。
     """
-    import tempfile
-    import shutil
-    import uuid
-    import os
-    
     logger.info(f"Starting test suite execution for suite_id={suite_id}, headless={headless}, browser={browser_type}, executor={executor_id}")
     
     # Create a unique temporary directory for this suite execution
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    temp_results_dir = os.path.join(base_dir, "temp_results", f"suite_{suite_id}_{uuid.uuid4()}")
-    os.makedirs(temp_results_dir, exist_ok=True)
-    
-    async def run_single_case(case_id: int, case_name: str):
-        """Run a single test case in its own DB session"""
-        async with AsyncSessionLocal() as db:
-            # Initialize with same temp results dir (assuming suite results should be aggregated)
-            # Actually, concurrent writes to same dir might be an issue for some tools, but Allure handles multiple json files fine.
-            # Runner generates UUID-based filenames, so it should be safe.
-            runner = TestRunner(db, results_dir=temp_results_dir)
-            try:
-                logger.info(f"Running test case {case_id} ({case_name}) in suite {suite_id}")
-                result = await runner.run_test_case(case_id, headless=headless, browser_type=browser_type)
-                return {
-                    "case_id": case_id,
-                    "case_name": case_name,
-                    "result": result,
-                    "success": result.get("success", False),
-                    "error": result.get("error")
-                }
-            except Exception as e:
-                logger.error(f"Failed to run test case {case_id}: {e}")
-                return {
-                    "case_id": case_id,
-                    "case_name": case_name,
-                    "result": None,
-                    "success": False,
-                    "error": str(e)
-                }
+    temp_results_dir = _make_temp_results_dir(f"suite_{suite_id}")
+    results_handed_off = False
+    progress = ProgressPublisher(self.request.id)
 
     async def _run():
+        nonlocal results_handed_off
         async with AsyncSessionLocal() as db:
             # Fetch suite and its test cases
             from app.services.suite_service import suite_service
@@ -144,12 +293,22 @@ def run_test_suite_task(suite_id: int, headless: bool = True, browser_type: str
                 return {"success": False, "error": "Test suite has no test cases"}
             
             suite_name = suite.name
-            test_cases = suite.test_cases
+            cases = [(tc.id, tc.name) for tc in suite.test_cases]
             
-        # Run test cases in parallel
         # Note: We use separate sessions for each case, so we don't need the main db session here
-        tasks = [run_single_case(tc.id, tc.name) for tc in test_cases]
-        results = await asyncio.gather(*tasks)
+        limiter = _build_limiter(max_concurrency, adaptive_concurrency)
+        results = await _run_suite_cases(
+            suite_id,
+            cases,
+            temp_results_dir,
+            headless,
+            browser_type,
+            limiter,
+            progress,
+            har_mode,
+            screenshot_options,
+            video_mode,
+        )
         
         success_count = sum(1 for r in results if r["success"])
         failure_count = len(results) - success_count
@@ -167,9 +326,12 @@ def run_test_suite_task(suite_id: int, headless: bool = True, browser_type: str
                     status=overall_status,
                     executor_id=executor_id,
                     report_name=suite_name,  # Use suite name for report folder
-                    results_dir=temp_results_dir # Pass temp dir
+                    results_dir=temp_results_dir,  # Pass temp dir
+                    cleanup_results_dir=True,
                 )
-                logger.info(f"Suite report generated: {report.report_path}")
+                results_handed_off = True
+                logger.info(f"Suite report {report.report_status}: {report.report_path}")
+                await progress.run_finished(failure_count == 0, passed=success_count, failed=failure_count, report_id=report.id)
                 
                 return {
                     "success": True,
@@ -178,11 +340,14 @@ def run_test_suite_task(suite_id: int, headless: bool = True, browser_type: str
                     "passed": success_count,
                     "failed": failure_count,
                     "results": results,
+                    "concurrency": limiter.stats(),
                     "report_id": report.id,
-                    "report_path": report.report_path
+                    "report_path": report.report_path,
+                    "report_status": report.report_status,
                 }
             except Exception as e:
                 logger.error(f"Failed to generate suite report: {e}", exc_info=True)
+                await progress.run_finished(False, passed=success_count, failed=failure_count)
                 return {
                     "success": False, 
                     "error": f"Tests finished but report generation failed: {e}",
@@ -190,16 +355,254 @@ def run_test_suite_task(suite_id: int, headless: bool = True, browser_type: str
                 }
 
     try:
-        result = asyncio.run(_run())
-        return result
+        result = worker_runtime.run(_run())
+        return enforce_result_budget(result, settings.RESULT_MAX_BYTES)
     except Exception as e:
         logger.error(f"Test suite {suite_id} failed with error: {e}", exc_info=True)
         raise
     finally:
         # cleanup
-        if os.path.exists(temp_results_dir):
-            try:
-                shutil.rmtree(temp_results_dir, ignore_errors=True)
-                logger.info(f"Cleaned up temp results directory: {temp_results_dir}")
-            except Exception as e:
-                logger.warning(f"Failed to clean up temp dir {temp_results_dir}: {e}")
+        if not results_handed_off:
+            _cleanup_temp_dir(temp_results_dir)
+
+
+def dispatch_distributed_suite(
+    suite_id: int,
+    suite_name: str,
+    cases: List[Tuple[int, str]],
+    headless: bool = True,
+    browser_type: str = "chromium",
+    executor_id: int = None,
+    shard_count: int = None,
+    max_concurrency: int = None,
+    adaptive_concurrency: bool = None,
+    estimates: Dict[int, int] = None,
+    har_mode: str = None,
+    screenshot_options: Dict[str, Any] = None,
+    video_mode: str = None,
+):
+    """
+    Fan a suite out across the Celery cluster.
+
+    Cases are packed into shards by estimated duration (see
+    app.services.sharding). Each shard runs as its own run_suite_shard_task;
+    merge_suite_shards_task is the chord callback that merges the shards'
+    Allure results and generates a single report. Returns the AsyncResult of
+    the callback.
+    """
+    shards = plan_shards(cases, estimates or {}, shard_count or settings.SUITE_SHARD_COUNT)
+    # The callback's task ID doubles as the progress run_id, so it is known before dispatch
+    run_id = str(uuid.uuid4())
+    header = group(
+        run_suite_shard_task.s(
+            suite_id,
+            index,
+            [list(case) for case in shard["cases"]],
+            headless,
+            browser_type,
+            max_concurrency=max_concurrency,
+            adaptive_concurrency=adaptive_concurrency,
+            predicted_ms=shard["predicted_ms"],
+            run_id=run_id,
+            har_mode=har_mode,
+            screenshot_options=screenshot_options,
+            video_mode=video_mode,
+        )
+        for index, shard in enumerate(shards)
+    )
+    callback = merge_suite_shards_task.s(
+        suite_id=suite_id,
+        suite_name=suite_name,
+        headless=headless,
+        browser_type=browser_type,
+        executor_id=executor_id,
+    ).set(task_id=run_id)
+    logger.info(
+        f"Dispatching suite {suite_id} as {len(shards)} shard(s) over {len(cases)} case(s), "
+        f"predicted ms per shard: {[shard['predicted_ms'] for shard in shards]}"
+    )
+    return chord(header)(callback)
+
+
+@celery_app.task(bind=True, acks_late=True)
+def run_suite_shard_task(
+    self,
+    suite_id: int,
+    shard_index: int,
+    cases: List[List[Any]],
+    headless: bool = True,
+    browser_type: str = "chromium",
+    max_concurrency: int = None,
+    adaptive_concurrency: bool = None,
+    predicted_ms: int = None,
+    run_id: str = None,
+    har_mode: str = None,
+    screenshot_options: Dict[str, Any] = None,
+    video_mode: str = None,
+):
+    """
+    执行分布式套件中的一个分片
+
+    返回分片内每个用例的结果，以及通过结果传输打包的 Allure 结果文件。
+    任何异常都转换为失败结果返回，避免单个分片失败导致整个 chord 失败。
+    """
+    logger.info(f"Starting shard {shard_index} of suite {suite_id} with {len(cases)} case(s)")
+    temp_results_dir = _make_temp_results_dir(f"suite_{suite_id}_shard_{shard_index}")
+    started = time.monotonic()
+
+    progress = ProgressPublisher(run_id or self.request.id)
+
+    async def _run():
+        limiter = _build_limiter(max_concurrency, adaptive_concurrency)
+        return await _run_suite_cases(
+            suite_id,
+            [(case_id, case_name) for case_id, case_name in cases],
+            temp_results_dir,
+            headless,
+            browser_type,
+            limiter,
+            progress,
+            har_mode,
+            screenshot_options,
+            video_mode,
+        )
+
+    try:
+        try:
+            results = worker_runtime.run(_run())
+        except Exception as e:
+            logger.error(f"Shard {shard_index} of suite {suite_id} failed: {e}", exc_info=True)
+            results = [
+                {"case_id": case_id, "case_name": case_name, "result": None, "success": False, "error": str(e)}
+                for case_id, case_name in cases
+            ]
+        passed = sum(1 for r in results if r["success"])
+        # Counted before the budget, which may drop the per-case results list
+        output = enforce_result_budget({
+            "shard_index": shard_index,
+            "worker": self.request.hostname,
+            "predicted_ms": predicted_ms,
+            "duration_ms": int((time.monotonic() - started) * 1000),
+            "total": len(results),
+            "passed": passed,
+            "failed": len(results) - passed,
+            "results": results,
+        }, settings.RESULT_MAX_BYTES)
+        # Attached after the budget so truncation never corrupts the archive reference
+        output["allure_results"] = get_result_transport().send(temp_results_dir)
+        return output
+    finally:
+        _cleanup_temp_dir(temp_results_dir)
+
+
+@celery_app.task(bind=True, acks_late=True)
+def merge_suite_shards_task(
+    self,
+    shard_outputs: List[Dict[str, Any]],
+    suite_id: int,
+    suite_name: str,
+    headless: bool = True,
+    browser_type: str = "chromium",
+    executor_id: int = None,
+):
+    """
+    分布式套件的 chord 回调任务
+
+    汇总所有分片的 Allure 结果到同一目录，只生成一次套件报告。
+    """
+    temp_results_dir = _make_temp_results_dir(f"suite_{suite_id}_merged")
+    results_handed_off = False
+    progress = ProgressPublisher(self.request.id)
+    results: List[Dict[str, Any]] = []
+    shards: List[Dict[str, Any]] = []
+    success_count = failure_count = 0
+    incomplete = False
+
+    try:
+        for output in sorted(shard_outputs, key=lambda item: item.get("shard_index", 0)):
+            shard_results = output.get("results") or []
+            if not isinstance(shard_results, list):
+                logger.warning(f"Case results of shard {output.get('shard_index')} were dropped to fit the result budget")
+                shard_results = []
+            results.extend(shard_results)
+            # Prefer the shard's own counters: they survive the result budget dropping the list
+            if isinstance(output.get("passed"), int) and isinstance(output.get("failed"), int):
+                shard_passed, shard_failed = output["passed"], output["failed"]
+            elif isinstance(output.get("results"), list):
+                shard_passed = sum(1 for r in shard_results if r["success"])
+                shard_failed = len(shard_results) - shard_passed
+            else:
+                logger.warning(f"Shard {output.get('shard_index')} reported no case counts, marking the suite failed")
+                shard_passed = shard_failed = 0
+                incomplete = True
+            success_count += shard_passed
+            failure_count += shard_failed
+            payload = output.get("allure_results")
+            file_count = 0
+            if payload:
+                try:
+                    file_count = get_result_transport(payload.get("transport")).receive(payload, temp_results_dir)
+                except Exception as e:
+                    logger.error(f"Failed to receive results of shard {output.get('shard_index')}: {e}")
+            shards.append({
+                "shard_index": output.get("shard_index"),
+                "worker": output.get("worker"),
+                "cases": shard_passed + shard_failed,
+                "predicted_ms": output.get("predicted_ms"),
+                "duration_ms": output.get("duration_ms"),
+                "result_files": file_count,
+            })
+
+        suite_passed = failure_count == 0 and not incomplete
+        shard_report = build_shard_report(shards)
+        logger.info(f"Suite {suite_id} shard timing (predicted vs actual): {shard_report}")
+
+        async def _run():
+            nonlocal results_handed_off
+            async with AsyncSessionLocal() as db:
+                report_service = ReportService(db)
+                report = await report_service.generate_allure_report(
+                    test_suite_id=suite_id,
+                    browser_type=browser_type,
+                    headless=headless,
+                    status="success" if suite_passed else "failure",
+                    executor_id=executor_id,
+                    report_name=suite_name,
+                    results_dir=temp_results_dir,
+                    cleanup_results_dir=True,
+                )
+                results_handed_off = True
+                return report
+
+        try:
+            report = worker_runtime.run(_run())
+            logger.info(f"Distributed suite report {report.report_status}: {report.report_path}")
+            worker_runtime.run(progress.run_finished(
+                suite_passed, passed=success_count, failed=failure_count, report_id=report.id
+            ))
+        except Exception as e:
+            logger.error(f"Failed to generate distributed suite report: {e}", exc_info=True)
+            worker_runtime.run(progress.run_finished(False, passed=success_count, failed=failure_count))
+            return enforce_result_budget({
+                "success": False,
+                "error": f"Tests finished but report generation failed: {e}",
+                "results": results,
+                "shard_report": shard_report,
+            }, settings.RESULT_MAX_BYTES)
+
+        return enforce_result_budget({
+            "success": True,
+            "suite_id": suite_id,
+            "total_cases": success_count + failure_count,
+            "passed": success_count,
+            "failed": failure_count,
+            "incomplete": incomplete,
+            "results": results,
+            "shard_report": shard_report,
+            "report_id": report.id,
+            "report_path": report.report_path,
+            "report_status": report.report_status,
+        }, settings.RESULT_MAX_BYTES)
+    finally:
+        if not results_handed_off:
+            _cleanup_temp_dir(temp_results_dir)
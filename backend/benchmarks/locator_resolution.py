@@ -0,0 +1,117 @@
+"""
+Microbenchmark: protocol round-trips and wall time per locator resolution.
+
+Compares the previous polling resolver (count() + sequential nth(i).is_visible()
+every 200ms) with PlaywrightTool._get_preferred_locator, which waits for a single
+combined locator inside the browser.
+
+Usage (from backend/, needs an installed Playwright browser):
+    python -m benchmarks.locator_resolution [--duplicates 9] [--delay-ms 300] [--runs 20]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Callable, List
+
+from playwright._impl._connection import Channel
+
+from app.tools.playwright_tool import PlaywrightTool
+
+
+class RoundTripCounter:
+    """Counts request/response messages sent to the Playwright driver."""
+
+    def __init__(self):
+        self.count = 0
+        self._original = Channel.send
+
+    def __enter__(self):
+        counter = self
+        original = self._original
+
+        async def send(channel, *args, **kwargs):
+            counter.count += 1
+            return await original(channel, *args, **kwargs)
+
+        Channel.send = send
+        return self
+
+    def __exit__(self, *exc):
+        Channel.send = self._original
+
+
+async def legacy_resolve(tool: PlaywrightTool, selector: str, timeout: int = 10000, max_candidates: int = 10):
+    """The resolver as it was before the single-wait rewrite."""
+    candidates = [selector]
+    stripped = tool._strip_visible_pseudo(selector)
+    if stripped and stripped != selector:
+        candidates.append(stripped)
+    deadline = time.monotonic() + timeout / 1000
+    while time.monotonic() < deadline:
+        for candidate in candidates:
+            locator = tool.page.locator(candidate)
+            count = await locator.count()
+            for idx in range(min(count, max_candidates)):
+                item = locator.nth(idx)
+                if await item.is_visible():
+                    return item
+        await asyncio.sleep(0.2)
+    raise TimeoutError(selector)
+
+
+def build_page(duplicates: int, delay_ms: int) -> str:
+    """Hidden duplicates first; the visible target is appended after ``delay_ms``."""
+    hidden = "".join(f'<button class="target" style="display:none">hidden {i}</button>' for i in range(duplicates))
+    return f"""
+    <html><body>{hidden}
+    <script>
+      setTimeout(() => {{
+        const button = document.createElement('button');
+        button.className = 'target';
+        button.textContent = 'visible';
+        document.body.appendChild(button);
+      }}, {delay_ms});
+    </script></body></html>
+    """
+
+
+async def measure(tool: PlaywrightTool, html: str, resolve: Callable, runs: int) -> List[tuple]:
+    samples = []
+    for _ in range(runs):
+        await tool.page.set_content(html)
+        with RoundTripCounter() as counter:
+            started = time.perf_counter()
+            await resolve()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        samples.append((counter.count, elapsed_ms))
+    return samples
+
+
+def report(name: str, samples: List[tuple]) -> None:
+    trips = [sample[0] for sample in samples]
+    times = [sample[1] for sample in samples]
+    print(
+        f"{name:<10} round-trips: median={statistics.median(trips):>5.1f} max={max(trips):>4}   "
+        f"time: median={statistics.median(times):>7.1f}ms max={max(times):>7.1f}ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duplicates", type=int, default=9, help="hidden matches before the visible one")
+    parser.add_argument("--delay-ms", type=int, default=300, help="delay before the visible match appears")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    selector = "button.target"
+    async with PlaywrightTool(headless=True) as tool:
+        for delay in (0, args.delay_ms):
+            html = build_page(args.duplicates, delay)
+            print(f"\n{args.duplicates} hidden duplicates, visible match after {delay}ms, {args.runs} runs")
+            report("legacy", await measure(tool, html, lambda: legacy_resolve(tool, selector), args.runs))
+            report("combined", await measure(tool, html, lambda: tool._get_preferred_locator(selector), args.runs))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
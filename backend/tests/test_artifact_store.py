@@ -0,0 +1,87 @@
+import json
+
+from app.api import deps
+from app.api.v1.endpoints import execution
+from app.services.artifact_store import ArtifactStore, enforce_result_budget, slim_case_result
+
+
+def size_of(payload):
+    return len(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def test_put_is_content_addressed_and_resolvable(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+
+    first = store.put(b"png-bytes")
+    second = store.put(b"png-bytes")
+
+    assert first == second
+    assert first["url"].endswith(first["artifact"])
+    path = store.resolve(first["artifact"])
+    assert open(path, "rb").read() == b"png-bytes"
+    assert len(list(tmp_path.rglob("*.png"))) == 1
+
+
+def test_resolve_rejects_unknown_and_malformed_names(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+
+    assert store.resolve("0" * 64 + ".png") is None
+    assert store.resolve("../../etc/passwd") is None
+    assert store.resolve(None) is None
+
+
+def test_slim_case_result_keeps_the_summary_and_the_first_failed_step():
+    result = {
+        "success": False,
+        "error": "boom",
+        "steps": [{"success": True, "log": "x" * 100}, {"success": False}, {"success": False}],
+        "context": {"token": "secret"},
+        "screenshot": {"artifact": "a.png"},
+    }
+
+    slim = slim_case_result(result)
+
+    assert slim["step_count"] == 3
+    assert slim["failed_step"] == 1
+    assert slim["screenshot"] == {"artifact": "a.png"}
+    assert "steps" not in slim and "context" not in slim
+    assert slim_case_result(None) is None
+
+
+def test_results_within_budget_are_returned_unchanged():
+    payload = {"success": True, "steps": [{"success": True}]}
+
+    assert enforce_result_budget(payload, 10_000) is payload
+
+
+def test_budget_drops_the_cheapest_information_first():
+    payload = {
+        "success": False,
+        "error": "e" * 5000,
+        "context": {"variables": {"k": "v" * 100}},
+        "steps": [{"success": True, "log": "s" * 50} for _ in range(20)],
+    }
+
+    reduced = enforce_result_budget(payload, 2500)
+
+    assert size_of(reduced) <= 2500
+    assert reduced["truncated"] is True
+    assert reduced["original_size"] == size_of(payload)
+    assert reduced["context"] == {"dropped": True}
+    assert isinstance(reduced["steps"], list)
+    assert reduced["error"].startswith("e" * 200 + "...[truncated")
+
+
+def test_budget_drops_nested_results_as_a_last_resort():
+    payload = {"success": True, "results": [{"case_id": index, "success": True} for index in range(500)]}
+
+    reduced = enforce_result_budget(payload, 500)
+
+    assert reduced["results"] == {"dropped": True, "count": 500}
+    assert reduced["success"] is True
+
+
+def test_artifact_download_requires_the_current_user():
+    route = next(route for route in execution.router.routes if route.path == "/artifacts/{name}")
+
+    assert deps.get_current_user in [dependency.call for dependency in route.dependant.dependencies]
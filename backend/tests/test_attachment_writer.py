@@ -0,0 +1,102 @@
+import asyncio
+import io
+import threading
+
+import pytest
+
+import app.services.attachment_writer as attachment_writer
+from app.services.attachment_writer import AttachmentWriter
+
+
+def test_writes_happen_in_the_background_and_close_waits_for_them(tmp_path, monkeypatch):
+    release = threading.Event()
+    write_file = attachment_writer._write_file
+
+    def slow_write(path, data):
+        release.wait(5)
+        write_file(path, data)
+
+    monkeypatch.setattr(attachment_writer, "_write_file", slow_write)
+    writer = AttachmentWriter(queue_size=4, workers=1)
+    path = tmp_path / "a.png"
+
+    async def run():
+        await writer.submit(str(path), b"png")
+        # The step loop continues while the write is still pending.
+        assert not path.exists()
+        release.set()
+        await writer.close()
+
+    asyncio.run(run())
+
+    assert path.read_bytes() == b"png"
+    assert writer.written == 1
+
+
+def test_a_full_queue_makes_submit_wait(tmp_path, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(attachment_writer, "_write_file", lambda path, data: release.wait(5))
+    writer = AttachmentWriter(queue_size=1, workers=1)
+
+    async def run():
+        await writer.submit(str(tmp_path / "1"), b"1")  # taken by the worker
+        await asyncio.sleep(0.05)
+        await writer.submit(str(tmp_path / "2"), b"2")  # fills the queue
+        blocked = asyncio.ensure_future(writer.submit(str(tmp_path / "3"), b"3"))
+        await asyncio.sleep(0.05)
+        was_blocked = not blocked.done()
+        release.set()
+        await blocked
+        await writer.close()
+        return was_blocked
+
+    assert asyncio.run(run()) is True
+    assert writer.written == 3
+
+
+def png(shade):
+    Image = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    image = Image.new("L", (64, 32), color=0)
+    for x in range(32):
+        for y in range(32):
+            image.putpixel((x, y), shade)
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def submit_all(tmp_path, items):
+    writer = AttachmentWriter(near_duplicate_distance=4)
+
+    async def run():
+        sources = [await writer.submit_content(str(tmp_path), data, "png", exact_only=exact) for data, exact in items]
+        await writer.close()
+        return sources
+
+    return writer, asyncio.run(run())
+
+
+def test_exact_duplicates_are_written_once(tmp_path):
+    data = png(200)
+    writer, sources = submit_all(tmp_path, [(data, False), (data, True)])
+
+    assert sources[0][0] == sources[1][0]
+    assert sources[1][1] is True
+    assert writer.stats()["exact_duplicates"] == 1
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_near_duplicates_reuse_the_earlier_image(tmp_path):
+    writer, sources = submit_all(tmp_path, [(png(200), False), (png(201), False)])
+
+    assert sources[1] == (sources[0][0], True)
+    assert writer.near_duplicates == 1
+
+
+def test_failure_captures_are_never_replaced_by_a_similar_image(tmp_path):
+    writer, sources = submit_all(tmp_path, [(png(200), False), (png(201), True)])
+
+    assert sources[1][0] != sources[0][0]
+    assert sources[1][1] is False
+    assert writer.near_duplicates == 0
+    assert len(list(tmp_path.iterdir())) == 2
@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+import pytest
+
+from app.tools.browser_pool import BrowserPool, PooledBrowser
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **options):
+        return FakeContext()
+
+    async def close(self):
+        self.closed = True
+
+
+def make_pool(**limits):
+    pool = BrowserPool(**limits)
+    pool.launched = []
+
+    async def fake_launch(key):
+        entry = PooledBrowser(key=key, browser=FakeBrowser(), launched_at=time.monotonic())
+        pool.launched.append(entry)
+        return entry
+
+    pool._launch = fake_launch
+    return pool
+
+
+def test_cases_reuse_a_warm_browser_with_a_fresh_context():
+    pool = make_pool()
+
+    async def run():
+        first_entry, first_context = await pool.acquire("chromium", True)
+        await pool.release(first_entry, first_context)
+        second_entry, second_context = await pool.acquire("chromium", True)
+        return first_entry, first_context, second_entry, second_context
+
+    first_entry, first_context, second_entry, second_context = asyncio.run(run())
+
+    assert first_entry is second_entry
+    assert len(pool.launched) == 1
+    assert first_context.closed and first_context is not second_context
+
+
+def test_browsers_are_keyed_by_type_and_headless_mode():
+    pool = make_pool()
+
+    async def run():
+        await pool.acquire("chromium", True)
+        await pool.acquire("chromium", False)
+        await pool.acquire("firefox", True)
+
+    asyncio.run(run())
+
+    assert sorted(entry.key for entry in pool.launched) == [("chromium", False), ("chromium", True), ("firefox", True)]
+
+
+def test_context_cap_spreads_load_and_then_waits_for_a_free_slot():
+    pool = make_pool(max_contexts_per_browser=1, max_browsers_per_key=2)
+
+    async def run():
+        first = await pool.acquire()
+        second = await pool.acquire()
+        waiting = asyncio.ensure_future(pool.acquire())
+        await asyncio.sleep(0.01)
+        blocked = not waiting.done()
+        await pool.release(*first)
+        third = await asyncio.wait_for(waiting, 1)
+        return first, second, third, blocked
+
+    first, second, third, blocked = asyncio.run(run())
+
+    assert first[0] is not second[0]
+    assert blocked
+    assert third[0] is first[0]
+
+
+def test_worn_browsers_are_retired_and_closed_after_their_last_context():
+    pool = make_pool(max_uses_per_browser=2)
+
+    async def run():
+        first = await pool.acquire()
+        second = await pool.acquire()
+        await pool.release(*first)
+        closed_early = second[0].browser.closed
+        await pool.release(*second)
+        third = await pool.acquire()
+        return second, third, closed_early
+
+    second, third, closed_early = asyncio.run(run())
+
+    assert not closed_early
+    assert second[0].browser.closed
+    assert third[0] is not second[0]
+    assert len(pool.launched) == 2
+
+
+def test_disconnected_browsers_are_replaced_on_checkout():
+    pool = make_pool()
+
+    async def run():
+        entry, context = await pool.acquire()
+        await pool.release(entry, context)
+        entry.browser.connected = False
+        replacement, _ = await pool.acquire()
+        return entry, replacement
+
+    crashed, replacement = asyncio.run(run())
+
+    assert replacement is not crashed
+    assert len(pool.launched) == 2
+
+
+def test_failed_context_creation_returns_the_slot():
+    pool = make_pool(max_contexts_per_browser=1, max_browsers_per_key=1)
+
+    async def run():
+        entry, context = await pool.acquire()
+        await pool.release(entry, context)
+
+        async def broken_new_context(**options):
+            raise RuntimeError("context limit")
+
+        entry.browser.new_context = broken_new_context
+        with pytest.raises(RuntimeError):
+            await pool.acquire()
+        return entry
+
+    entry = asyncio.run(run())
+
+    assert entry.active_contexts == 0
@@ -0,0 +1,29 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.services import runner as runner_module
+
+
+class FailingSession:
+    def __init__(self):
+        self.added = []
+        self.rolled_back = False
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def commit(self):
+        raise RuntimeError("timing table unavailable")
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+def test_failed_timing_write_rolls_the_session_back():
+    session = FailingSession()
+    runner = SimpleNamespace(db=session)
+
+    asyncio.run(runner_module.TestRunner._write_case_timing(runner, case_id=1, duration_ms=10, status="success"))
+
+    assert len(session.added) == 1
+    assert session.rolled_back
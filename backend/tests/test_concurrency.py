@@ -0,0 +1,72 @@
+import asyncio
+
+import app.core.concurrency as concurrency
+from app.core.concurrency import ConcurrencyLimiter
+
+
+def test_fixed_limit_caps_cases_in_flight():
+    limiter = ConcurrencyLimiter(3)
+
+    async def case():
+        async with limiter:
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(case() for _ in range(10)))
+
+    asyncio.run(run())
+
+    assert limiter.peak_in_flight == 3
+    assert limiter.in_flight == 0
+
+
+def host(monkeypatch, free_mb, load):
+    monkeypatch.setattr(concurrency, "read_free_memory_mb", lambda: free_mb)
+    monkeypatch.setattr(concurrency, "read_load_per_cpu", lambda: load)
+
+
+def test_adaptive_limit_shrinks_under_memory_pressure_but_not_below_the_minimum(monkeypatch):
+    host(monkeypatch, free_mb=200, load=0.1)
+    limiter = ConcurrencyLimiter(3, adaptive=True, min_limit=2, min_free_memory_mb=1024, sample_interval=0)
+
+    for _ in range(5):
+        limiter._adjust()
+
+    assert limiter.limit == 2
+
+
+def test_adaptive_limit_shrinks_under_cpu_load(monkeypatch):
+    host(monkeypatch, free_mb=None, load=3.0)
+    limiter = ConcurrencyLimiter(4, adaptive=True, max_load_per_cpu=1.5, sample_interval=0)
+
+    limiter._adjust()
+
+    assert limiter.limit == 3
+
+
+def test_adaptive_limit_grows_only_when_saturated_with_headroom(monkeypatch):
+    host(monkeypatch, free_mb=8192, load=0.1)
+    limiter = ConcurrencyLimiter(2, adaptive=True, max_limit=4, sample_interval=0)
+
+    limiter._adjust()
+    assert limiter.limit == 2
+
+    limiter.in_flight = 2
+    limiter._adjust()
+    limiter.in_flight = 3
+    limiter._adjust()
+    limiter.in_flight = 4
+    limiter._adjust()
+
+    assert limiter.limit == 4
+    assert limiter.stats()["max_limit"] == 4
+
+
+def test_samples_are_throttled(monkeypatch):
+    host(monkeypatch, free_mb=200, load=0.1)
+    limiter = ConcurrencyLimiter(4, adaptive=True, sample_interval=60)
+
+    limiter._adjust()
+    limiter._adjust()
+
+    assert limiter.limit == 3
@@ -0,0 +1,138 @@
+import asyncio
+from types import SimpleNamespace
+
+import app.worker as worker
+
+
+def _dispatch(monkeypatch, **kwargs):
+    captured = {}
+
+    def fake_chord(header):
+        def apply(callback):
+            captured["header"] = header
+            captured["callback"] = callback
+            return SimpleNamespace(id=callback.options["task_id"])
+
+        return apply
+
+    monkeypatch.setattr(worker, "chord", fake_chord)
+    cases = [(1, "a"), (2, "b"), (3, "c"), (4, "d")]
+    result = worker.dispatch_distributed_suite(
+        7, "suite", cases, estimates={1: 4000, 2: 3000, 3: 2000, 4: 1000}, **kwargs
+    )
+    return result, captured
+
+
+def test_dispatch_shares_one_run_id_between_shards_and_callback(monkeypatch):
+    result, captured = _dispatch(monkeypatch, shard_count=2)
+
+    shards = list(captured["header"].tasks)
+    assert len(shards) == 2
+    run_ids = {shard.kwargs["run_id"] for shard in shards}
+    assert run_ids == {result.id}
+    assert captured["callback"].options["task_id"] == result.id
+    assert captured["callback"].kwargs["suite_id"] == 7
+
+
+def test_dispatch_generates_a_new_run_id_per_call(monkeypatch):
+    first, _ = _dispatch(monkeypatch, shard_count=2)
+    second, _ = _dispatch(monkeypatch, shard_count=2)
+
+    assert first.id and second.id and first.id != second.id
+
+
+def test_dispatch_packs_every_case_exactly_once(monkeypatch):
+    _, captured = _dispatch(monkeypatch, shard_count=3, har_mode="replay")
+
+    shards = list(captured["header"].tasks)
+    case_ids = sorted(case[0] for shard in shards for case in shard.args[2])
+    assert case_ids == [1, 2, 3, 4]
+    assert [shard.args[1] for shard in shards] == list(range(len(shards)))
+    assert all(shard.kwargs["har_mode"] == "replay" for shard in shards)
+
+
+class FakeTransport:
+    name = "fake"
+
+    def send(self, results_dir):
+        return {"transport": self.name, "data": "x" * 5000}
+
+
+def test_shard_result_fits_the_budget_without_touching_the_archive(monkeypatch):
+    def fake_run(coro):
+        coro.close()
+        return [
+            {"case_id": index, "case_name": f"c{index}", "success": True, "result": {"error": "e" * 3000}}
+            for index in range(20)
+        ]
+
+    monkeypatch.setattr(worker.worker_runtime, "run", fake_run)
+    monkeypatch.setattr(worker, "get_result_transport", lambda name=None: FakeTransport())
+    monkeypatch.setattr(worker.settings, "RESULT_MAX_BYTES", 8 * 1024)
+
+    output = worker.run_suite_shard_task(7, 0, [[1, "a"]])
+
+    assert output["truncated"] is True
+    assert output["allure_results"] == FakeTransport().send(None)
+    assert output["shard_index"] == 0
+    assert (output["total"], output["passed"], output["failed"]) == (20, 20, 0)
+
+
+class RecordingReportService:
+    calls = []
+
+    def __init__(self, db):
+        pass
+
+    async def generate_allure_report(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(id=1, report_path="r", report_status="pending")
+
+
+class RecordingProgress:
+    finished = []
+
+    def __init__(self, run_id):
+        pass
+
+    async def run_finished(self, success, **fields):
+        self.finished.append((success, fields))
+
+
+class NullSession:
+    async def __aenter__(self):
+        return None
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _merge(monkeypatch, shard_outputs):
+    RecordingReportService.calls = []
+    RecordingProgress.finished = []
+    monkeypatch.setattr(worker, "ReportService", RecordingReportService)
+    monkeypatch.setattr(worker, "ProgressPublisher", RecordingProgress)
+    monkeypatch.setattr(worker, "AsyncSessionLocal", NullSession)
+    monkeypatch.setattr(worker.worker_runtime, "run", asyncio.run)
+    return worker.merge_suite_shards_task(shard_outputs, suite_id=7, suite_name="suite")
+
+
+def test_merge_counts_failures_of_a_shard_whose_results_were_dropped(monkeypatch):
+    output = _merge(monkeypatch, [
+        {"shard_index": 0, "total": 1, "passed": 1, "failed": 0,
+         "results": [{"case_id": 1, "case_name": "a", "success": True}]},
+        {"shard_index": 1, "total": 30, "passed": 29, "failed": 1,
+         "results": {"dropped": True, "count": 30}, "truncated": True},
+    ])
+
+    assert (output["passed"], output["failed"], output["total_cases"]) == (30, 1, 31)
+    assert RecordingReportService.calls[0]["status"] == "failure"
+    assert RecordingProgress.finished[0][0] is False
+    assert [row["cases"] for row in output["shard_report"]["shards"]] == [1, 30]
+
+
+def test_merge_marks_the_suite_failed_when_a_shard_has_no_counts(monkeypatch):
+    output = _merge(monkeypatch, [{"shard_index": 0, "results": {"dropped": True, "count": 3}}])
+
+    assert output["incomplete"] is True
+    assert RecordingReportService.calls[0]["status"] == "failure"
@@ -0,0 +1,73 @@
+import asyncio
+from types import MappingProxyType, SimpleNamespace
+
+import pytest
+
+from app.services.execution_plan import load_case_plan, load_case_plans, thaw
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalars(self):
+        return self
+
+    def unique(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Answers the case query first and the element query second."""
+
+    def __init__(self, cases, elements):
+        self.answers = [cases, elements]
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        return FakeResult(self.answers.pop(0))
+
+
+def element(element_id):
+    return SimpleNamespace(id=element_id, name=f"e{element_id}", locator_type="css", locator_value=f"#e{element_id}", updated_at=None)
+
+
+def test_a_suite_loads_with_two_queries_and_shares_projects():
+    project = SimpleNamespace(id=7, name="shop", base_url="https://shop", execution_config={"retries": [1, 2]})
+    module = SimpleNamespace(project=project)
+    cases = [
+        SimpleNamespace(id=1, name="login", steps=[{"element_id": 10}, {"element_id": "11"}], updated_at=None, module=module),
+        SimpleNamespace(id=2, name="cart", steps=[{"element_id": 11}, {"element_id": "bad"}], updated_at=None, module=module),
+    ]
+    db = FakeSession(cases, [element(10), element(11)])
+
+    plans = asyncio.run(load_case_plans(db, [1, 2, 1]))
+
+    assert db.queries == 2
+    assert set(plans[1].elements) == {10, 11}
+    assert set(plans[2].elements) == {11}
+    assert plans[1].project is plans[2].project
+    assert plans[1].base_url == "https://shop"
+
+
+def test_plans_are_read_only_and_thaw_back_to_json():
+    cases = [SimpleNamespace(id=1, name="c", steps=[{"action": "click", "args": [1]}], updated_at=None, module=None)]
+
+    plan = asyncio.run(load_case_plan(FakeSession(cases, []), 1))
+
+    assert isinstance(plan.steps[0], MappingProxyType)
+    with pytest.raises(TypeError):
+        plan.steps[0]["action"] = "fill"
+    assert thaw(plan.steps) == [{"action": "click", "args": [1]}]
+    assert plan.project is None and dict(plan.execution_config) == {}
+
+
+def test_no_cases_means_no_queries():
+    db = FakeSession([], [])
+
+    assert asyncio.run(load_case_plans(db, [])) == {}
+    assert db.queries == 0
@@ -0,0 +1,78 @@
+import json
+import os
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.services import har_store as har_store_module
+from app.services.har_store import HarStore, case_fingerprint
+
+
+def case(steps, updated_at=datetime(2026, 1, 1)):
+    return SimpleNamespace(steps=steps, updated_at=updated_at)
+
+
+def record(store, case_id, fingerprint, success=True):
+    plan = store.plan(case_id, fingerprint, "record")
+    with open(plan.record_path, "wb") as f:
+        f.write(b"har")
+    store.finalize(plan, success)
+    return plan
+
+
+def test_fingerprint_changes_with_steps_and_base_url():
+    steps = [{"action": "click", "selector": "#a"}]
+
+    assert case_fingerprint(case(steps), "https://a") == case_fingerprint(case(list(steps)), "https://a")
+    assert case_fingerprint(case(steps), "https://a") != case_fingerprint(case(steps), "https://b")
+    assert case_fingerprint(case(steps), "https://a") != case_fingerprint(case(steps + steps), "https://a")
+
+
+def test_replay_records_first_and_replays_after_a_passing_run(tmp_path):
+    store = HarStore(str(tmp_path))
+
+    first = store.plan(1, "fp", "replay")
+    assert first.record_path and first.replay_path is None
+    assert first.summary()["stale_reason"] == "missing"
+    assert first.context_options()["record_har_path"] == first.record_path
+
+    record(store, 1, "fp")
+    second = store.plan(1, "fp", "replay", not_found="abort")
+
+    assert second.replay_path == store.har_path(1)
+    assert second.summary() == {"mode": "replay", "requested_mode": "replay", "not_found": "abort", "stale_reason": None}
+    assert second.context_options() == {}
+
+
+def test_failed_runs_never_replace_the_stored_har(tmp_path):
+    store = HarStore(str(tmp_path))
+
+    plan = record(store, 1, "fp", success=False)
+
+    assert not os.path.exists(plan.record_path)
+    assert not os.path.exists(store.har_path(1))
+    assert store.stale_reason(1, "fp") == "missing"
+
+
+def test_changed_or_expired_recordings_are_stale(tmp_path, monkeypatch):
+    store = HarStore(str(tmp_path))
+    record(store, 1, "fp")
+
+    assert store.stale_reason(1, "other") == "case_changed"
+
+    meta = store.read_meta(1)
+    meta["recorded_at"] -= 10 * 3600
+    with open(store.meta_path(1), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    monkeypatch.setattr(har_store_module.settings, "HAR_MAX_AGE_HOURS", 1)
+
+    assert store.stale_reason(1, "fp").startswith("expired")
+    assert store.plan(1, "fp", "replay").record_path
+
+
+def test_off_and_unknown_modes_leave_the_network_alone(tmp_path):
+    store = HarStore(str(tmp_path))
+
+    for mode in ("off", None, "mirror"):
+        plan = store.plan(1, "fp", mode)
+        assert plan.summary()["mode"] == "off"
+        assert plan.context_options() == {}
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from app.tools.playwright_tool import PlaywrightTool
+
+
+class FakeLocator:
+    def __init__(self, page, selectors):
+        self.page = page
+        self.selectors = tuple(selectors)
+
+    def or_(self, other):
+        return FakeLocator(self.page, self.selectors + other.selectors)
+
+    @property
+    def first(self):
+        return self
+
+    async def wait_for(self, state, timeout):
+        self.page.waits.append(self.selectors)
+        delays = [self.page.delays[s] for s in self.selectors if s in self.page.delays]
+        if not delays or min(delays) * 1000 > timeout:
+            await asyncio.sleep(timeout / 1000)
+            raise PlaywrightTimeoutError("Timeout")
+        await asyncio.sleep(min(delays))
+
+    async def count(self):
+        return self.page.counts.get(self.selectors[0], 0)
+
+
+class FakePage:
+    def __init__(self, delays=None, counts=None):
+        self.delays = delays or {}
+        self.counts = counts or {}
+        self.waits = []
+
+    def locator(self, selector):
+        return FakeLocator(self, [selector])
+
+
+def make_tool(page):
+    tool = PlaywrightTool()
+    tool.page = page
+    return tool
+
+
+def test_visible_resolution_is_a_single_wait_on_the_visible_filter():
+    page = FakePage({"#kw >> visible=true": 0})
+    tool = make_tool(page)
+
+    locator = asyncio.run(tool._get_preferred_locator("#kw:visible"))
+
+    assert page.waits == [("#kw >> visible=true",)]
+    assert locator.selectors == ("#kw >> visible=true",)
+    assert tool.last_resolution["resolved"] is True
+    assert "round_trips" not in tool.last_resolution
+
+
+def test_hidden_reads_accept_the_selector_with_or_without_visible():
+    page = FakePage({"#kw": 0})
+    tool = make_tool(page)
+
+    asyncio.run(tool._get_preferred_locator("#kw:visible", require_visible=False))
+
+    assert page.waits == [("#kw:visible", "#kw")]
+
+
+def test_timeout_reports_how_many_nodes_matched():
+    page = FakePage(counts={"#kw": 3})
+    tool = make_tool(page)
+
+    with pytest.raises(TimeoutError, match="matched_count=3"):
+        asyncio.run(tool._get_preferred_locator("#kw", timeout=50))
+
+    assert tool.last_resolution["resolved"] is False
+    assert tool.last_resolution["matched_count"] == 3
+
+
+def test_race_records_the_winner_not_the_last_probe_to_finish():
+    page = FakePage({"#fast >> visible=true": 0})
+    tool = make_tool(page)
+
+    index, _ = asyncio.run(tool.race_locators(["#missing", "#fast"], timeout=200))
+
+    assert index == 1
+    assert tool.last_resolution["selector"] == "#fast"
+    assert tool.last_resolution["resolved"] is True
+    assert tool.last_resolution["raced"] == 2
+
+
+def test_failed_race_records_every_probe_error():
+    tool = make_tool(FakePage())
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(tool.race_locators(["#a", "#b"], timeout=50))
+
+    assert tool.last_resolution["resolved"] is False
+    assert set(tool.last_resolution["errors"]) == {"#a", "#b"}
@@ -0,0 +1,89 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.tools.network_profiles import NetworkBlocker, resolve_network_profile
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type):
+        self.request = SimpleNamespace(url=url, resource_type=resource_type)
+        self.outcome = None
+
+    async def fallback(self):
+        self.outcome = "fallback"
+
+    async def abort(self, error_code):
+        self.outcome = error_code
+
+
+class FakeContext:
+    def __init__(self):
+        self.routes = []
+        self.handlers = {}
+
+    async def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+
+def test_custom_profiles_extend_a_builtin():
+    profile = resolve_network_profile(
+        {"extends": "lite", "resource_types": ["stylesheet"], "url_patterns": [r"cdn\.example\.com/banners"]}
+    )
+
+    assert profile.name == "lite+custom"
+    assert profile.resource_types == {"image", "font", "media", "stylesheet"}
+    assert profile.url_patterns == (r"cdn\.example\.com/banners",)
+
+
+def test_unknown_or_invalid_settings_disable_blocking():
+    assert resolve_network_profile("turbo").is_noop
+    assert resolve_network_profile(42).is_noop
+    assert resolve_network_profile(None).name == "none"
+
+
+def test_allow_patterns_win_over_blocked_types_and_trackers():
+    blocker = NetworkBlocker(resolve_network_profile({"extends": "strict", "allow_patterns": ["captcha"]}))
+
+    assert blocker.should_block("https://app.example.com/logo.png", "image")
+    assert blocker.should_block("https://www.google-analytics.com/collect", "xhr")
+    assert not blocker.should_block("https://app.example.com/captcha.png", "image")
+    assert not blocker.should_block("https://app.example.com/api/login", "xhr")
+
+
+def test_invalid_patterns_are_ignored():
+    blocker = NetworkBlocker(resolve_network_profile({"url_patterns": ["(", r"ads\."]}))
+
+    assert blocker.should_block("https://ads.example.com/x.js", "script")
+    assert not blocker.should_block("https://app.example.com/(", "script")
+
+
+def test_blocked_requests_are_aborted_and_counted():
+    blocker = NetworkBlocker(resolve_network_profile("lite"))
+    context = FakeContext()
+    image = FakeRoute("https://app.example.com/unseen-banner.png", "image")
+    api = FakeRoute("https://app.example.com/api/items", "fetch")
+
+    async def run():
+        await blocker.install(context)
+        _, handler = context.routes[0]
+        await handler(image)
+        await handler(api)
+
+    asyncio.run(run())
+
+    assert (image.outcome, api.outcome) == ("blockedbyclient", "fallback")
+    stats = blocker.stats()
+    assert stats["blocked_requests"] == 1
+    assert stats["by_type"] == {"image": 1}
+    assert stats["blocked_bytes"] == 40 * 1024
+
+
+def test_none_profile_installs_no_route():
+    context = FakeContext()
+
+    asyncio.run(NetworkBlocker(resolve_network_profile("none")).install(context))
+
+    assert context.routes == [] and context.handlers == {}
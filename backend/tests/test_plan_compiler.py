@@ -0,0 +1,102 @@
+import asyncio
+from datetime import datetime, timezone
+from types import MappingProxyType
+
+import app.services.plan_compiler as plan_compiler
+from app.services.execution_plan import CasePlan, ElementSpec
+from app.services.plan_compiler import (
+    CompiledCase,
+    PlanCompilerCache,
+    StepAction,
+    Template,
+    compile_case,
+    plan_fingerprint,
+)
+
+UPDATED = datetime(2026, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def make_plan(steps=None, updated_at=UPDATED, elements=None, case_id=1):
+    return CasePlan(
+        id=case_id,
+        name="case",
+        steps=tuple(MappingProxyType(step) for step in (steps or [{"action": "goto", "value": "{{host}}/login"}])),
+        updated_at=updated_at,
+        project=None,
+        elements=MappingProxyType(elements or {}),
+    )
+
+
+def normalize(step):
+    return dict(step)
+
+
+def expand(step, element_id, action, elements):
+    return [step["selector"]] if step.get("selector") else []
+
+
+def test_fingerprint_keys_on_revisions_not_step_content():
+    assert plan_fingerprint(make_plan([{"action": "click"}])) == plan_fingerprint(make_plan([{"action": "fill"}]))
+    assert plan_fingerprint(make_plan()) != plan_fingerprint(make_plan(updated_at=datetime(2026, 5, 2, tzinfo=timezone.utc)))
+
+
+def test_fingerprint_changes_with_referenced_elements_and_compiler_version(monkeypatch):
+    element = ElementSpec(id=3, name="btn", locator_type="css", locator_value="#a", updated_at=UPDATED)
+    base = plan_fingerprint(make_plan(elements={3: element}))
+
+    edited = ElementSpec(id=3, name="btn", locator_type="css", locator_value="#b", updated_at=datetime.now(timezone.utc))
+    assert plan_fingerprint(make_plan(elements={3: edited})) != base
+
+    monkeypatch.setattr(plan_compiler.settings, "PLAN_COMPILER_VERSION", "test-next")
+    assert plan_fingerprint(make_plan(elements={3: element})) != base
+
+
+def test_never_updated_cases_fall_back_to_the_content_hash():
+    first = make_plan([{"action": "click"}], updated_at=None)
+    second = make_plan([{"action": "fill"}], updated_at=None)
+
+    assert plan_fingerprint(first) != plan_fingerprint(second)
+    assert plan_fingerprint(first) == plan_fingerprint(make_plan([{"action": "click"}], updated_at=None))
+
+
+def test_template_renders_known_variables_and_keeps_unknown_tokens():
+    template = Template.parse("{{ host }}/u/{{user}}/{{missing}}")
+
+    assert template.render({"host": "http://x", "user": 7}) == "http://x/u/7/{{missing}}"
+    assert Template.parse(5).render({}) == 5
+
+
+def test_compiled_case_round_trips_through_json():
+    plan = make_plan([{"action": "goto", "value": "{{host}}/a"}, {"action": "click", "selector": "#go"}, {"action": "zoom"}])
+    compiled = compile_case(plan, normalize, expand)
+
+    restored = CompiledCase.from_json(compiled.to_json())
+
+    assert [step.action for step in restored.steps] == [StepAction.GOTO, StepAction.CLICK, StepAction.UNKNOWN]
+    assert restored.steps[1].selectors == ("#go",)
+    assert restored.steps[0].value.render({"host": "h"}) == "h/a"
+    assert restored.fingerprint == compiled.fingerprint
+
+
+def test_cache_compiles_once_per_revision(monkeypatch):
+    monkeypatch.setattr(plan_compiler.settings, "PLAN_CACHE_REDIS_ENABLED", False)
+    calls = []
+
+    def counting_normalize(step):
+        calls.append(step)
+        return dict(step)
+
+    cache = PlanCompilerCache(max_entries=1)
+
+    async def run():
+        first = await cache.get_or_compile(make_plan(), counting_normalize, expand)
+        again = await cache.get_or_compile(make_plan(), counting_normalize, expand)
+        await cache.get_or_compile(make_plan(case_id=2), counting_normalize, expand)
+        evicted = await cache.get_or_compile(make_plan(), counting_normalize, expand)
+        return first, again, evicted
+
+    first, again, evicted = asyncio.run(run())
+
+    assert first is again
+    assert evicted is not first
+    assert len(calls) == 3
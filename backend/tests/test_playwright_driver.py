@@ -0,0 +1,81 @@
+import asyncio
+from types import SimpleNamespace
+
+import app.tools.playwright_driver as driver_module
+from app.tools.playwright_driver import SharedPlaywrightDriver, probe
+
+
+class FakeRequestContext:
+    async def dispose(self):
+        pass
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.dead = False
+        self.stopped = False
+        self.request = SimpleNamespace(new_context=self._new_context)
+
+    async def _new_context(self):
+        if self.dead:
+            raise RuntimeError("Connection closed")
+        return FakeRequestContext()
+
+    async def stop(self):
+        self.stopped = True
+
+
+def _patch_start(monkeypatch):
+    started = []
+
+    async def start():
+        playwright = FakePlaywright()
+        started.append(playwright)
+        return playwright
+
+    monkeypatch.setattr(driver_module, "async_playwright", lambda: SimpleNamespace(start=start))
+    return started
+
+
+def test_probe_reports_a_dead_driver():
+    playwright = FakePlaywright()
+
+    async def run():
+        alive = await probe(playwright)
+        playwright.dead = True
+        return alive, await probe(playwright), await probe(None)
+
+    assert asyncio.run(run()) == (True, False, False)
+
+
+def test_acquire_shares_one_driver_and_restarts_a_dead_one(monkeypatch):
+    started = _patch_start(monkeypatch)
+    driver = SharedPlaywrightDriver(idle_timeout=60, probe_interval=0)
+
+    async def run():
+        first = await driver.acquire()
+        second = await driver.acquire()
+        first.dead = True
+        third = await driver.acquire()
+        return first, second, third, driver.stats()
+
+    first, second, third, stats = asyncio.run(run())
+
+    assert first is second
+    assert third is not first and first.stopped
+    assert len(started) == 2
+    assert stats == {"running": True, "refs": 3, "starts": 2}
+
+
+def test_driver_stops_after_idling_without_references(monkeypatch):
+    started = _patch_start(monkeypatch)
+    driver = SharedPlaywrightDriver(idle_timeout=0.01, probe_interval=0)
+
+    async def run():
+        await driver.acquire()
+        await driver.release()
+        await asyncio.sleep(0.05)
+        return driver.stats()
+
+    assert asyncio.run(run()) == {"running": False, "refs": 0, "starts": 1}
+    assert started[0].stopped
@@ -0,0 +1,184 @@
+import asyncio
+
+import pytest
+from fastapi import WebSocketException
+
+import app.api.deps as deps
+import app.api.v1.endpoints.execution as execution
+import app.services.progress as progress
+from app.services.progress import ProgressPublisher, progress_buffer_key, read_progress_buffer
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.ops = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args: self.ops.append((name, args))
+
+    async def execute(self):
+        for name, args in self.ops:
+            getattr(self.client, f"_{name}")(*args)
+
+
+class FakePubSub:
+    def __init__(self, client):
+        self.client = client
+        self.channels = set()
+        self.queue = []
+        self.closed = False
+
+    async def subscribe(self, channel):
+        self.channels.add(channel)
+
+    async def unsubscribe(self, channel):
+        self.channels.discard(channel)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=None):
+        await asyncio.sleep(0)
+        return self.queue.pop(0) if self.queue else None
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeRedis:
+    def __init__(self):
+        self.counters = {}
+        self.lists = {}
+        self.subscribers = []
+
+    async def incr(self, key):
+        self.counters[key] = self.counters.get(key, 0) + 1
+        return self.counters[key]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def pubsub(self):
+        subscriber = FakePubSub(self)
+        self.subscribers.append(subscriber)
+        return subscriber
+
+    async def lrange(self, key, start, end):
+        return list(self.lists.get(key, []))
+
+    def _publish(self, channel, message):
+        for subscriber in self.subscribers:
+            if channel in subscriber.channels:
+                subscriber.queue.append({"type": "message", "data": message})
+
+    def _rpush(self, key, message):
+        self.lists.setdefault(key, []).append(message)
+
+    def _ltrim(self, key, start, end):
+        self.lists[key] = self.lists[key][start:]
+
+    def _expire(self, key, ttl):
+        pass
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def receive_text(self):
+        await asyncio.Event().wait()
+
+    async def send_json(self, event):
+        self.sent.append(event)
+
+    async def close(self):
+        self.closed = True
+
+
+def test_publisher_numbers_events_and_trims_the_buffer(monkeypatch):
+    monkeypatch.setattr(progress.settings, "PROGRESS_BUFFER_SIZE", 2)
+    client = FakeRedis()
+    publisher = ProgressPublisher("run-1", client)
+
+    async def run():
+        await publisher.case_started(1, "login", 3)
+        await publisher.step_finished(1, 0, "click", "passed", 12)
+        await publisher.run_finished(True)
+        return await read_progress_buffer("run-1", client)
+
+    events = asyncio.run(run())
+
+    assert [(event["type"], event["seq"]) for event in events] == [("step", 2), ("run_end", 3)]
+    assert "used_selector" not in events[0]
+    assert len(client.lists[progress_buffer_key("run-1")]) == 2
+
+
+def test_publish_failures_are_swallowed():
+    class BrokenRedis:
+        async def incr(self, key):
+            raise ConnectionError("redis down")
+
+    asyncio.run(ProgressPublisher("run-1", BrokenRedis()).publish("step"))
+
+
+def test_websocket_replays_the_buffer_then_skips_duplicate_live_events(monkeypatch):
+    client = FakeRedis()
+    publisher = ProgressPublisher("run-1", client)
+    asyncio.run(publisher.case_started(1, "login", 1))
+
+    async def racing_read(run_id, client):
+        # An event published between SUBSCRIBE and LRANGE reaches both the buffer and the channel.
+        await publisher.step_finished(1, 0, "click", "passed", 5)
+        events = await read_progress_buffer(run_id, client)
+        await publisher.run_finished(True)
+        return events
+
+    monkeypatch.setattr(execution, "get_progress_redis", lambda: client)
+    monkeypatch.setattr(execution, "read_progress_buffer", racing_read)
+    websocket = FakeWebSocket()
+
+    asyncio.run(execution.stream_task_progress(websocket, "run-1", current_user=None))
+
+    assert [event["seq"] for event in websocket.sent] == [1, 2, 3]
+    assert websocket.sent[-1]["type"] == "run_end"
+    assert websocket.closed
+    assert client.subscribers[0].closed and not client.subscribers[0].channels
+
+
+def test_websocket_closes_straight_after_a_finished_buffer(monkeypatch):
+    client = FakeRedis()
+    asyncio.run(ProgressPublisher("run-1", client).run_finished(False, error="boom"))
+    monkeypatch.setattr(execution, "get_progress_redis", lambda: client)
+    websocket = FakeWebSocket()
+
+    asyncio.run(execution.stream_task_progress(websocket, "run-1", current_user=None))
+
+    assert [(event["type"], event["error"]) for event in websocket.sent] == [("run_end", "boom")]
+    assert websocket.closed
+
+
+class NullSession:
+    async def __aenter__(self):
+        return None
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def test_progress_stream_requires_a_valid_token(monkeypatch):
+    monkeypatch.setattr(deps, "AsyncSessionLocal", NullSession)
+    route = next(route for route in execution.router.routes if route.path == "/ws/{task_id}")
+
+    assert deps.get_current_user_ws in [dependency.call for dependency in route.dependant.dependencies]
+    for token in (None, "not-a-jwt"):
+        with pytest.raises(WebSocketException) as error:
+            asyncio.run(deps.get_current_user_ws(token=token))
+        assert error.value.code == 1008
@@ -0,0 +1,26 @@
+import asyncio
+
+import app.services.recorder as recorder
+
+
+class FailingClose:
+    async def close(self):
+        raise RuntimeError("target closed")
+
+
+def test_stop_recording_releases_the_driver_when_closing_fails(monkeypatch):
+    released = []
+
+    async def fake_release():
+        released.append(True)
+
+    monkeypatch.setattr(recorder.playwright_driver, "release", fake_release)
+    service = recorder.RecorderService()
+    service.playwright = object()
+    service.context = FailingClose()
+    service.browser = FailingClose()
+
+    asyncio.run(service.stop_recording())
+
+    assert released == [True]
+    assert (service.playwright, service.context, service.browser) == (None, None, None)
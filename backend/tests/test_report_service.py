@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+import app.services.report_service as report_service_module
+from app.services.report_service import AllureReportGenerator, ReportService
+
+
+class FakeSession:
+    def __init__(self, fail_commit=False):
+        self.fail_commit = fail_commit
+        self.rows = []
+
+    def add(self, row):
+        self.rows.append(row)
+
+    async def commit(self):
+        if self.fail_commit:
+            raise RuntimeError("db down")
+
+    async def refresh(self, row):
+        row.id = len(self.rows)
+
+
+@pytest.fixture
+def results_dir(tmp_path):
+    path = tmp_path / "results"
+    path.mkdir()
+    (path / "a-result.json").write_text("{}")
+    return path
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    generator = AllureReportGenerator()
+    rendered = []
+
+    async def fake_render(source_dir, report_path, report_id, cleanup_dir):
+        rendered.append((source_dir, report_id, cleanup_dir))
+
+    monkeypatch.setattr(generator, "render", fake_render)
+    monkeypatch.setattr(report_service_module, "report_generator", generator)
+    generator.rendered = rendered
+    return generator
+
+
+def test_background_report_is_saved_pending_and_keeps_the_dir_for_the_render(generator, results_dir, tmp_path):
+    async def run():
+        service = ReportService(FakeSession())
+        service.reports_dir = str(tmp_path / "reports")
+        report = await service.generate_allure_report(
+            test_case_id=1, results_dir=str(results_dir), background=True, cleanup_results_dir=True
+        )
+        assert results_dir.exists()
+        await generator.drain()
+        return report
+
+    report = asyncio.run(run())
+
+    assert report.report_status == "pending"
+    assert generator.rendered == [(str(results_dir), report.id, str(results_dir))]
+
+
+def test_results_dir_is_removed_when_saving_the_pending_row_fails(generator, results_dir):
+    service = ReportService(FakeSession(fail_commit=True))
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(service.generate_allure_report(
+            test_case_id=1, results_dir=str(results_dir), background=True, cleanup_results_dir=True
+        ))
+
+    assert not results_dir.exists()
+    assert generator.rendered == []
+
+
+def test_results_dir_is_kept_without_cleanup_results_dir(generator, results_dir):
+    service = ReportService(FakeSession(fail_commit=True))
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(service.generate_allure_report(test_case_id=1, results_dir=str(results_dir), background=True))
+
+    assert results_dir.exists()
+
+
+def test_foreground_report_records_the_generation_outcome(monkeypatch, results_dir):
+    generator = AllureReportGenerator()
+
+    async def fake_generate(source_dir, report_path):
+        return "allure_not_installed", "failed"
+
+    monkeypatch.setattr(generator, "generate", fake_generate)
+    monkeypatch.setattr(report_service_module, "report_generator", generator)
+
+    report = asyncio.run(ReportService().generate_allure_report(
+        test_suite_id=3, results_dir=str(results_dir), background=False, cleanup_results_dir=True
+    ))
+
+    assert (report.report_path, report.report_status) == ("allure_not_installed", "failed")
+    assert not results_dir.exists()
+
+
+def test_report_name_is_sanitised():
+    name = ReportService._report_name("My Suite/../x", None, 3)
+
+    assert name.startswith("My_Suitex_")
+
+
+def test_api_shutdown_drains_pending_reports(monkeypatch):
+    import app.main as main
+
+    drained = []
+
+    async def fake_drain():
+        drained.append(True)
+
+    monkeypatch.setattr(main.report_generator, "drain", fake_drain)
+
+    async def run():
+        async with main.lifespan(main.app):
+            assert drained == []
+
+    asyncio.run(run())
+    assert drained == [True]
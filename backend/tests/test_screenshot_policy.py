@@ -0,0 +1,51 @@
+from allure_commons.types import AttachmentType
+
+from app.services.screenshot_policy import ScreenshotPolicy
+
+
+def test_run_overrides_win_over_project_config_and_none_is_ignored():
+    policy = ScreenshotPolicy.from_config(
+        {"mode": "every_n", "every_n": 3, "format": "png"},
+        {"mode": "actions", "actions": ["click"], "every_n": None},
+    )
+
+    assert policy.mode == "actions"
+    assert policy.every_n == 3
+    assert policy.actions == frozenset({"click"})
+
+
+def test_invalid_values_are_normalised():
+    policy = ScreenshotPolicy.from_config(
+        {"mode": "sometimes", "every_n": 0, "format": "jpeg", "quality": 150, "scale": "bogus", "clip": "top"}
+    )
+
+    assert policy.mode == "always"
+    assert policy.every_n == 1
+    assert policy.quality == 100
+    assert policy.scale == "device"
+    assert policy.clip is None
+    assert ScreenshotPolicy.from_config({"format": "jpg"}).attachment_type == AttachmentType.JPG
+    assert ScreenshotPolicy.from_config({"format": "png", "quality": 50}).quality is None
+
+
+def test_should_capture_per_mode():
+    every_third = ScreenshotPolicy(mode="every_n", every_n=3)
+    actions = ScreenshotPolicy(mode="actions", actions=frozenset({"click"}))
+
+    assert [every_third.should_capture(index, "fill", False) for index in range(6)] == [
+        False, False, True, False, False, True,
+    ]
+    assert every_third.should_capture(0, "fill", True)
+    assert actions.should_capture(0, "click", False) and not actions.should_capture(0, "fill", False)
+    assert ScreenshotPolicy(mode="on_failure").should_capture(0, "click", True)
+    assert not ScreenshotPolicy(mode="never").should_capture(0, "click", True)
+    assert not ScreenshotPolicy(mode="never").captures_failures
+
+
+def test_screenshot_kwargs_only_include_set_options():
+    assert ScreenshotPolicy().screenshot_kwargs() == {"type": "png", "full_page": False, "scale": "device"}
+
+    kwargs = ScreenshotPolicy(format="jpeg", quality=60, clip={"x": 0, "y": 0, "width": 10, "height": 10}).screenshot_kwargs()
+
+    assert kwargs["quality"] == 60
+    assert kwargs["clip"]["width"] == 10
@@ -0,0 +1,132 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services import runner as runner_module
+from app.tools.playwright_tool import PlaywrightTool
+
+
+class RacingTool:
+    """Records the budgets the runner hands to the tool."""
+
+    def __init__(self, action_results, action_delay=0.0):
+        self.action_results = list(action_results)
+        self.action_delay = action_delay
+        self.race_timeouts = []
+        self.action_timeouts = []
+
+    async def race_locators(self, selectors, *, timeout, require_visible):
+        self.race_timeouts.append(timeout)
+        return 0, None
+
+    async def execute_action(self, action, selector, value, timeout_ms=None):
+        self.action_timeouts.append(timeout_ms)
+        await asyncio.sleep(self.action_delay)
+        return self.action_results.pop(0)
+
+
+def race(tool, selectors):
+    runner = runner_module.TestRunner.__new__(runner_module.TestRunner)
+    return asyncio.run(runner._race_selectors(tool, "click", selectors, None))
+
+
+def test_race_and_action_share_one_step_deadline(monkeypatch):
+    monkeypatch.setattr(runner_module.settings, "STEP_DEADLINE_MS", 1000)
+    monkeypatch.setattr(runner_module.settings, "SELECTOR_ACTION_MIN_TIMEOUT_MS", 50)
+    tool = RacingTool([{"success": False, "error": "detached"}, {"success": True}], action_delay=0.3)
+
+    res = race(tool, ["#a", "#b"])
+
+    assert res["success"] and res["used_selector"] == "#b"
+    assert res["tried_selectors"] == ["#a", "#b"]
+    first_race, second_race = tool.race_timeouts
+    assert first_race <= 1000
+    # The failed action on #a spent ~300ms of the same budget.
+    assert second_race <= 1000 - 300
+    assert all(timeout <= 1000 for timeout in tool.action_timeouts)
+    assert tool.action_timeouts[1] <= second_race
+
+
+def test_exhausted_deadline_stops_racing(monkeypatch):
+    monkeypatch.setattr(runner_module.settings, "STEP_DEADLINE_MS", 100)
+    monkeypatch.setattr(runner_module.settings, "SELECTOR_ACTION_MIN_TIMEOUT_MS", 50)
+    tool = RacingTool([{"success": False, "error": "detached"}], action_delay=0.15)
+
+    res = race(tool, ["#a", "#b", "#c"])
+
+    assert not res["success"]
+    assert tool.race_timeouts == [pytest.approx(100, abs=20)]
+    assert res["tried_selectors"] == ["#a"]
+
+
+def make_tool(resolve_delays):
+    tool = PlaywrightTool()
+    tool.page = object()
+    tool.resolved_with = []
+
+    async def fake_get_preferred_locator(selector, *, timeout=10000, require_visible=True, **kwargs):
+        tool.resolved_with.append((selector, timeout))
+        delay = resolve_delays.get(selector)
+        if delay is None:
+            await asyncio.sleep(timeout / 1000)
+            raise TimeoutError(f"{selector} not found")
+        await asyncio.sleep(delay)
+        return selector
+
+    tool._get_preferred_locator = fake_get_preferred_locator
+    return tool
+
+
+def test_race_locators_prefers_the_lower_index_and_cancels_the_rest():
+    tool = make_tool({"#slow": 0.2, "#fast": 0.0, "#also-fast": 0.0})
+
+    started = time.monotonic()
+    index, locator = asyncio.run(tool.race_locators(["#slow", "#also-fast", "#fast"], timeout=1000))
+
+    assert (index, locator) == (1, "#also-fast")
+    assert time.monotonic() - started < 0.15
+
+
+def test_race_locators_reports_every_failure_within_one_timeout():
+    tool = make_tool({})
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutError) as error:
+        asyncio.run(tool.race_locators(["#a", "#b"], timeout=100))
+
+    assert time.monotonic() - started < 0.3
+    assert "#a -> #a not found" in str(error.value) and "#b -> #b not found" in str(error.value)
+
+
+class RecordingLocator:
+    def __init__(self):
+        self.timeouts = []
+
+    async def text_content(self, timeout=None):
+        self.timeouts.append(timeout)
+        return "hello"
+
+    async def get_attribute(self, name, timeout=None):
+        self.timeouts.append(timeout)
+        return "v"
+
+
+@pytest.mark.parametrize("action, value", [("text_content", None), ("get_text", None), ("get_attribute", "href")])
+def test_read_actions_honour_the_step_budget(action, value):
+    tool = PlaywrightTool()
+    tool.page = object()
+    locator = RecordingLocator()
+    resolved_with = []
+
+    async def fake_get_preferred_locator(selector, *, timeout=10000, require_visible=True, **kwargs):
+        resolved_with.append(timeout)
+        return locator
+
+    tool._get_preferred_locator = fake_get_preferred_locator
+
+    result = asyncio.run(tool.execute_action(action, selector="#a", value=value, timeout_ms=1500))
+
+    assert result["success"], result["error"]
+    assert resolved_with == [1500]
+    assert 0 < locator.timeouts[0] <= 1500
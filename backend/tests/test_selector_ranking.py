@@ -0,0 +1,106 @@
+import asyncio
+import math
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.config import settings
+from app.services.selector_ranking import (
+    SelectorObservation,
+    SelectorRanker,
+    SelectorScore,
+    observations_from_step,
+    step_key,
+)
+
+NOW = datetime.now(timezone.utc)
+
+
+def test_counts_halve_after_one_half_life():
+    score = SelectorScore(selector="#a", successes=8, failures=4, decayed_at=NOW)
+
+    score.decay_to(NOW + timedelta(hours=settings.SELECTOR_STATS_HALF_LIFE_HOURS))
+
+    assert score.successes == pytest.approx(4)
+    assert score.failures == pytest.approx(2)
+
+
+def test_success_rate_drifts_back_to_the_prior():
+    score = SelectorScore(selector="#a", successes=50, failures=0, decayed_at=NOW)
+
+    fresh = score.success_rate(NOW)
+    stale = score.success_rate(NOW + timedelta(hours=settings.SELECTOR_STATS_HALF_LIFE_HOURS * 20))
+
+    assert fresh > 0.95
+    assert stale == pytest.approx(0.5, abs=0.01)
+
+
+def test_order_prefers_success_rate_then_latency_and_keeps_unknowns_stable():
+    stats = {
+        ("element:1", "#slow"): SelectorScore(selector="#slow", successes=10, avg_latency_ms=900, decayed_at=NOW),
+        ("element:1", "#fast"): SelectorScore(selector="#fast", successes=10, avg_latency_ms=100, decayed_at=NOW),
+        ("element:1", "#bad"): SelectorScore(selector="#bad", failures=10, decayed_at=NOW),
+    }
+
+    ordered = SelectorRanker().order(stats, "element:1", ["#bad", "#new1", "#slow", "#new2", "#fast"])
+
+    assert ordered == ["#fast", "#slow", "#new1", "#new2", "#bad"]
+
+
+def test_order_leaves_single_candidates_and_empty_stats_alone():
+    ranker = SelectorRanker()
+
+    assert ranker.order({}, "element:1", ["#b", "#a"]) == ["#b", "#a"]
+    assert ranker.order({("element:1", "#a"): SelectorScore(selector="#a")}, "element:1", ["#a"]) == ["#a"]
+
+
+def test_observations_from_step_marks_only_the_used_selector_successful():
+    observations = observations_from_step(
+        "element:5", 5, {"success": True, "tried_selectors": ["#x", "#y"], "used_selector": "#y"}, latency_ms=40
+    )
+
+    assert observations == [
+        SelectorObservation("element:5", 5, "#x", False),
+        SelectorObservation("element:5", 5, "#y", True, 40),
+    ]
+
+
+def test_stats_follow_the_target_when_steps_are_inserted_or_reordered():
+    stats = {
+        ("element:7", "#b"): SelectorScore(selector="#b", successes=10, decayed_at=NOW),
+        ("element:7", "#a"): SelectorScore(selector="#a", failures=10, decayed_at=NOW),
+    }
+    moved_step = {"action": "click", "element_id": 7, "selector": "#a"}
+    new_step = {"action": "click", "selector": "#a"}
+
+    assert step_key(moved_step) == "element:7"
+    assert SelectorRanker().order(stats, step_key(moved_step), ["#a", "#b"]) == ["#b", "#a"]
+    assert SelectorRanker().order(stats, step_key(new_step), ["#a", "#b"]) == ["#a", "#b"]
+    assert step_key({"action": "click", "target": "text=Go"}) == "selector:text=Go"
+
+
+class FailingSession:
+    def __init__(self):
+        self.rolled_back = False
+
+    async def execute(self, stmt):
+        raise RuntimeError("upsert failed")
+
+    async def commit(self):
+        raise AssertionError("commit after a failed execute")
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+def test_failed_flush_rolls_back_and_keeps_the_cache_unchanged():
+    ranker = SelectorRanker()
+    cached = {}
+    ranker._cache[1] = (math.inf, cached)
+    session = FailingSession()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(ranker.flush(session, 1, [SelectorObservation("selector:#a", None, "#a", True, 10)]))
+
+    assert session.rolled_back
+    assert cached == {}
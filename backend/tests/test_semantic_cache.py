@@ -0,0 +1,81 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.tools.playwright_tool import PlaywrightTool
+
+
+class FakePage:
+    """Mimics the in-page version check of _collect_semantic_candidates."""
+
+    def __init__(self):
+        self.url = "https://app.example.com/form"
+        self.main_frame = SimpleNamespace(name="main")
+        self.handlers = {}
+        self.known_versions = []
+        self.load_document("t1", ["submit"])
+
+    def load_document(self, time_origin, candidates):
+        self.version = f"{time_origin}:0"
+        self.candidates = candidates
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def emit(self, event, *args):
+        for handler in self.handlers.get(event, []):
+            handler(*args)
+
+    async def evaluate(self, script, arg):
+        self.known_versions.append(arg["knownVersion"])
+        if arg["knownVersion"] == self.version:
+            return {"version": self.version, "candidates": None}
+        return {"version": self.version, "candidates": list(self.candidates)}
+
+
+def open_tool():
+    page = FakePage()
+    tool = PlaywrightTool()
+    tool.context = SimpleNamespace(new_page=lambda: asyncio.sleep(0, result=page))
+    asyncio.run(tool._open_page())
+    return tool, page
+
+
+def test_unchanged_document_reuses_the_previous_scan():
+    tool, page = open_tool()
+
+    first = asyncio.run(tool._collect_semantic_candidates("clickable"))
+    second = asyncio.run(tool._collect_semantic_candidates("clickable"))
+
+    assert first == second == ["submit"]
+    assert page.known_versions == [None, "t1:0"]
+
+
+def test_main_frame_navigation_to_the_same_url_drops_cached_scans():
+    tool, page = open_tool()
+    asyncio.run(tool._collect_semantic_candidates("clickable"))
+
+    page.load_document("t2", ["retry"])
+    page.emit("framenavigated", page.main_frame)
+    candidates = asyncio.run(tool._collect_semantic_candidates("clickable"))
+
+    assert candidates == ["retry"]
+    assert page.known_versions == [None, None]
+
+
+def test_subframe_navigation_keeps_the_cache():
+    tool, page = open_tool()
+    asyncio.run(tool._collect_semantic_candidates("editable"))
+
+    page.emit("framenavigated", SimpleNamespace(name="ad-iframe"))
+    asyncio.run(tool._collect_semantic_candidates("editable"))
+
+    assert page.known_versions == [None, "t1:0"]
+
+
+def test_new_document_version_forces_a_rescan_even_without_an_event():
+    tool, page = open_tool()
+    asyncio.run(tool._collect_semantic_candidates("clickable"))
+
+    page.load_document("t2", ["retry"])
+
+    assert asyncio.run(tool._collect_semantic_candidates("clickable")) == ["retry"]
@@ -0,0 +1,118 @@
+import pytest
+
+from app.tools.semantic_scoring import DEFAULT_WEIGHTS, FEATURES, feature_matrix, resolve_weights, score_candidates
+from app.tools.site_profiles import CandidateBoost, SiteProfile, SiteProfileRegistry
+
+
+def legacy_score(candidate, *, search_intent, hint_tokens, url):
+    """The per-candidate scorer PlaywrightTool used before batched scoring."""
+    text_blob = " ".join(
+        str(candidate.get(field, ""))
+        for field in ("selector", "tag", "type", "id", "name", "placeholder", "aria_label", "title", "class_name", "text", "role")
+    ).lower()
+    score = 0.0
+    if candidate.get("visible"):
+        score += 10
+    if candidate.get("editable"):
+        score += 18
+    if not candidate.get("disabled"):
+        score += 6
+    if not candidate.get("read_only"):
+        score += 6
+    if candidate.get("tag") in {"input", "textarea"}:
+        score += 10
+    width = float(candidate.get("width") or 0)
+    height = float(candidate.get("height") or 0)
+    center_x = float(candidate.get("x") or 0) + width / 2
+    center_y = float(candidate.get("y") or 0) + height / 2
+    viewport_width = float(candidate.get("viewport_width") or 1)
+    viewport_height = float(candidate.get("viewport_height") or 1)
+    score += min(width / 40, 12)
+    score += min(height / 20, 6)
+    score += max(0, 12 - abs(center_x - viewport_width / 2) / 80)
+    score += max(0, 8 - abs(center_y - viewport_height * 0.35) / 80)
+    if search_intent:
+        if candidate.get("tag") == "textarea":
+            score += 12
+        if candidate.get("role") == "searchbox":
+            score += 10
+        for term in ["search", "query", "keyword", "搜索", "百度", "chat", "submit", "搜索词"]:
+            if term in text_blob:
+                score += 8
+        if candidate.get("placeholder"):
+            score += 6
+    for token in hint_tokens:
+        if token and token in text_blob:
+            score += 5
+    if "baidu." in url:
+        if candidate.get("id") == "chat-textarea":
+            score += 60
+        if "chat-input-textarea" in text_blob:
+            score += 24
+        if candidate.get("id") == "chat-submit-button":
+            score += 60
+        if "百度一下" in text_blob:
+            score += 30
+    return score
+
+
+CANDIDATES = [
+    {
+        "selector": "#chat-textarea", "tag": "textarea", "id": "chat-textarea", "class_name": "chat-input-textarea",
+        "placeholder": "搜索", "visible": True, "editable": True, "x": 300, "y": 200, "width": 600, "height": 40,
+        "viewport_width": 1280, "viewport_height": 720,
+    },
+    {
+        "selector": "#chat-submit-button", "tag": "button", "id": "chat-submit-button", "text": "百度一下",
+        "visible": True, "x": 900, "y": 200, "width": 100, "height": 40, "viewport_width": 1280, "viewport_height": 720,
+    },
+    {
+        "selector": "input[name=q]", "tag": "input", "type": "search", "name": "q", "role": "searchbox",
+        "aria_label": "Search Query", "visible": True, "editable": True, "disabled": True, "read_only": True,
+        "x": 10, "y": 10, "width": 2000, "height": 300, "viewport_width": 1280, "viewport_height": 720,
+    },
+    {"selector": "div.x", "tag": None, "text": "Login KEYWORD", "visible": False, "viewport_width": None},
+    {},
+]
+
+
+@pytest.mark.parametrize("search_intent", [True, False])
+@pytest.mark.parametrize("url", ["https://www.baidu.com/s", "https://example.com/"])
+def test_scores_match_the_legacy_scorer(search_intent, url):
+    hint_tokens = ["login", "query", "", "搜索"]
+    profile = SiteProfileRegistry(path="").lookup(url)
+
+    scores = score_candidates(CANDIDATES, search_intent=search_intent, hint_tokens=hint_tokens, profile=profile)
+
+    expected = [legacy_score(c, search_intent=search_intent, hint_tokens=hint_tokens, url=url) for c in CANDIDATES]
+    assert scores == pytest.approx(expected)
+
+
+def test_empty_batch_scores_nothing():
+    assert score_candidates([], search_intent=True, hint_tokens=["a"]) == []
+
+
+def test_boost_columns_follow_features():
+    profile = SiteProfile(
+        name="t",
+        hosts=("example.com",),
+        boosts=(
+            CandidateBoost(field="id", score=1, equals="a"),
+            CandidateBoost(field="text", score=1, contains="hello"),
+            CandidateBoost.from_dict({"field": "name", "pattern": "^user_\\d+$", "score": 1}),
+        ),
+    )
+    candidates = [{"id": "a", "text": "Say HELLO", "name": "user_1"}, {"id": "b", "text": "bye", "name": "user_x"}]
+
+    matrix = feature_matrix(candidates, search_intent=False, hint_tokens=[], boosts=profile.boosts)
+
+    assert matrix.shape == (2, len(FEATURES) + 3)
+    assert matrix[:, len(FEATURES):].tolist() == [[1, 1, 1], [0, 0, 0]]
+
+
+def test_resolve_weights_applies_overrides_and_ignores_unknown():
+    weights = resolve_weights({"editable": 25, "nope": 3, "visible": "bad"})
+
+    assert weights[FEATURES.index("editable")] == 25
+    assert weights[FEATURES.index("visible")] == DEFAULT_WEIGHTS["visible"]
+    assert len(weights) == len(FEATURES)
@@ -0,0 +1,78 @@
+import asyncio
+
+import app.services.session_cache as session_cache
+from app.services.session_cache import SessionFixtureConfig, SessionStateCache
+
+
+def counting_factory(result):
+    calls = []
+
+    async def factory():
+        calls.append(True)
+        await asyncio.sleep(0)
+        return result
+
+    return factory, calls
+
+
+def test_concurrent_callers_share_one_login():
+    cache = SessionStateCache()
+    factory, calls = counting_factory({"cookies": []})
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_create(1, "chromium", 60, factory) for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert sorted(created for _, created in results) == [False] * 4 + [True]
+    assert all(state == {"cookies": []} for state, _ in results)
+
+
+def test_failed_login_is_not_rerun_by_queued_cases():
+    cache = SessionStateCache()
+    factory, calls = counting_factory(None)
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_create(1, "chromium", 60, factory) for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert results == [(None, False)] * 5
+    assert cache.failed_recently(1, "chromium")
+    assert not cache.failed_recently(1, "firefox")
+
+
+def test_failed_login_is_retried_after_the_failure_ttl(monkeypatch):
+    monkeypatch.setattr(session_cache.settings, "SESSION_FAILURE_TTL", 0)
+    cache = SessionStateCache()
+    factory, calls = counting_factory(None)
+
+    async def run():
+        await cache.get_or_create(1, "chromium", 60, factory)
+        await cache.get_or_create(1, "chromium", 60, factory)
+
+    asyncio.run(run())
+
+    assert len(calls) == 2
+
+
+def test_invalidate_clears_cached_failures():
+    cache = SessionStateCache()
+    factory, _ = counting_factory(None)
+    asyncio.run(cache.get_or_create(1, "chromium", 60, factory))
+
+    cache.invalidate(1)
+
+    assert not cache.failed_recently(1, "chromium")
+
+
+def test_fixture_config_parsing():
+    assert SessionFixtureConfig.from_project_config({}) is None
+
+    config = SessionFixtureConfig.from_project_config({"session": {"login_case_id": "12", "auth_redirect_pattern": "("}})
+
+    assert config.login_case_id == 12
+    assert config.is_auth_redirect("https://app/LOGIN?next=/")
+    assert not config.is_auth_redirect(None)
@@ -0,0 +1,74 @@
+import asyncio
+
+from app.services import runner as runner_module
+from app.services.settle_policy import SettlePolicy
+
+
+def test_project_overrides_are_merged_and_normalised():
+    policy = SettlePolicy.from_config(
+        {"mode": "networkidle", "max_inflight": 2, "timeout_ms": None},
+        {"load_state": "complete", "quiet_ms": -5, "rewrite_waits": 1},
+    )
+
+    assert policy.mode == "networkidle"
+    assert policy.max_inflight == 2
+    assert policy.load_state == "load"
+    assert policy.quiet_ms == 0
+    assert policy.rewrite_waits is True
+    assert SettlePolicy.from_config({"mode": "eventually"}).mode == "load"
+
+
+def test_settle_kwargs_cap_the_timeout_by_the_original_wait():
+    policy = SettlePolicy(mode="dom", timeout_ms=5000, quiet_ms=300)
+
+    assert policy.settle_kwargs() == {
+        "mode": "dom", "timeout": 5000, "load_state": "load", "max_inflight": 0, "quiet_ms": 300,
+    }
+    assert policy.settle_kwargs(timeout_ms=1200)["timeout"] == 1200
+    assert policy.settle_kwargs(timeout_ms=9000)["timeout"] == 5000
+
+
+class SettleTool:
+    def __init__(self):
+        self.calls = []
+
+    async def settle(self, **kwargs):
+        self.calls.append(("settle", kwargs))
+        return True
+
+    async def execute_action(self, action, selector=None, value=None, **kwargs):
+        self.calls.append((action, value))
+        return {"success": True}
+
+
+def execute(step, settle):
+    tool = SettleTool()
+    runner = runner_module.TestRunner.__new__(runner_module.TestRunner)
+    result = asyncio.run(runner._execute_step(tool, step, {}, step_index=0, case_id=1, settle=settle))
+    return result, tool.calls
+
+
+def test_fixed_wait_becomes_a_settle_capped_at_the_original_duration():
+    policy = SettlePolicy(mode="dom", timeout_ms=10000, rewrite_waits=True)
+
+    result, calls = execute({"action": "wait", "value": "3s"}, policy)
+
+    assert result["success"] and result["settled"] is True
+    assert [name for name, _ in calls] == ["settle"]
+    assert calls[0][1]["timeout"] == 3000
+    assert calls[0][1]["mode"] == "dom"
+
+
+def test_fixed_wait_is_kept_without_rewrite_waits():
+    result, calls = execute({"action": "wait", "value": "3s"}, SettlePolicy(mode="dom"))
+
+    assert result["success"]
+    assert calls == [("wait", "3000")]
+
+
+def test_navigation_waits_for_the_page_to_settle():
+    result, calls = execute({"action": "goto", "value": "https://example.com"}, SettlePolicy(mode="networkidle"))
+
+    assert result["success"]
+    assert [name for name, _ in calls] == ["goto", "settle"]
+    assert calls[1][1]["mode"] == "networkidle"
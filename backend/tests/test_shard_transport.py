@@ -0,0 +1,61 @@
+import pytest
+
+from app.services.shard_transport import (
+    InlineResultTransport,
+    ResultTransport,
+    get_result_transport,
+    pack_results_dir,
+    unpack_results_archive,
+)
+
+
+def test_incomplete_transport_fails_at_instantiation():
+    class SendOnly(ResultTransport):
+        def send(self, results_dir):
+            return {}
+
+    with pytest.raises(TypeError):
+        SendOnly()
+
+
+def test_inline_round_trip(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "a-result.json").write_text("{}")
+    (source / "b-attachment.png").write_bytes(b"\x89PNG")
+    (source / "nested").mkdir()
+
+    transport = InlineResultTransport()
+    count = transport.receive(transport.send(str(source)), str(tmp_path / "dest"))
+
+    assert count == 2
+    assert (tmp_path / "dest" / "b-attachment.png").read_bytes() == b"\x89PNG"
+
+
+def test_unpack_ignores_paths_escaping_the_destination(tmp_path):
+    import io
+    import zipfile
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("../../evil.json", "x")
+    count = unpack_results_archive(buffer.getvalue(), str(tmp_path / "dest"))
+
+    assert count == 1
+    assert (tmp_path / "dest" / "evil.json").exists()
+    assert not (tmp_path / "evil.json").exists()
+
+
+def test_pack_missing_dir_gives_an_empty_archive(tmp_path):
+    assert unpack_results_archive(pack_results_dir(str(tmp_path / "missing")), str(tmp_path / "dest")) == 0
+
+
+def test_unknown_transport_falls_back_to_redis(monkeypatch):
+    import app.services.shard_transport as shard_transport
+
+    class FakeRedisTransport(InlineResultTransport):
+        name = "redis"
+
+    monkeypatch.setattr(shard_transport, "RedisResultTransport", FakeRedisTransport)
+
+    assert get_result_transport("nope").name == "redis"
@@ -0,0 +1,38 @@
+from app.services.sharding import build_shard_report, plan_shards
+
+
+def test_lpt_places_each_case_on_the_least_loaded_shard():
+    cases = [(1, "a"), (2, "b"), (3, "c"), (4, "d"), (5, "e")]
+    estimates = {1: 7000, 2: 5000, 3: 4000, 4: 3000, 5: 1000}
+
+    shards = plan_shards(cases, estimates, 2)
+
+    assert [[case_id for case_id, _ in shard["cases"]] for shard in shards] == [[1, 4], [2, 3, 5]]
+    assert [shard["predicted_ms"] for shard in shards] == [10000, 10000]
+
+
+def test_cases_without_history_use_the_default_estimate():
+    shards = plan_shards([(1, "a"), (2, "b"), (3, "c")], {1: 50000}, 2, default_ms=20000)
+
+    assert sorted(shard["predicted_ms"] for shard in shards) == [40000, 50000]
+
+
+def test_shard_count_is_capped_by_the_number_of_cases():
+    shards = plan_shards([(1, "a"), (2, "b")], {}, 8, default_ms=1000)
+
+    assert len(shards) == 2
+    assert plan_shards([(1, "a")], {}, 0, default_ms=1000)[0]["cases"] == [(1, "a")]
+    assert plan_shards([], {}, 4, default_ms=1000) == []
+
+
+def test_shard_report_compares_prediction_and_actual():
+    report = build_shard_report([
+        {"shard_index": 0, "cases": 2, "predicted_ms": 1000, "duration_ms": 1500},
+        {"shard_index": 1, "cases": 1, "predicted_ms": 1000, "duration_ms": 500},
+        {"shard_index": 2, "cases": 1, "predicted_ms": None, "duration_ms": None},
+    ])
+
+    assert [row["error_pct"] for row in report["shards"]] == [50.0, -50.0, None]
+    assert report["predicted_makespan_ms"] == 1000
+    assert report["actual_makespan_ms"] == 1500
+    assert report["balance"] == round(2000 / (1500 * 3), 3)
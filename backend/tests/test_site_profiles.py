@@ -0,0 +1,76 @@
+import json
+import os
+
+import pytest
+
+from app.tools.site_profiles import CandidateBoost, PostActionHook, SiteProfileRegistry
+
+
+def write_profiles(path, profiles, mtime):
+    path.write_text(json.dumps({"profiles": profiles}), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_lookup_matches_the_most_specific_host_suffix(tmp_path):
+    path = tmp_path / "profiles.json"
+    write_profiles(path, [{"name": "maps", "hosts": ["map.baidu.com"]}], 1000)
+    registry = SiteProfileRegistry(path=str(path), reload_interval=60)
+
+    assert registry.lookup("https://www.baidu.com/s?wd=x").name == "baidu"
+    assert registry.lookup("https://MAP.baidu.com/").name == "maps"
+    assert registry.lookup("https://notbaidu.com/") is None
+    assert registry.lookup(None) is None
+
+
+def test_missing_file_leaves_only_builtin_profiles(tmp_path):
+    registry = SiteProfileRegistry(path=str(tmp_path / "absent.json"), reload_interval=0)
+
+    assert registry.lookup("https://baidu.cn").name == "baidu"
+
+
+def test_file_is_reloaded_when_its_mtime_changes(tmp_path):
+    path = tmp_path / "profiles.json"
+    write_profiles(path, [{"name": "v1", "hosts": ["example.com"]}], 1000)
+    registry = SiteProfileRegistry(path=str(path), reload_interval=0)
+    assert registry.lookup("https://app.example.com").name == "v1"
+
+    write_profiles(path, [{"name": "v2", "hosts": ["example.com"]}], 2000)
+
+    assert registry.lookup("https://app.example.com").name == "v2"
+
+
+def test_reload_is_throttled_by_the_interval(tmp_path):
+    path = tmp_path / "profiles.json"
+    write_profiles(path, [{"name": "v1", "hosts": ["example.com"]}], 1000)
+    registry = SiteProfileRegistry(path=str(path), reload_interval=3600)
+    registry.lookup("https://example.com")
+
+    write_profiles(path, [{"name": "v2", "hosts": ["example.com"]}], 2000)
+
+    assert registry.lookup("https://example.com").name == "v1"
+
+
+def test_invalid_profiles_are_skipped_and_file_profiles_override_builtins(tmp_path):
+    path = tmp_path / "profiles.json"
+    write_profiles(path, [
+        {"name": "broken", "hosts": ["broken.com"], "boosts": [{"field": "colour", "equals": "red"}]},
+        {"name": "bad-regex", "hosts": ["regex.com"], "boosts": [{"pattern": "("}]},
+        {"name": "my-baidu", "hosts": ["baidu.com"]},
+    ], 1000)
+    registry = SiteProfileRegistry(path=str(path), reload_interval=0)
+
+    assert registry.lookup("https://broken.com") is None
+    assert registry.lookup("https://regex.com") is None
+    assert registry.lookup("https://www.baidu.com").name == "my-baidu"
+
+
+def test_boost_and_hook_parsing():
+    with pytest.raises(ValueError):
+        CandidateBoost.from_dict({"field": "id"})
+    assert CandidateBoost.from_dict({"contains": "SUBMIT", "score": 5}).contains == "submit"
+
+    hook = PostActionHook.from_dict({"selector": "#q", "click": "#go", "key": "Enter"})
+
+    assert hook.applies("press", "#q", " enter ")
+    assert not hook.applies("press", "#q", "Tab")
+    assert not hook.applies("fill", "#q", "Enter")
@@ -0,0 +1,66 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.services import runner as runner_module
+from app.services.trace_policy import TRACE_ATTACHMENT_TYPE, TracePolicy
+from app.tools.playwright_tool import PlaywrightTool
+
+
+def test_project_overrides_are_merged_and_normalised():
+    policy = TracePolicy.from_config({"mode": "on_failure", "sources": False}, {"chunk_steps": -3, "mode": None})
+
+    assert policy.mode == "on_failure"
+    assert policy.chunk_steps == 0
+    assert policy.tracing_kwargs() == {"screenshots": True, "snapshots": True, "sources": False}
+    assert not TracePolicy.from_config({"mode": "always"}).enabled
+
+
+def test_rotation_happens_every_chunk_but_never_on_the_first_step():
+    policy = TracePolicy(mode="on_failure", chunk_steps=2)
+
+    assert [policy.should_rotate(index) for index in range(5)] == [False, False, True, False, True]
+    assert not any(TracePolicy(mode="on_failure").should_rotate(index) for index in range(5))
+
+
+class FakeTracing:
+    def __init__(self):
+        self.exported = []
+        self.stopped = False
+
+    async def stop_chunk(self, path=None):
+        if path:
+            with open(path, "wb") as f:
+                f.write(b"trace")
+        self.exported.append(path)
+
+    async def stop(self):
+        self.stopped = True
+
+
+def finish_trace(tmp_path, keep):
+    tool = PlaywrightTool()
+    tool.context = SimpleNamespace(tracing=FakeTracing())
+    tool.tracing = True
+    runner = runner_module.TestRunner.__new__(runner_module.TestRunner)
+    runner.results_dir = str(tmp_path)
+    test_result = SimpleNamespace(attachments=[])
+    outcome = asyncio.run(runner._finish_trace(tool, test_result, keep=keep))
+    return outcome, test_result, tool
+
+
+def test_passing_case_traces_are_discarded_without_writing_a_file(tmp_path):
+    outcome, test_result, tool = finish_trace(tmp_path, keep=False)
+
+    assert outcome == {"kept": False, "source": None}
+    assert tool.context.tracing.exported == [None]
+    assert tool.context.tracing.stopped and not tool.tracing
+    assert list(tmp_path.iterdir()) == []
+    assert test_result.attachments == []
+
+
+def test_failing_case_trace_is_written_and_attached(tmp_path):
+    outcome, test_result, tool = finish_trace(tmp_path, keep=True)
+
+    assert outcome["kept"] is True
+    assert (tmp_path / outcome["source"]).read_bytes() == b"trace"
+    assert [(a.source, a.type) for a in test_result.attachments] == [(outcome["source"], TRACE_ATTACHMENT_TYPE)]
@@ -0,0 +1,116 @@
+import asyncio
+import os
+
+import app.services.video_store as video_store_module
+from app.services.video_store import VideoPolicy, VideoStore
+
+MB = 1024 * 1024
+
+
+def test_run_overrides_win_and_invalid_values_are_normalised():
+    policy = VideoPolicy.from_config(
+        {"mode": "always", "trim_seconds": 20, "budget_mb": 100}, {"mode": None, "scale_width": -1}
+    )
+
+    assert (policy.mode, policy.trim_seconds, policy.scale_width, policy.budget_mb) == ("always", 20, 0, 100)
+    assert VideoPolicy.from_config({"mode": "sometimes"}).mode == "off"
+
+
+def test_keeps_follows_the_mode():
+    assert [VideoPolicy(mode=mode).keeps(False) for mode in ("off", "on_failure", "always")] == [False, True, True]
+    assert [VideoPolicy(mode=mode).keeps(True) for mode in ("off", "on_failure", "always")] == [False, False, True]
+
+
+def write_video(directory, name, size_mb, mtime):
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        f.write(b"\0" * int(size_mb * MB))
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_budget_evicts_the_oldest_videos_first(tmp_path):
+    store = VideoStore(str(tmp_path))
+    project_dir = store.project_dir(7)
+    os.makedirs(project_dir)
+    oldest = write_video(project_dir, "a.webm", 1, 1000)
+    write_video(project_dir, "b.webm", 1, 2000)
+    write_video(project_dir, "c.webm", 1, 3000)
+    write_video(project_dir, "notes.txt", 5, 500)
+
+    assert store.enforce_budget(7, 2) == [oldest]
+    assert sorted(os.listdir(project_dir)) == ["b.webm", "c.webm", "notes.txt"]
+    assert store.enforce_budget(7, 0) == []
+    assert store.enforce_budget(99, 1) == []
+
+
+def test_finalize_keeps_failed_recordings_and_discards_passed_ones(tmp_path):
+    store = VideoStore(str(tmp_path))
+    policy = VideoPolicy(mode="on_failure", budget_mb=10)
+
+    async def run():
+        passed_dir = store.recording_dir()
+        passed = store.finalize(
+            policy, passed_dir, write_video(passed_dir, "p.webm", 0.01, 1000), project_id=1, case_id=1, success=True
+        )
+        failed_dir = store.recording_dir()
+        failed = store.finalize(
+            policy, failed_dir, write_video(failed_dir, "f.webm", 0.01, 1000), project_id=1, case_id=2, success=False
+        )
+        await store.drain()
+        return passed_dir, passed, failed_dir, failed
+
+    passed_dir, passed, failed_dir, failed = asyncio.run(run())
+
+    assert passed is None
+    assert os.path.basename(failed["path"]).startswith("case_2_")
+    assert os.path.isfile(failed["path"])
+    assert not os.path.exists(passed_dir) and not os.path.exists(failed_dir)
+
+
+def test_failed_recording_is_trimmed_to_the_seconds_before_the_failure(tmp_path, monkeypatch):
+    store = VideoStore(str(tmp_path))
+    transcoded = []
+
+    async def fake_transcode(path, scale_width, start_s, duration_s):
+        transcoded.append((scale_width, start_s, duration_s))
+
+    monkeypatch.setattr(video_store_module.shutil, "which", lambda name: "/usr/bin/ffmpeg")
+    monkeypatch.setattr(store, "_transcode", fake_transcode)
+    policy = VideoPolicy(mode="on_failure", trim_seconds=10, scale_width=640, budget_mb=10)
+
+    async def run():
+        record_dir = store.recording_dir()
+        video = store.finalize(
+            policy, record_dir, write_video(record_dir, "f.webm", 0.01, 1000),
+            project_id=1, case_id=2, success=False, failure_offset_s=30.0,
+        )
+        await store.drain()
+        return video
+
+    video = asyncio.run(run())
+
+    assert video["trimmed_from_s"] == 20.0
+    assert transcoded == [(640, 20.0, 11.0)]
+
+
+def test_kept_recordings_evict_older_videos_over_the_budget(tmp_path, monkeypatch):
+    store = VideoStore(str(tmp_path))
+    monkeypatch.setattr(video_store_module.shutil, "which", lambda name: None)
+    project_dir = store.project_dir(1)
+    os.makedirs(project_dir)
+    old = write_video(project_dir, "old.webm", 1, 1000)
+
+    async def run():
+        record_dir = store.recording_dir()
+        video = store.finalize(
+            VideoPolicy(mode="always", budget_mb=1), record_dir, write_video(record_dir, "new.webm", 0.5, 2000),
+            project_id=1, case_id=3, success=True,
+        )
+        await store.drain()
+        return video
+
+    video = asyncio.run(run())
+
+    assert not os.path.exists(old)
+    assert os.path.isfile(video["path"])
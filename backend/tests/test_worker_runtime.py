@@ -0,0 +1,52 @@
+import asyncio
+
+from app.core.worker_runtime import WorkerRuntime
+
+
+def test_tasks_share_one_long_lived_loop():
+    runtime = WorkerRuntime(shutdown_timeout=5)
+
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    try:
+        first = runtime.run(current_loop())
+        second = runtime.run(current_loop())
+        assert first is second is runtime.loop
+        assert runtime.is_running
+    finally:
+        runtime.stop()
+
+    assert runtime.loop is None
+    assert first.is_closed()
+
+
+def test_shutdown_hooks_run_on_the_loop_in_reverse_order():
+    runtime = WorkerRuntime(shutdown_timeout=5)
+    calls = []
+
+    def hook(name):
+        async def _hook():
+            calls.append((name, asyncio.get_running_loop()))
+        return _hook
+
+    async def broken():
+        raise RuntimeError("pool already closed")
+
+    runtime.add_shutdown_hook(hook("db"))
+    runtime.add_shutdown_hook(broken)
+    runtime.add_shutdown_hook(hook("browsers"))
+    runtime.start()
+    loop = runtime.loop
+    runtime.stop()
+
+    assert [name for name, _ in calls] == ["browsers", "db"]
+    assert all(hook_loop is loop for _, hook_loop in calls)
+
+
+def test_stop_without_start_is_a_no_op():
+    runtime = WorkerRuntime()
+
+    runtime.stop()
+
+    assert not runtime.is_running